@@ -0,0 +1,9 @@
+-- 0005_referee_search_indexes.sql
+-- Support paginated /refs/search: bounding-box prefilter on coordinates and
+-- per-referee average rating without touching the ratings heap.
+
+CREATE INDEX IF NOT EXISTS idx_referee_profiles_coords
+    ON referee_profiles(latitude, longitude);
+
+CREATE INDEX IF NOT EXISTS idx_ratings_referee_score
+    ON ratings(referee_id, score);
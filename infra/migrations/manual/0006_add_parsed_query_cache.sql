@@ -0,0 +1,13 @@
+-- 0006_add_parsed_query_cache.sql
+-- Persisted cache of natural-language referee queries -> extracted constraints,
+-- so repeated /ai/find-ref phrasings skip the LLM across restarts.
+
+CREATE TABLE IF NOT EXISTS parsed_query_cache (
+    id SERIAL PRIMARY KEY,
+    league_id INTEGER NOT NULL REFERENCES leagues(id) ON DELETE CASCADE,
+    normalized_query VARCHAR(1000) NOT NULL,
+    constraints JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE(league_id, normalized_query)
+);
@@ -0,0 +1,11 @@
+-- 0007_add_ai_chat_memory.sql
+-- Server-side AI chat history: recent turns kept verbatim plus a rolling summary of
+-- older turns, so clients no longer resend the whole conversation on every message.
+
+CREATE TABLE IF NOT EXISTS ai_chat_memory (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL UNIQUE REFERENCES users(id) ON DELETE CASCADE,
+    summary TEXT NOT NULL DEFAULT '',
+    recent_turns JSONB NOT NULL DEFAULT '[]'::jsonb,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,22 @@
+-- 0008_game_search_indexes.sql
+-- Indexes behind the shared game search used by /games and the AI chat
+-- search_games tool: league/status filters ordered by kickoff, and substring
+-- matches on field name/address (ILIKE '%...%' uses the trigram indexes).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_games_league_start
+    ON games(league_id, scheduled_start);
+
+CREATE INDEX IF NOT EXISTS idx_games_status_start
+    ON games(status, scheduled_start);
+
+CREATE INDEX IF NOT EXISTS idx_field_locations_name_trgm
+    ON field_locations USING gin (name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_field_locations_address_trgm
+    ON field_locations USING gin (address gin_trgm_ops);
+
+-- Superseded by the composite indexes above (their leading column).
+DROP INDEX IF EXISTS idx_games_league_id;
+DROP INDEX IF EXISTS idx_games_status;
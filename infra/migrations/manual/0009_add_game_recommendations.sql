@@ -0,0 +1,9 @@
+-- 0009_add_game_recommendations.sql
+-- Top-k referee suggestions per open game, kept current by the background
+-- recommender so the suggestions UI reads one row instead of rerunning matching.
+
+CREATE TABLE IF NOT EXISTS game_recommendations (
+    game_id INTEGER PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+    entries JSONB NOT NULL DEFAULT '[]'::jsonb,
+    computed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,12 @@
+-- 0010_add_updated_at_stamps.sql
+-- Last-modified stamps on rows the SPA polls; the API derives ETags from them so
+-- unchanged resources are answered with 304 Not Modified.
+
+ALTER TABLE games
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+ALTER TABLE leagues
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+ALTER TABLE referee_profiles
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP;
@@ -0,0 +1,92 @@
+"""Queries and latency per authenticated request with and without the auth context cache.
+
+Uses a throwaway SQLite database and the in-process test client, counting every
+statement the engine executes while serving a request. Run from src/backend:
+
+    PYTHONPATH=src python benchmarks/bench_auth_context.py [--requests 500]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench_auth.db"
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-" + "x" * 32)
+os.environ.setdefault("RECOMMENDER_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.config import get_settings  # noqa: E402
+from app.core.auth_context import clear_auth_context  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+ENDPOINTS = [
+    ("league", "/auth/me"),
+    ("league", "/leagues/me"),
+    ("referee", "/refs/me"),
+]
+
+_statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(*_args) -> None:
+    global _statements
+    _statements += 1
+
+
+def _register(client: TestClient, email: str, role: str) -> dict:
+    body = {"email": email, "password": "bench", "role": role, "name": "Bench"}
+    if role == "referee":
+        body.update(home_location="Edison, NJ", cert_level="U14")
+    response = client.post("/auth/register", json=body)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _measure(client: TestClient, headers: dict, path: str, requests: int):
+    global _statements
+    client.get(path, headers=headers).raise_for_status()
+    _statements = 0
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(path, headers=headers).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return _statements / requests, statistics.median(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    settings = get_settings()
+    with TestClient(app) as client:
+        headers = {
+            "league": _register(client, "bench-league@example.com", "league"),
+            "referee": _register(client, "bench-ref@example.com", "referee"),
+        }
+        for role, path in ENDPOINTS:
+            results = {}
+            for label, ttl in (("joined load", 0.0), ("cached", 30.0)):
+                settings.AUTH_CONTEXT_TTL_SECONDS = ttl
+                clear_auth_context()
+                results[label] = _measure(client, headers[role], path, args.requests)
+            print(
+                f"GET {path:<12} queries/request {results['joined load'][0]:.1f} -> "
+                f"{results['cached'][0]:.1f}, median {results['joined load'][1]:.2f}ms -> "
+                f"{results['cached'][1]:.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
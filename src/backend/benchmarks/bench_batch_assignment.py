@@ -0,0 +1,67 @@
+"""Benchmark the batch assignment solver on a synthetic weekend slate.
+
+Run from src/backend:
+
+    PYTHONPATH=src python benchmarks/bench_batch_assignment.py
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.services.batch_assignment_service import (
+    GameSlot,
+    RefereeSnapshot,
+    plan_assignments,
+)
+from app.services.ranking_service import CERT_LEVELS, WEIGHT_PROFILES
+
+GAMES = 250
+ROLES = ("center", "ar")
+REFEREES = 2_000
+CENTER = (40.0, -74.0)
+
+
+def _jitter(rng: random.Random, spread: float) -> float:
+    return rng.uniform(-spread, spread)
+
+
+def build_slate(rng: random.Random):
+    saturday = datetime(2026, 5, 2, 8, tzinfo=timezone.utc)
+    slots = []
+    for game_id in range(GAMES):
+        start = saturday + timedelta(days=rng.randint(0, 1), hours=rng.randint(0, 9))
+        lat = CENTER[0] + _jitter(rng, 0.3)
+        lon = CENTER[1] + _jitter(rng, 0.3)
+        required = rng.randint(0, len(CERT_LEVELS) - 1)
+        for role in ROLES:
+            slots.append(GameSlot(game_id, role, start, lat, lon, required))
+
+    refs = [
+        RefereeSnapshot(
+            id=ref_id,
+            latitude=CENTER[0] + _jitter(rng, 0.4),
+            longitude=CENTER[1] + _jitter(rng, 0.4),
+            travel_radius_km=rng.choice([20.0, 35.0, 50.0]),
+            rating=rng.random(),
+            experience=rng.random(),
+            cert_rank=rng.randint(0, len(CERT_LEVELS) - 1),
+        )
+        for ref_id in range(REFEREES)
+    ]
+    return slots, refs
+
+
+def main() -> None:
+    slots, refs = build_slate(random.Random(7))
+    start = time.perf_counter()
+    plan = plan_assignments(slots, refs, WEIGHT_PROFILES["default"])
+    elapsed = time.perf_counter() - start
+
+    filled = sum(1 for item in plan if item.referee_id is not None)
+    print(f"slots={len(slots)} referees={len(refs)} filled={filled}")
+    print(f"solve={elapsed * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
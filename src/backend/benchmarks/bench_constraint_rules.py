@@ -0,0 +1,67 @@
+"""Measure how many labelled referee queries the rule-based parser answers without the LLM.
+
+Each corpus line holds a query and the expected constraints, or null when the query needs
+the LLM (place names, relative dates, free-form preferences). Run from src/backend:
+
+    PYTHONPATH=src python benchmarks/bench_constraint_rules.py [--llm-ms 700]
+
+The LLM latency is an input (the p50 of `parse_ref_request` in your environment), so the
+"saved" figure is an estimate of the LLM time the fast path avoids.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from app.services.constraint_rules import fast_parse_ref_request
+
+CORPUS = Path(__file__).parent / "data" / "ref_query_corpus.jsonl"
+ROUNDS = 200
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-ms", type=float, default=700.0, help="LLM parse latency (p50)")
+    parser.add_argument("--min-confidence", type=float, default=1.0)
+    args = parser.parse_args()
+
+    corpus = [json.loads(line) for line in CORPUS.read_text().splitlines() if line.strip()]
+
+    fast_hits = correct = wrong = 0
+    for row in corpus:
+        result = fast_parse_ref_request(row["query"], args.min_confidence)
+        if result is None:
+            continue
+        fast_hits += 1
+        if result == row["constraints"]:
+            correct += 1
+        else:
+            wrong += 1
+            print(f"WRONG {row['query']!r}: got {result}, expected {row['constraints']}")
+
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for row in corpus:
+            fast_parse_ref_request(row["query"], args.min_confidence)
+        timings.append((time.perf_counter() - start) * 1e6 / len(corpus))
+
+    eligible = sum(1 for row in corpus if row["constraints"] is not None)
+    rule_us = statistics.median(timings)
+    saved_ms = fast_hits * args.llm_ms - len(corpus) * rule_us / 1000
+    print(f"queries={len(corpus)} fast-path eligible={eligible}")
+    print(
+        f"coverage={fast_hits / len(corpus):.0%} of all, {fast_hits / max(eligible, 1):.0%} "
+        f"of eligible; correct={correct} wrong={wrong}"
+    )
+    print(f"rule parse median={rule_us:.1f}us per query")
+    print(
+        f"estimated LLM time saved={saved_ms:.0f}ms over the corpus "
+        f"({saved_ms / len(corpus):.0f}ms per query at llm-ms={args.llm_ms:.0f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
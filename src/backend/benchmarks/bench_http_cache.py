@@ -0,0 +1,91 @@
+"""Compare polling GET /games with and without ETag revalidation and compression.
+
+Uses a throwaway SQLite database and the in-process test client; reports server time and
+bytes on the wire per poll. Run from src/backend:
+
+    PYTHONPATH=src python benchmarks/bench_http_cache.py [--games 200 --polls 300]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench_http_cache.db"
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-" + "x" * 32)
+os.environ.setdefault("RECOMMENDER_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core import http_cache  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.field_location import FieldLocation  # noqa: E402
+from app.models.league import League  # noqa: E402
+
+
+def _poll(client: TestClient, headers: dict, polls: int, revalidate: bool) -> tuple:
+    etag = None
+    wire = 0
+    start = time.perf_counter()
+    for _ in range(polls):
+        request_headers = dict(headers)
+        if revalidate and etag:
+            request_headers["If-None-Match"] = etag
+        response = client.get("/games", headers=request_headers)
+        etag = response.headers.get("etag")
+        wire += int(response.headers.get("content-length", len(response.content)))
+    return (time.perf_counter() - start) / polls * 1000, wire / polls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=300)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with TestClient(app) as client:
+        token = client.post(
+            "/auth/register",
+            json={"email": "league@example.com", "password": "x", "role": "league", "name": "L"},
+        ).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        db = SessionLocal()
+        field = FieldLocation(
+            league_id=db.query(League.id).scalar(), name="Park", latitude=40.5, longitude=-74.4
+        )
+        db.add(field)
+        db.commit()
+        for i in range(args.games):
+            client.post(
+                "/games",
+                json={
+                    "field_location_id": field.id,
+                    "scheduled_start": f"2026-11-{i % 28 + 1:02d}T{8 + i % 10:02d}:00:00",
+                    "age_group": "U12",
+                    "competition_level": "travel",
+                },
+                headers=auth,
+            ).raise_for_status()
+        db.close()
+
+        cases = [
+            ("full body, identity", {"Accept-Encoding": "identity"}, False),
+            ("full body, gzip", {"Accept-Encoding": "gzip"}, False),
+        ]
+        if http_cache.brotli is not None:
+            cases.append(("full body, br", {"Accept-Encoding": "br"}, False))
+        cases.append(("If-None-Match (304)", {"Accept-Encoding": "gzip"}, True))
+        print(f"{args.games} games, {args.polls} polls each")
+        for label, headers, revalidate in cases:
+            _poll(client, {**auth, **headers}, 10, revalidate)
+            ms, wire = _poll(client, {**auth, **headers}, args.polls, revalidate)
+            print(f"  {label:<22} {ms:7.2f} ms/poll  {wire:9.0f} bytes/poll")
+
+
+if __name__ == "__main__":
+    main()
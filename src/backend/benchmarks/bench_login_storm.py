@@ -0,0 +1,115 @@
+"""Latency of an ordinary sync route while a storm of logins is in flight.
+
+Runs the app in-process on a throwaway SQLite database. A probe client calls
+GET /leagues/me back to back while `--logins` logins run `--concurrency` at a time,
+once with password checks on the dedicated hashing pool (current behaviour) and once
+with them on the threadpool every sync route shares (previous behaviour). Run from
+src/backend:
+
+    PYTHONPATH=src python benchmarks/bench_login_storm.py [--logins 400 --concurrency 100]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench_login.db"
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-" + "x" * 32)
+
+import httpx  # noqa: E402
+from fastapi.concurrency import run_in_threadpool  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.password_pool import get_password_pool  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+USERS = 20
+
+
+def _percentiles(samples: List[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50={statistics.median(ordered):.1f}ms p95={p95:.1f}ms max={ordered[-1]:.1f}ms"
+
+
+async def _probe(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event) -> List[float]:
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        (await client.get("/leagues/me", headers=headers)).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def _storm(client: httpx.AsyncClient, logins: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login(i: int) -> None:
+        async with semaphore:
+            body = {"email": f"storm{i % USERS}@example.com", "password": "storm"}
+            (await client.post("/auth/login", json=body)).raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(i) for i in range(logins)))
+    return time.perf_counter() - start
+
+
+async def _scenario(client, headers, logins: int, concurrency: int) -> None:
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(client, headers, stop))
+    elapsed = await _storm(client, logins, concurrency)
+    stop.set()
+    latencies = await probe
+    print(f"  logins: {logins / elapsed:.0f}/s; probe GET /leagues/me: {_percentiles(latencies)}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(USERS):
+            body = {
+                "email": f"storm{i}@example.com",
+                "password": "storm",
+                "role": "league",
+                "name": f"Storm {i}",
+            }
+            response = await client.post("/auth/register", json=body)
+            response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, headers, stop))
+        await asyncio.sleep(1)
+        stop.set()
+        idle = await probe
+        print(f"idle probe: {_percentiles(idle)}")
+
+        pool = get_password_pool()
+        pool.max_pending = max(pool.max_pending, args.concurrency)
+        print(f"hashing pool ({pool.workers} workers):")
+        await _scenario(client, headers, args.logins, args.concurrency)
+
+        # The previous behaviour: hashing on the threadpool shared by all sync routes.
+        pool_run = pool.run
+        pool.run = run_in_threadpool
+        print("shared threadpool:")
+        await _scenario(client, headers, args.logins, args.concurrency)
+        pool.run = pool_run
+        print(f"pool stats: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
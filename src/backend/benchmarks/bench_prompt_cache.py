@@ -0,0 +1,126 @@
+"""Prompt-prefix cache hit rate of chat request layouts, scored by the fake OpenAI server.
+
+Simulates interleaved multi-turn conversations for league and referee users and counts
+the prompt tokens the provider could serve from its prefix cache (prompts of 1024+
+tokens, 128-token blocks, as the real API does) for three ways of placing the user
+context:
+
+    inline    context appended to the system prompt (the previous layout)
+    separate  static system prompt, then a context message, then history (current)
+    trailing  static system prompt, history, then the context right before the message
+
+It also times assembling the static part per request: rebuilding the prompt and tool
+schemas (previous behaviour) against reading them from the registry. `--pad-tokens`
+lengthens the static prompt, e.g. to see a prefix past the 1024-token minimum shared
+across users. Run from src/backend:
+
+    PYTHONPATH=src python benchmarks/bench_prompt_cache.py [--users 50 --turns 6 --pad-tokens 0]
+"""
+
+import argparse
+import copy
+import statistics
+import time
+from typing import Any, Dict, List
+
+from app.integrations import fake_openai
+from app.services.ai_chat_registry import context_message, prompt_for_role
+
+CONTEXTS = {
+    "league": {"league_name": "Metro Youth League", "region": "North NJ", "level": "competitive"},
+    "referee": {"ref_name": "Sam Rivera", "cert_level": "U16", "location": "Edison, NJ"},
+}
+USER_TURN = "Can you find open U12 games near Edison next Saturday and tell me the fees? " * 2
+ASSISTANT_TURN = (
+    "Here are the open games I found for next Saturday, with field, kickoff time, age "
+    "group and the centre and assistant fees for each one. " * 4
+)
+
+
+def _messages(
+    layout: str, role: str, user: int, history: List[Dict[str, str]], pad: str
+) -> List[dict]:
+    prompt = prompt_for_role(role)
+    static = {"role": "system", "content": prompt.system_message["content"] + pad}
+    context = context_message(role, {**CONTEXTS[role], "ref_name": f"User {user}"})
+    message = {"role": "user", "content": f"User {user}: {USER_TURN}"}
+    if layout == "inline":
+        system = {
+            "role": "system",
+            "content": static["content"] + "\n\n" + context["content"],
+        }
+        return [system, *history, message]
+    if layout == "separate":
+        return [static, context, *history, message]
+    return [static, *history, context, message]
+
+
+def _hit_rate(layout: str, users: int, turns: int, pad: str) -> Dict[str, Any]:
+    fake_openai._prefix_cache.clear()
+    histories: Dict[int, List[Dict[str, str]]] = {u: [] for u in range(users)}
+    prompt_tokens = cached = 0
+    for _ in range(turns):
+        for user in range(users):
+            role = "league" if user % 2 else "referee"
+            body = {
+                "tools": prompt_for_role(role).tools,
+                "messages": _messages(layout, role, user, histories[user], pad),
+            }
+            prompt_tokens += fake_openai._tokens(
+                fake_openai.json.dumps(body["tools"])
+                + "".join(fake_openai.json.dumps(m) for m in body["messages"])
+            )
+            cached += fake_openai._cached_tokens(body)
+            # Each user's history is their own, so only the static prefix is shared.
+            histories[user] += [
+                {"role": "user", "content": f"User {user}: {USER_TURN}"},
+                {"role": "assistant", "content": f"User {user}: {ASSISTANT_TURN}"},
+            ]
+    return {"prompt_tokens": prompt_tokens, "cached": cached, "rate": cached / prompt_tokens}
+
+
+def _assembly_us(rebuild: bool, rounds: int = 20_000) -> float:
+    start = time.perf_counter()
+    for i in range(rounds):
+        role = "league" if i % 2 else "referee"
+        prompt = prompt_for_role(role)
+        if rebuild:
+            tools = copy.deepcopy(prompt.tools)
+            system = {"role": "system", "content": "".join([prompt.system_message["content"]])}
+        else:
+            tools, system = prompt.tools, dict(prompt.system_message)
+        context_message(role, CONTEXTS[role])
+    return (time.perf_counter() - start) * 1e6 / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--pad-tokens", type=int, default=0)
+    args = parser.parse_args()
+    # Stand-in for longer instructions; the fake counts ~4 characters per token.
+    pad = "\n" + "Keep answers short. " * (args.pad_tokens // 5) if args.pad_tokens else ""
+
+    for role in ("league", "referee"):
+        prompt = prompt_for_role(role)
+        prefix = fake_openai._tokens(
+            fake_openai.json.dumps(prompt.tools) + fake_openai.json.dumps(prompt.system_message)
+        ) + args.pad_tokens
+        print(f"{role}: static prefix ~{prefix} tokens, digest {prompt.prefix_digest}")
+
+    print(f"users={args.users} turns={args.turns} pad_tokens={args.pad_tokens}")
+    for layout in ("inline", "separate", "trailing"):
+        result = _hit_rate(layout, args.users, args.turns, pad)
+        print(
+            f"{layout:>9}: prompt_tokens={result['prompt_tokens']} "
+            f"cached={result['cached']} hit_rate={result['rate']:.1%}"
+        )
+
+    rebuild = statistics.median(_assembly_us(True) for _ in range(5))
+    registry = statistics.median(_assembly_us(False) for _ in range(5))
+    print(f"static prompt assembly: rebuild={rebuild:.1f}us registry={registry:.1f}us per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Benchmark top-k referee ranking over a large synthetic candidate pool.
+
+Run from src/backend:
+
+    PYTHONPATH=src python benchmarks/bench_ranking.py
+"""
+
+import random
+import statistics
+import time
+
+from app.services.ranking_service import WEIGHT_PROFILES, CandidateFeatures, top_k
+
+CANDIDATES = 100_000
+ROUNDS = 20
+
+
+def main() -> None:
+    rng = random.Random(42)
+    candidates = [
+        CandidateFeatures(i, *(rng.random() for _ in range(5))) for i in range(CANDIDATES)
+    ]
+    weights = WEIGHT_PROFILES["default"]
+
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        top_k(candidates, weights, k=5)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"candidates={CANDIDATES} rounds={ROUNDS}")
+    print(f"median={statistics.median(timings):.1f}ms max={max(timings):.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Time a bulk referee import against creating the same accounts through /auth/register.
+
+Uses a throwaway SQLite database and the in-process test client, counting the SQL
+statements each approach executes. Run from src/backend:
+
+    PYTHONPATH=src python benchmarks/bench_referee_import.py [--referees 5000 --register 200]
+"""
+
+import argparse
+import csv
+import io
+import os
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench_import.db"
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-" + "x" * 32)
+os.environ.setdefault("RECOMMENDER_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.referee_import_service import _process_count  # noqa: E402
+
+FIELDS = ["email", "password", "full_name", "home_location", "cert_level", "bio"]
+
+_statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(*_args) -> None:
+    global _statements
+    _statements += 1
+
+
+def _csv(count: int, offset: int = 0) -> bytes:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    for i in range(offset, offset + count):
+        writer.writerow(
+            {
+                "email": f"ref{i}@assoc.example.com",
+                "password": f"initial-{i}",
+                "full_name": f"Referee {i}",
+                "home_location": "Edison, NJ",
+                "cert_level": "U14",
+                "bio": "Center and AR for youth travel games",
+            }
+        )
+    return out.getvalue().encode()
+
+
+def main() -> None:
+    global _statements
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--referees", type=int, default=5000)
+    parser.add_argument("--register", type=int, default=200)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with TestClient(app) as client:
+        league = client.post(
+            "/auth/register",
+            json={"email": "assoc@example.com", "password": "x", "role": "league", "name": "A"},
+        ).json()
+        headers = {"Authorization": f"Bearer {league['access_token']}"}
+
+        # Warm up the hashing processes so the timing below is the import itself.
+        client.post(
+            "/refs/import/csv", files={"file": ("w.csv", _csv(1, 10**6))}, headers=headers
+        ).raise_for_status()
+
+        _statements = 0
+        start = time.perf_counter()
+        response = client.post(
+            "/refs/import/csv", files={"file": ("refs.csv", _csv(args.referees))}, headers=headers
+        )
+        response.raise_for_status()
+        elapsed = time.perf_counter() - start
+        result = response.json()
+        print(
+            f"bulk import: {result['created']} referees in {elapsed:.2f}s "
+            f"({_process_count()} hashing processes), {_statements} statements, "
+            f"{len(result['errors'])} errors"
+        )
+
+        _statements = 0
+        start = time.perf_counter()
+        for i in range(args.register):
+            client.post(
+                "/auth/register",
+                json={
+                    "email": f"single{i}@assoc.example.com",
+                    "password": f"initial-{i}",
+                    "role": "referee",
+                    "name": f"Single {i}",
+                    "home_location": "Edison, NJ",
+                    "cert_level": "U14",
+                },
+            ).raise_for_status()
+        elapsed = time.perf_counter() - start
+        print(
+            f"/auth/register: {args.register} referees in {elapsed:.2f}s, "
+            f"{_statements / args.register:.1f} statements each; "
+            f"{args.referees} would take ~{elapsed / args.register * args.referees:.0f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
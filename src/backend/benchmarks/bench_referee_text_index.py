@@ -0,0 +1,89 @@
+"""Benchmark the referee BM25 index: build time, memory footprint and query latency.
+
+Run from src/backend:
+
+    PYTHONPATH=src python benchmarks/bench_referee_text_index.py
+"""
+
+import random
+import statistics
+import time
+import tracemalloc
+
+from app.core.bm25 import BM25Index
+from app.services.referee_text_index import tokenize
+
+PROFILES = 50_000
+ROUNDS = 200
+PHRASES = [
+    "assistant referee for high school varsity",
+    "center referee in adult amateur leagues",
+    "experienced AR, state cup and college matches",
+    "USSF grade 7, futsal and indoor",
+    "youth recreational and travel games on weekends",
+    "former player, referees premier academy matches",
+    "bilingual, mentors new referees",
+    "college club soccer and NPSL",
+]
+QUERIES = [
+    "experienced AR who has done high school varsity",
+    "center ref for adult amateur",
+    "someone who does futsal",
+    "college matches mentor",
+]
+
+
+def main() -> None:
+    rng = random.Random(7)
+    # A few thousand filler words stand in for the long tail of real bios.
+    filler = [f"w{n}" for n in range(5000)]
+    docs = [
+        (
+            i,
+            tokenize(
+                ". ".join(rng.sample(PHRASES, 3))
+                + " "
+                + " ".join(rng.choices(filler, k=rng.randint(5, 40)))
+                + " center, ar U14"
+            ),
+        )
+        for i in range(PROFILES)
+    ]
+
+    index = BM25Index()
+    start = time.perf_counter()
+    index.rebuild(docs)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    BM25Index().rebuild(docs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for i in range(1000):
+        index.upsert(i, docs[(i * 7) % PROFILES][1])
+    upsert_us = (time.perf_counter() - start) * 1e6 / 1000
+
+    candidates = list(range(0, PROFILES, 10))
+    full, restricted = [], []
+    for r in range(ROUNDS):
+        tokens = tokenize(QUERIES[r % len(QUERIES)])
+        start = time.perf_counter()
+        index.search(tokens)
+        full.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        index.search(tokens, candidates)
+        restricted.append((time.perf_counter() - start) * 1000)
+
+    print(f"profiles={PROFILES} {index.stats()}")
+    print(f"build={build_ms:.0f}ms peak_alloc={peak / 1e6:.1f}MB upsert={upsert_us:.0f}us")
+    print(f"query all: median={statistics.median(full):.2f}ms max={max(full):.2f}ms")
+    print(
+        f"query {len(candidates)} candidates: median={statistics.median(restricted):.2f}ms "
+        f"max={max(restricted):.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
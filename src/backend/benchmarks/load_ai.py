@@ -0,0 +1,151 @@
+"""Offline load scenarios for the AI endpoints, backed by the fake OpenAI server.
+
+Start the stand-in and the API pointed at it (from src/backend):
+
+    FAKE_OPENAI_LATENCY_MS=400 PYTHONPATH=src uvicorn app.integrations.fake_openai:app --port 8100
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 PYTHONPATH=src uvicorn app.main:app --port 8000
+
+then run a scenario:
+
+    PYTHONPATH=src python benchmarks/load_ai.py find-ref --requests 500 --concurrency 50
+    PYTHONPATH=src python benchmarks/load_ai.py ai-chat --requests 200 --concurrency 20
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 PYTHONPATH=src \\
+        python benchmarks/load_ai.py ingest --requests 100 --concurrency 10
+
+`find-ref` and `ai-chat` go through HTTP; `ingest` has no route, so it drives the LLM
+extraction step of the ingestion service directly against the configured client.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Awaitable, Callable, List, Tuple
+
+import httpx
+
+CORPUS = Path(__file__).parent / "data" / "ref_query_corpus.jsonl"
+CHAT_MESSAGES = [
+    "Find me a referee for a U12 travel game within 20 km",
+    "What games do I have coming up?",
+    "Show me the details of my next game",
+    "Find referees rated 4+ for a premier match",
+]
+SCHEDULE_TEXT = (
+    "Saturday June 6 2026, 10:00 at Fake Park field 1: U12 travel, center fee $40, AR $25\n"
+    "Sunday June 7 2026, 14:30 at Riverside complex field 3: U14 premier"
+)
+
+
+async def _league_session(client: httpx.AsyncClient) -> Tuple[dict, int]:
+    email = f"load-{uuid.uuid4().hex[:10]}@example.com"
+    response = await client.post(
+        "/auth/register",
+        json={"email": email, "password": "load-test", "role": "league", "name": "Load Test"},
+    )
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    league = (await client.get("/leagues/me", headers=headers)).json()
+    return headers, league["id"]
+
+
+async def _run(
+    requests: int, concurrency: int, call: Callable[[int], Awaitable[int]]
+) -> Tuple[List[float], Counter, float]:
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+
+    async def worker() -> None:
+        while not queue.empty():
+            i = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                outcomes[await call(i)] += 1
+            except Exception as exc:
+                outcomes[type(exc).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, outcomes, time.perf_counter() - start
+
+
+def _report(name: str, concurrency: int, latencies: List[float], outcomes: Counter, elapsed: float):
+    ordered = sorted(latencies)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    print(f"scenario={name} requests={len(latencies)} concurrency={concurrency}")
+    print(f"throughput={len(latencies) / elapsed:.1f} req/s elapsed={elapsed:.1f}s")
+    print(
+        f"latency p50={pct(50):.0f}ms p95={pct(95):.0f}ms p99={pct(99):.0f}ms "
+        f"mean={statistics.mean(ordered):.0f}ms"
+    )
+    print("outcomes=" + ", ".join(f"{k}:{v}" for k, v in sorted(outcomes.items(), key=str)))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("scenario", choices=["find-ref", "ai-chat", "ingest"])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.scenario == "ingest":
+        from app.integrations.openai_client import close_async_client
+        from app.services.ingestion_service import _aextract_with_llm
+
+        async def call(i: int) -> int:
+            rows = await _aextract_with_llm(SCHEDULE_TEXT)
+            return 200 if rows else 204
+
+        try:
+            result = await _run(args.requests, args.concurrency, call)
+        finally:
+            await close_async_client()
+        _report(args.scenario, args.concurrency, *result)
+        return
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120, limits=limits) as client:
+        headers, league_id = await _league_session(client)
+
+        if args.scenario == "find-ref":
+            queries = [json.loads(line)["query"] for line in CORPUS.read_text().splitlines()]
+
+            async def call(i: int) -> int:
+                response = await client.post(
+                    "/ai/find-ref",
+                    headers=headers,
+                    json={
+                        "league_id": league_id,
+                        "natural_language_query": queries[i % len(queries)],
+                    },
+                )
+                return response.status_code
+
+        else:
+
+            async def call(i: int) -> int:
+                response = await client.post(
+                    "/messages/ai-chat",
+                    headers=headers,
+                    json={"message": CHAT_MESSAGES[i % len(CHAT_MESSAGES)]},
+                )
+                return response.status_code
+
+        result = await _run(args.requests, args.concurrency, call)
+    _report(args.scenario, args.concurrency, *result)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
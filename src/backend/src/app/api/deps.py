@@ -1,11 +1,14 @@
 """API dependencies for auth and database."""
 
-from typing import Generator
+import hmac
+from typing import Generator, Optional
 
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from app.config import get_settings
+from app.core.auth_context import load_user
 from app.core.security import decode_access_token
 from app.db.session import get_db
 from app.models.league import League
@@ -13,6 +16,7 @@ from app.models.referee import RefereeProfile
 from app.models.user import User
 
 security = HTTPBearer()
+operator_token = APIKeyHeader(name="X-Operator-Token", auto_error=False)
 
 
 def get_db_dep() -> Generator:
@@ -31,31 +35,34 @@ def get_current_user(
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = load_user(db, int(user_id))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
 
 
-def get_current_referee(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_dep),
-) -> RefereeProfile:
+def get_current_referee(current_user: User = Depends(get_current_user)) -> RefereeProfile:
     if current_user.role not in {"ref", "referee"}:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Referee role required")
-    profile = db.query(RefereeProfile).filter(RefereeProfile.user_id == current_user.id).first()
+    profile = current_user.referee_profile
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Referee profile missing")
     return profile
 
 
-def get_current_league(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_dep),
-) -> League:
+def get_current_league(current_user: User = Depends(get_current_user)) -> League:
     if current_user.role != "league":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="League role required")
-    league = db.query(League).filter(League.user_id == current_user.id).first()
+    league = current_user.league_profile
     if not league:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="League profile missing")
     return league
+
+
+def require_operator(token: Optional[str] = Depends(operator_token)) -> None:
+    """Process-wide operational data spans every league; only operators may read it."""
+    expected = get_settings().OPERATOR_TOKEN
+    if not expected or not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Operator access required"
+        )
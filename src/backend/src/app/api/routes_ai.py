@@ -3,9 +3,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_league, get_db_dep
+from app.api.deps import get_current_league, get_db_dep, require_operator
+from app.core.llm_metrics import llm_metrics
+from app.integrations.openai_client import completion_flight, get_breaker
 from app.schemas.ai import FindRefRequest, FindRefResult
 from app.services.ai_matching_service import find_best_refs_from_nl
+from app.services.constraint_cache import parse_cache_stats
 
 router = APIRouter()
 
@@ -17,3 +20,24 @@ def find_ref(
     _league=Depends(get_current_league),
 ) -> FindRefResult:
     return find_best_refs_from_nl(db, payload)
+
+
+@router.get("/parse-cache/stats")
+def parse_cache_stats_route(_league=Depends(get_current_league)) -> dict:
+    return parse_cache_stats()
+
+
+@router.get("/llm-metrics")
+def llm_metrics_route(current_league=Depends(get_current_league)) -> dict:
+    """This league's LLM calls, tokens, cost and latency percentiles."""
+    return llm_metrics.league(current_league.id)
+
+
+@router.get("/llm-metrics/global", dependencies=[Depends(require_operator)])
+def llm_metrics_global_route() -> dict:
+    """Rollups by feature across all leagues, plus breaker and coalescing state."""
+    return {
+        "features": llm_metrics.features(),
+        "breaker": get_breaker().stats(),
+        "coalescing": completion_flight.stats(),
+    }
@@ -1,25 +1,42 @@
 """Auth routes."""
 
-from pathlib import Path
-from uuid import uuid4
-
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-
-from app.api.deps import get_db_dep, get_current_user
-from app.core.auth import authenticate_user, create_access_token_for_user, create_user
+from starlette.datastructures import UploadFile as StarletteUploadFile
+
+from app.api.deps import get_current_league, get_current_user, get_db_dep
+from app.config import get_settings
+from app.core.auth import (
+    authenticate_user,
+    create_access_token_for_user,
+    create_user,
+    find_user_by_email,
+)
+from app.core.auth_context import invalidate_auth_context
+from app.core.password_pool import PasswordPoolBusy, get_password_pool, hash_password
 from app.models.league import League
 from app.models.referee import RefereeProfile
-from app.models.user import User
 from app.schemas.auth import AuthResponse, LoginRequest, RegisterRequest, Token, UserResponse
+from app.services.image_storage import store_image
+from app.services.recommendation_service import mark_referee_changed
+from app.services.referee_text_index import index_referee
 
 router = APIRouter()
 
 
+def _password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=AuthResponse)
-def register(payload: RegisterRequest, db: Session = Depends(get_db_dep)) -> AuthResponse:
+async def register(payload: RegisterRequest, db: Session = Depends(get_db_dep)) -> AuthResponse:
     """Register a new user (referee or league manager)."""
-    existing = db.query(User).filter(User.email == payload.email).first()
+    existing = await run_in_threadpool(find_user_by_email, db, payload.email)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     
@@ -56,11 +73,21 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db_dep)) -> Aut
             detail="League name is required",
         )
 
+    try:
+        hashed_password = await hash_password(payload.password)
+    except PasswordPoolBusy:
+        raise _password_pool_busy()
+    return await run_in_threadpool(_create_account, db, payload, normalized_role, hashed_password)
+
+
+def _create_account(
+    db: Session, payload: RegisterRequest, normalized_role: str, hashed_password: str
+) -> AuthResponse:
     # Create user account
     user = create_user(
         db,
         payload.email,
-        payload.password,
+        hashed_password,
         normalized_role,
         profile_image_url=payload.profile_image_url,
     )
@@ -84,14 +111,20 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db_dep)) -> Aut
     
     db.commit()
     db.refresh(user)
+    if normalized_role == "referee":
+        index_referee(profile)
+        mark_referee_changed(profile.id)
     token = create_access_token_for_user(user)
     return AuthResponse(access_token=token, token_type="bearer", user=UserResponse.model_validate(user))
 
 
 @router.post("/login", response_model=AuthResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db_dep)) -> AuthResponse:
+async def login(payload: LoginRequest, db: Session = Depends(get_db_dep)) -> AuthResponse:
     """Login with email and password. Returns JWT access token."""
-    user = authenticate_user(db, payload.email, payload.password)
+    try:
+        user = await authenticate_user(db, payload.email, payload.password)
+    except PasswordPoolBusy:
+        raise _password_pool_busy()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
     
@@ -105,27 +138,81 @@ def me(current_user=Depends(get_current_user)) -> UserResponse:
     return UserResponse.model_validate(current_user)
 
 
-@router.post("/profile-image", response_model=UserResponse)
-def upload_profile_image(
-    file: UploadFile,
+# Room in a multipart body for boundaries and part headers around the image itself.
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+PROFILE_IMAGE_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+def _image_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Image larger than {max_bytes // (1024 * 1024)} MB",
+    )
+
+
+@router.post("/profile-image", response_model=UserResponse, openapi_extra=PROFILE_IMAGE_FORM)
+async def upload_profile_image(
+    request: Request,
     db: Session = Depends(get_db_dep),
     current_user=Depends(get_current_user),
 ) -> UserResponse:
-    if not file.content_type or not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image file")
-
-    extension = Path(file.filename or "").suffix or ".png"
-    filename = f"{uuid4().hex}{extension}"
-    uploads_dir = Path(__file__).resolve().parent.parent / "uploads"
-    uploads_dir.mkdir(parents=True, exist_ok=True)
-    destination = uploads_dir / filename
+    """Upload a profile image as the `file` field of a multipart form.
+
+    The form is parsed here rather than by FastAPI so an oversize body is refused on its
+    Content-Length before any of it is received; PROFILE_IMAGE_MAX_BYTES then bounds the
+    image itself while it is stored.
+    """
+    max_bytes = get_settings().PROFILE_IMAGE_MAX_BYTES
+    length = request.headers.get("content-length")
+    if length is None:
+        raise HTTPException(
+            status_code=status.HTTP_411_LENGTH_REQUIRED, detail="Content-Length required"
+        )
+    if not length.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Content-Length"
+        )
+    if int(length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise _image_too_large(max_bytes)
+
+    async with request.form(max_files=1) as form:
+        file = form.get("file")
+        if not isinstance(file, StarletteUploadFile):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No image file")
+        if not file.content_type or not file.content_type.startswith("image/"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image file"
+            )
+        if file.size is not None and file.size > max_bytes:
+            raise _image_too_large(max_bytes)
+        url = await run_in_threadpool(store_image, file.file)
+    return await run_in_threadpool(_set_profile_image, db, current_user, url)
 
-    with destination.open("wb") as buffer:
-        buffer.write(file.file.read())
 
-    current_user.profile_image_url = f"/uploads/{filename}"
-    db.add(current_user)
+def _set_profile_image(db: Session, user, url: str) -> UserResponse:
+    user.profile_image_url = url
+    db.add(user)
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
+    invalidate_auth_context(user.id)
+    return UserResponse.model_validate(user)
 
-    return UserResponse.model_validate(current_user)
+
+@router.get("/hash-pool/stats")
+def hash_pool_stats(_league=Depends(get_current_league)) -> dict:
+    """Queue depth, rejections, rehashes and timings of the password hashing pool."""
+    return get_password_pool().stats()
@@ -1,22 +1,53 @@
 """Game routes."""
 
+from datetime import date
 from typing import List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi import status as http_status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_league, get_db_dep
+from app.core.http_cache import make_etag, not_modified
 from app.models.game import Game
-from app.schemas.assignment import AssignmentCreate, AssignmentResponse
-from app.schemas.game import GameCreate, GameResponse, GameUpdate
+from app.schemas.assignment import (
+    AssignmentCreate,
+    AssignmentResponse,
+    BatchAssignmentRequest,
+    BatchAssignmentResponse,
+    ChainAssignmentCreate,
+)
+from app.schemas.game import (
+    GameChainResponse,
+    GameCreate,
+    GameRecommendationResponse,
+    GameResponse,
+    GameUpdate,
+    RecommendedReferee,
+)
+from app.services.batch_assignment_service import auto_assign_games
+from app.services.chaining_service import (
+    DEFAULT_MAX_CHAIN_GAMES,
+    DEFAULT_MAX_HOP_KM,
+    list_day_chains,
+    request_chain_assignment,
+)
+from app.services.game_feed_service import invalidate_game_feeds
 from app.services.game_service import (
     create_game,
     get_game,
     list_assignments_for_game,
+    list_game_versions,
     list_games,
     request_assignment,
     update_game,
 )
+from app.services.recommendation_service import (
+    get_game_recommendations,
+    mark_game_changed,
+    mark_referee_changed,
+)
 
 router = APIRouter()
 
@@ -33,24 +64,129 @@ def create_game_route(
 
 @router.get("", response_model=List[GameResponse])
 def list_games_route(
+    request: Request,
+    response: Response,
     status: Optional[str] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    location: Optional[str] = Query(None, description="Matches field name or address"),
+    lat: Optional[float] = Query(None),
+    lon: Optional[float] = Query(None),
+    radius_km: Optional[float] = Query(None, gt=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
     db: Session = Depends(get_db_dep),
     current_league=Depends(get_current_league),
 ) -> List[GameResponse]:
-    games = list_games(db, current_league, status)
+    filters = dict(
+        limit=limit,
+        date_from=date_from,
+        date_to=date_to,
+        location=location,
+        lat=lat,
+        lon=lon,
+        radius_km=radius_km,
+    )
+    # The id/updated_at scan is cheap next to loading and serializing the full rows.
+    versions = list_game_versions(db, current_league, status, **filters)
+    etag = make_etag("games", current_league.id, status, sorted(filters.items()), versions)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    games = list_games(db, current_league, status, **filters)
     return [GameResponse.model_validate(g) for g in games]
 
 
+@router.post("/batch-assignments", response_model=BatchAssignmentResponse)
+def batch_assignments_route(
+    payload: BatchAssignmentRequest,
+    db: Session = Depends(get_db_dep),
+    current_league=Depends(get_current_league),
+) -> BatchAssignmentResponse:
+    result = auto_assign_games(
+        db, current_league, payload.game_ids, payload.roles, dry_run=payload.dry_run
+    )
+    if not payload.dry_run:
+        invalidate_game_feeds()
+        for item in result["assignments"]:
+            if item["assignment_id"] is not None:
+                mark_game_changed(item["game_id"])
+                mark_referee_changed(item["referee_id"])
+    return BatchAssignmentResponse(**result)
+
+
+@router.get("/chains", response_model=List[GameChainResponse])
+def list_chains_route(
+    day: date = Query(...),
+    max_hop_km: float = Query(DEFAULT_MAX_HOP_KM, gt=0),
+    max_games: int = Query(DEFAULT_MAX_CHAIN_GAMES, ge=1, le=6),
+    tz: str = Query("UTC", description="IANA time zone `day` is in, e.g. America/Chicago"),
+    db: Session = Depends(get_db_dep),
+    current_league=Depends(get_current_league),
+) -> List[GameChainResponse]:
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST, detail=f"Unknown time zone: {tz}"
+        )
+    chains = list_day_chains(db, current_league, day, max_hop_km, max_games, tz=zone)
+    return [
+        GameChainResponse(
+            game_ids=[g.id for g in chain.games],
+            field_location_ids=[g.field_location_id for g in chain.games],
+            start=chain.start,
+            end=chain.end,
+            travel_km=chain.travel_km,
+        )
+        for chain in chains
+    ]
+
+
+@router.post("/chains/assignments", response_model=List[AssignmentResponse])
+def request_chain_route(
+    payload: ChainAssignmentCreate,
+    db: Session = Depends(get_db_dep),
+    current_league=Depends(get_current_league),
+) -> List[AssignmentResponse]:
+    assignments = request_chain_assignment(
+        db, current_league, payload.game_ids, payload.referee_id, payload.role
+    )
+    return [AssignmentResponse.model_validate(a) for a in assignments]
+
+
 @router.get("/{game_id}", response_model=GameResponse)
 def get_game_route(
     game_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db_dep),
     current_league=Depends(get_current_league),
 ) -> GameResponse:
     game = get_game(db, game_id, current_league)
+    cached = not_modified(request, response, make_etag("game", game.id, game.updated_at))
+    if cached is not None:
+        return cached
     return GameResponse.model_validate(game)
 
 
+@router.get("/{game_id}/recommendations", response_model=GameRecommendationResponse)
+def game_recommendations_route(
+    game_id: int,
+    db: Session = Depends(get_db_dep),
+    current_league=Depends(get_current_league),
+) -> GameRecommendationResponse:
+    """Precomputed best-fit referees for an open game (lowest cost first; empty once closed)."""
+    game = get_game(db, game_id, current_league)
+    row = get_game_recommendations(db, game)
+    if row is None:
+        return GameRecommendationResponse(game_id=game.id, referees=[])
+    return GameRecommendationResponse(
+        game_id=game.id,
+        computed_at=row.computed_at,
+        referees=[RecommendedReferee(**entry) for entry in row.entries],
+    )
+
+
 @router.patch("/{game_id}", response_model=GameResponse)
 def update_game_route(
     game_id: int,
@@ -1,9 +1,10 @@
 """League routes."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_league, get_db_dep
+from app.core.http_cache import make_etag, not_modified
 from app.schemas.league import LeagueResponse, LeagueUpdate
 from app.services.league_service import update_league
 
@@ -11,7 +12,13 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=LeagueResponse)
-def get_me(current_league=Depends(get_current_league)) -> LeagueResponse:
+def get_me(
+    request: Request, response: Response, current_league=Depends(get_current_league)
+) -> LeagueResponse:
+    etag = make_etag("league", current_league.id, current_league.updated_at)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
     return LeagueResponse.model_validate(current_league)
 
 
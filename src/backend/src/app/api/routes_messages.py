@@ -1,12 +1,24 @@
 """Message/chat routes."""
 
-from typing import Dict, List, Set
-
-from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+import json
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db_dep, get_current_user
 from app.core.security import decode_access_token
+from app.db.session import SessionLocal
 from app.models.user import User
 from app.schemas.message import (
     MessageCreate,
@@ -18,6 +30,7 @@ from app.schemas.message import (
 )
 from app.services.message_service import MessageService
 from app.services.ai_chat_service import AIChatAssistant
+from app.services.chat_memory_service import clear_memory
 
 router = APIRouter()
 
@@ -54,6 +67,7 @@ inbox_manager = InboxConnectionManager()
 @router.post("/ai-chat", response_model=AIChatResponse)
 async def ai_chat(
     chat_message: AIChatMessage,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db_dep),
     current_user: User = Depends(get_current_user),
 ) -> AIChatResponse:
@@ -64,11 +78,62 @@ async def ai_chat(
         user_role=current_user.role,
         message=chat_message.message,
         conversation_history=chat_message.conversation_history,
+        background_tasks=background_tasks,
     )
     
     return AIChatResponse(**result)
 
 
+@router.delete("/ai-chat/history")
+async def clear_ai_chat_history(
+    db: Session = Depends(get_db_dep),
+    current_user: User = Depends(get_current_user),
+) -> dict:
+    """Forget the AI assistant's stored conversation for the current user."""
+    return {"cleared": clear_memory(db, current_user.id)}
+
+
+async def _ai_chat_events(
+    user_id: int,
+    user_role: str,
+    message: str,
+    conversation_history: Optional[List[Dict[str, str]]],
+) -> AsyncIterator[str]:
+    # The stream outlives the request-scoped session, so it owns its own.
+    db = SessionLocal()
+    try:
+        async for event in AIChatAssistant.chat_stream(
+            db=db,
+            user_id=user_id,
+            user_role=user_role,
+            message=message,
+            conversation_history=conversation_history,
+        ):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+    except Exception:
+        yield 'event: error\ndata: {"type": "error", "message": "AI chat failed"}\n\n'
+    finally:
+        db.close()
+
+
+@router.post("/ai-chat/stream")
+async def ai_chat_stream(
+    chat_message: AIChatMessage,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream the AI assistant's reply as Server-Sent Events (token, tool_result, done)."""
+    return StreamingResponse(
+        _ai_chat_events(
+            current_user.id,
+            current_user.role,
+            chat_message.message,
+            chat_message.conversation_history,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.websocket("/ws/inbox")
 async def inbox_ws(
     websocket: WebSocket,
@@ -3,37 +3,67 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_league, get_current_referee, get_db_dep
+from app.config import get_settings
+from app.core.auth_context import invalidate_auth_context
+from app.core.http_cache import make_etag, not_modified
+from app.db.session import SessionLocal
 from app.models.assignment import Assignment
 from app.models.availability import AvailabilitySlot
 from app.models.note import RefNote
 from app.models.rating import Rating
 from app.models.referee import RefereeProfile
 from app.schemas.assignment import AssignmentResponse
+from app.schemas.game import GameFeedItem, GameResponse
 from app.schemas.note import NoteCreate, NoteResponse
 from app.schemas.rating import RatingCreate, RatingResponse
 from app.schemas.referee import (
     AvailabilityCreate,
+    RefereeImportRequest,
+    RefereeImportResult,
     RefereeLookupResponse,
     RefereeProfilePublic,
     RefereeProfileUpdate,
+    RefereeStatsEntry,
     RefereeStatsResponse,
 )
+from app.services.game_feed_service import (
+    FEED_PAGE_SIZE,
+    get_referee_feed,
+    invalidate_referee_feed,
+)
 from app.services.referee_service import (
     get_referee_stats,
-    search_candidate_refs,
+    get_referee_stats_many,
+    invalidate_referee_stats,
+    iter_search_refs,
     search_refs_by_name_or_email,
+    search_refs_page,
 )
 from app.services.rating_service import create_note, create_rating
+from app.services.referee_import_service import import_referees, parse_referee_csv
+from app.services.recommendation_service import mark_game_changed, mark_referee_changed
+from app.services.referee_text_index import index_referee
 
 router = APIRouter()
 
+MAX_STATS_BATCH = 100
+
 
 @router.get("/me", response_model=RefereeProfilePublic)
-def get_me(current_ref: RefereeProfile = Depends(get_current_referee)) -> RefereeProfilePublic:
+def get_me(
+    request: Request,
+    response: Response,
+    current_ref: RefereeProfile = Depends(get_current_referee),
+) -> RefereeProfilePublic:
+    etag = make_etag("referee", current_ref.id, current_ref.updated_at)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
     return RefereeProfilePublic.model_validate(current_ref)
 
 
@@ -47,8 +77,67 @@ def update_me(
         setattr(current_ref, key, value)
     db.commit()
     db.refresh(current_ref)
+    invalidate_auth_context(current_ref.user_id)
+    invalidate_referee_feed(current_ref.id)
+    index_referee(current_ref)
+    mark_referee_changed(current_ref.id)
     return RefereeProfilePublic.model_validate(current_ref)
 
+
+@router.get("/me/feed", response_model=List[GameFeedItem])
+def my_feed(
+    response: Response,
+    limit: int = Query(FEED_PAGE_SIZE, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db_dep),
+    current_ref: RefereeProfile = Depends(get_current_referee),
+) -> List[GameFeedItem]:
+    """Open games that fit the referee, nearest first; the next page cursor is in X-Next-Cursor."""
+    try:
+        entries, next_cursor = get_referee_feed(db, current_ref, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [
+        GameFeedItem(
+            **GameResponse.model_validate(entry.game).model_dump(),
+            field_name=entry.game.field_location.name,
+            address=entry.game.field_location.address,
+            distance_km=entry.distance_km,
+        )
+        for entry in entries
+    ]
+
+
+@router.post("/import", response_model=RefereeImportResult)
+async def import_refs(
+    payload: RefereeImportRequest,
+    db: Session = Depends(get_db_dep),
+    _league=Depends(get_current_league),
+) -> RefereeImportResult:
+    """Create referee accounts in bulk; rows that cannot be imported are listed in `errors`."""
+    return await import_referees(db, payload.referees)
+
+
+@router.post("/import/csv", response_model=RefereeImportResult)
+async def import_refs_csv(
+    file: UploadFile,
+    db: Session = Depends(get_db_dep),
+    _league=Depends(get_current_league),
+) -> RefereeImportResult:
+    """CSV variant of /refs/import: a header row naming RefereeImportRow fields."""
+    max_bytes = get_settings().BULK_IMPORT_MAX_CSV_BYTES
+    # Read at most one byte past the cap, so an oversize file never lands in memory.
+    content = await file.read(max_bytes + 1)
+    if len(content) > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"CSV larger than {max_bytes // (1024 * 1024)} MB",
+        )
+    return await import_referees(db, parse_referee_csv(content))
+
+
 @router.get("/lookup", response_model=List[RefereeLookupResponse])
 def lookup_refs(
     query: str = Query(..., min_length=2),
@@ -76,33 +165,100 @@ def lookup_refs(
         for ref, user in results
     ]
 
+
+def _ndjson_refs(constraints: dict, sort: str):
+    # Streaming outlives the request-scoped session, so the generator owns its own.
+    db = SessionLocal()
+    try:
+        for ref in iter_search_refs(db, constraints, sort):
+            yield RefereeProfilePublic.model_validate(ref).model_dump_json() + "\n"
+    finally:
+        db.close()
+
+
 @router.get("/search", response_model=List[RefereeProfilePublic])
 def search_refs(
+    response: Response,
     min_rating: Optional[float] = Query(None),
     max_distance_km: Optional[float] = Query(None),
     lat: Optional[float] = Query(None),
     lon: Optional[float] = Query(None),
+    sort: str = Query("id", pattern="^(id|rating|distance)$"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
     db: Session = Depends(get_db_dep),
-) -> List[RefereeProfilePublic]:
+):
+    """Search referees one page at a time; the next page's cursor is in `X-Next-Cursor`.
+
+    `format=ndjson` streams every match instead, one JSON object per line.
+    """
     constraints = {
         "min_rating": min_rating,
         "max_distance_km": max_distance_km,
         "location": {"lat": lat, "lon": lon},
     }
-    refs = search_candidate_refs(db, constraints)
+    if sort == "distance" and (lat is None or lon is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sorting by distance requires lat and lon",
+        )
+
+    if format == "ndjson":
+        return StreamingResponse(
+            _ndjson_refs(constraints, sort), media_type="application/x-ndjson"
+        )
+
+    try:
+        refs, next_cursor = search_refs_page(db, constraints, sort, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [RefereeProfilePublic.model_validate(r) for r in refs]
 
+
+@router.get("/stats", response_model=List[RefereeStatsEntry])
+def get_stats_batch(
+    ids: str = Query(..., description="Comma-separated referee ids"),
+    db: Session = Depends(get_db_dep),
+) -> List[RefereeStatsEntry]:
+    try:
+        ref_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid ids")
+    if not ref_ids or len(ref_ids) > MAX_STATS_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Provide between 1 and {MAX_STATS_BATCH} ids",
+        )
+    stats = get_referee_stats_many(db, ref_ids)
+    # Requested order; ids with no referee are left out.
+    return [
+        RefereeStatsEntry(referee_id=ref_id, **stats[ref_id])
+        for ref_id in dict.fromkeys(ref_ids)
+        if ref_id in stats
+    ]
+
+
 @router.get("/{ref_id}", response_model=RefereeProfilePublic)
-def get_ref(ref_id: int, db: Session = Depends(get_db_dep)) -> RefereeProfilePublic:
+def get_ref(
+    ref_id: int, request: Request, response: Response, db: Session = Depends(get_db_dep)
+) -> RefereeProfilePublic:
     ref = db.query(RefereeProfile).filter(RefereeProfile.id == ref_id).first()
     if not ref:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Referee not found")
+    cached = not_modified(request, response, make_etag("referee", ref.id, ref.updated_at))
+    if cached is not None:
+        return cached
     return RefereeProfilePublic.model_validate(ref)
 
 
 @router.get("/{ref_id}/stats", response_model=RefereeStatsResponse)
 def get_stats(ref_id: int, db: Session = Depends(get_db_dep)) -> RefereeStatsResponse:
     stats = get_referee_stats(db, ref_id)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Referee not found")
     return RefereeStatsResponse(
         games_reffed=stats["games_reffed"],
         average_rating=stats["average_rating"],
@@ -160,6 +316,8 @@ def add_availability(
     db.add(slot)
     db.commit()
     db.refresh(slot)
+    invalidate_referee_feed(current_ref.id)
+    mark_referee_changed(current_ref.id)
     return {"id": slot.id}
 
 
@@ -190,4 +348,8 @@ def respond_assignment(
     assignment.responded_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(assignment)
+    invalidate_referee_stats(current_ref.id)
+    invalidate_referee_feed(current_ref.id)
+    mark_game_changed(assignment.game_id)
+    mark_referee_changed(current_ref.id)
     return AssignmentResponse.model_validate(assignment)
@@ -1,6 +1,7 @@
 """Application configuration via Pydantic settings."""
 
 from functools import lru_cache
+from typing import Dict, List
 
 from pydantic_settings import BaseSettings
 
@@ -18,7 +19,74 @@ class AppSettings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Password hashing runs on its own threads so logins cannot starve other sync routes;
+    # past PASSWORD_HASH_MAX_PENDING queued hashes, login/register answer 503.
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 256
+    # pbkdf2 rounds for new hashes; stored hashes with fewer are upgraded at the next login.
+    PASSWORD_HASH_ROUNDS: int = 29000
+    # Sent as X-Operator-Token to read process-wide operational metrics; empty disables them.
+    OPERATOR_TOKEN: str = ""
+
     OPENAI_API_KEY: str = ""
+    # Point the client at an OpenAI-compatible server, e.g. app.integrations.fake_openai.
+    OPENAI_BASE_URL: str = ""
+    # Route LLM calls to the in-process fake (load and regression testing only).
+    OPENAI_USE_FAKE: bool = False
+    OPENAI_TIMEOUT_SECONDS: float = 30.0
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_MAX_RETRIES: int = 2
+    OPENAI_MAX_CONNECTIONS: int = 50
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+
+    # Upper bound per LLM call, SDK retries included; other features use OPENAI_TIMEOUT_SECONDS.
+    LLM_FEATURE_DEADLINES_SECONDS: Dict[str, float] = {
+        "parse_ref_request": 4.0,
+        "ai_chat": 20.0,
+        "ai_chat_stream": 10.0,
+        "chat_memory": 10.0,
+        "ingestion": 60.0,
+    }
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    # Launch a duplicate request when the first is this slow (0 disables hedging).
+    LLM_HEDGE_AFTER_MS: int = 0
+    LLM_HEDGED_FEATURES: List[str] = ["parse_ref_request"]
+
+    AI_CHAT_MAX_STEPS: int = 4
+    AI_CHAT_TIME_LIMIT_SECONDS: float = 45.0
+    AI_CHAT_HISTORY_TOKEN_BUDGET: int = 2000
+    AI_CHAT_HISTORY_COMPACT_TO_TOKENS: int = 1000
+    AI_CHAT_HISTORY_MIN_TURNS: int = 2
+    AI_CHAT_SUMMARY_MAX_TOKENS: int = 300
+
+    # Background top-k referee recommendations per open game.
+    RECOMMENDER_ENABLED: bool = True
+    RECOMMENDER_TOP_K: int = 5
+    RECOMMENDER_INTERVAL_SECONDS: float = 15.0
+    RECOMMENDER_FULL_REFRESH_SECONDS: float = 900.0
+
+    # Bulk referee import: rows and CSV bytes per upload, and processes hashing their
+    # passwords (0 means one per CPU).
+    BULK_IMPORT_MAX_ROWS: int = 10_000
+    BULK_IMPORT_MAX_CSV_BYTES: int = 5 * 1024 * 1024
+    BULK_IMPORT_HASH_PROCESSES: int = 0
+
+    PROFILE_IMAGE_MAX_BYTES: int = 5 * 1024 * 1024
+    # Unreferenced uploads are deleted once older than the grace period.
+    IMAGE_GC_INTERVAL_SECONDS: float = 3600.0
+    IMAGE_GC_GRACE_SECONDS: float = 3600.0
+
+    # Smaller responses are sent uncompressed; compressing them saves too little to pay off.
+    HTTP_COMPRESSION_MIN_BYTES: int = 1024
+
+    # How long a user and their profile are reused across requests (0 disables).
+    AUTH_CONTEXT_TTL_SECONDS: float = 30.0
+
+    PARSE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    PARSE_CACHE_PERSIST: bool = False
+    # Share of a query's words the rule parser must understand to skip the LLM.
+    PARSE_RULES_MIN_CONFIDENCE: float = 1.0
 
     class Config:
         env_file = ".env"
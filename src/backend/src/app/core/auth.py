@@ -3,31 +3,65 @@
 from datetime import timedelta
 from typing import Optional
 
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.password_pool import get_password_pool, verify_password_in_pool
+from app.core.security import create_access_token
 from app.models.user import User
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+def find_user_by_email(db: Session, email: str) -> Optional[User]:
+    """Look a user up, then roll back the read so the connection returns to the pool.
+
+    Callers go on to wait for the password pool; holding a pooled connection through
+    that wait would exhaust the pool under a burst of sign-ins. The session stays open
+    for the caller. The user is detached first, with its columns loaded, so the rollback
+    does not expire it.
+    """
     user = db.query(User).filter(User.email == email).first()
+    if user is not None:
+        db.expunge(user)
+    db.rollback()
+    return user
+
+
+def _store_rehash(db: Session, user: User, hashed_password: str) -> None:
+    db.add(user)
+    user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(user)
+
+
+async def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    """The user if the password matches; an outdated stored hash is upgraded on the way.
+
+    Database work runs on the shared threadpool and the hash check on the password pool;
+    while the check waits, the request holds no worker thread and no connection.
+    """
+    user = await run_in_threadpool(find_user_by_email, db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_password_in_pool(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        await run_in_threadpool(_store_rehash, db, user, new_hash)
+        get_password_pool().record_rehash()
     return user
 
 
 def create_user(
     db: Session,
     email: str,
-    password: str,
+    hashed_password: str,
     role: str,
     profile_image_url: Optional[str] = None,
 ) -> User:
+    """Add a user whose password was already hashed (see `app.core.password_pool`)."""
     user = User(
         email=email,
-        hashed_password=get_password_hash(password),
+        hashed_password=hashed_password,
         role=role,
         profile_image_url=profile_image_url,
     )
@@ -0,0 +1,71 @@
+"""Per-user authentication context cached across requests.
+
+Resolving a bearer token's user and then their league or referee profile took two or
+three queries on every authenticated request. The user is now loaded together with both
+profiles in one joined query and kept here, detached from any session, for
+AUTH_CONTEXT_TTL_SECONDS; later requests get a copy merged into their own session
+without touching the database. Anything that changes a user's role or profile must call
+`invalidate_auth_context` so other requests stop seeing the old rows.
+"""
+
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.models.user import User
+
+AUTH_CONTEXT_MAXSIZE = 10_000
+
+_cache = TTLCache(maxsize=AUTH_CONTEXT_MAXSIZE)
+_lock = threading.Lock()
+# Bumped by every invalidation so a load that raced with one is not cached.
+_generation = 0
+
+
+def load_user(db: Session, user_id: int) -> Optional[User]:
+    """The user, with `referee_profile` and `league_profile` loaded, attached to `db`."""
+    ttl = get_settings().AUTH_CONTEXT_TTL_SECONDS
+    cached = _cache.get(user_id) if ttl > 0 else None
+    if cached is not None:
+        return db.merge(cached, load=False)
+
+    generation = _generation
+    user = (
+        db.query(User)
+        .options(joinedload(User.referee_profile), joinedload(User.league_profile))
+        .filter(User.id == user_id)
+        .first()
+    )
+    if user is None or ttl <= 0:
+        return user
+
+    # Cache the freshly loaded rows themselves and give the request its own copy, so
+    # nothing the request changes or expires on commit reaches the cached objects.
+    for obj in (user, user.referee_profile, user.league_profile):
+        if obj is not None:
+            db.expunge(obj)
+    with _lock:
+        if generation == _generation:
+            _cache.set(user_id, user, ttl)
+    return db.merge(user, load=False)
+
+
+def invalidate_auth_context(user_id: int) -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.delete(user_id)
+
+
+def clear_auth_context() -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
+
+
+def auth_context_stats() -> Dict[str, int]:
+    return _cache.stats()
@@ -0,0 +1,164 @@
+"""Compact in-process BM25 inverted index."""
+
+import math
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+K1 = 1.2
+B = 0.75
+
+
+class BM25Index:
+    """BM25 over pre-tokenized documents keyed by integer id.
+
+    Postings are parallel typed arrays (document slot, term frequency) per term.
+    Replacing or removing a document tombstones its slot; postings are rebuilt from the
+    stored per-slot term counts once a quarter of the slots are dead, so updates stay
+    cheap and the arrays stay dense.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vocab: Dict[str, int] = {}
+        self._df = array("I")
+        self._post_slots: List[array] = []
+        self._post_tfs: List[array] = []
+        self._slot_doc = array("q")
+        self._slot_len = array("I")
+        self._slot_terms: List[Optional[array]] = []
+        self._slot_tfs: List[array] = []
+        self._doc_slot: Dict[int, int] = {}
+        self._total_len = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_slot)
+
+    def rebuild(self, docs: Iterable[tuple]) -> None:
+        """Replace the contents with (doc_id, tokens) pairs."""
+        with self._lock:
+            self._reset()
+            for doc_id, tokens in docs:
+                self._add(doc_id, tokens)
+
+    def upsert(self, doc_id: int, tokens: List[str]) -> None:
+        with self._lock:
+            self._remove(doc_id)
+            self._add(doc_id, tokens)
+            self._maybe_compact()
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove(doc_id)
+            self._maybe_compact()
+
+    def _add(self, doc_id: int, tokens: List[str]) -> None:
+        counts: Dict[int, int] = {}
+        for token in tokens:
+            term = self._vocab.get(token)
+            if term is None:
+                term = self._vocab[token] = len(self._df)
+                self._df.append(0)
+                self._post_slots.append(array("I"))
+                self._post_tfs.append(array("H"))
+            counts[term] = counts.get(term, 0) + 1
+        for term in counts:
+            self._df[term] += 1
+        self._insert(doc_id, counts, len(tokens))
+
+    def _insert(self, doc_id: int, counts: Dict[int, int], length: int) -> None:
+        slot = len(self._slot_doc)
+        self._slot_doc.append(doc_id)
+        self._slot_len.append(length)
+        self._slot_terms.append(array("I", counts))
+        self._slot_tfs.append(array("H", (min(tf, 65535) for tf in counts.values())))
+        for term, tf in counts.items():
+            self._post_slots[term].append(slot)
+            self._post_tfs[term].append(min(tf, 65535))
+        self._doc_slot[doc_id] = slot
+        self._total_len += length
+
+    def _remove(self, doc_id: int) -> None:
+        slot = self._doc_slot.pop(doc_id, None)
+        if slot is None:
+            return
+        for term in self._slot_terms[slot]:
+            self._df[term] -= 1
+        self._slot_terms[slot] = None
+        self._total_len -= self._slot_len[slot]
+        self._dead += 1
+
+    def _maybe_compact(self) -> None:
+        """Drop dead slots by re-inserting live documents; vocabulary and df are kept."""
+        if self._dead * 4 < len(self._slot_doc):
+            return
+        live = [
+            (self._slot_doc[slot], dict(zip(terms, self._slot_tfs[slot])), self._slot_len[slot])
+            for slot, terms in enumerate(self._slot_terms)
+            if terms is not None
+        ]
+        self._post_slots = [array("I") for _ in self._df]
+        self._post_tfs = [array("H") for _ in self._df]
+        self._slot_doc = array("q")
+        self._slot_len = array("I")
+        self._slot_terms = []
+        self._slot_tfs = []
+        self._doc_slot = {}
+        self._total_len = 0
+        self._dead = 0
+        for doc_id, counts, length in live:
+            self._insert(doc_id, counts, length)
+
+    def search(
+        self, tokens: Iterable[str], doc_ids: Optional[Iterable[int]] = None
+    ) -> Dict[int, float]:
+        """BM25 score per matching document, optionally restricted to `doc_ids`."""
+        with self._lock:
+            n = len(self._doc_slot)
+            if not n:
+                return {}
+            allowed = None
+            if doc_ids is not None:
+                allowed = {self._doc_slot[d] for d in doc_ids if d in self._doc_slot}
+            base = K1 * (1 - B)
+            per_len = K1 * B / (self._total_len / n or 1.0)
+            slot_len, slot_terms = self._slot_len, self._slot_terms
+            scores: Dict[int, float] = {}
+            for token in set(tokens):
+                term = self._vocab.get(token)
+                if term is None or not self._df[term]:
+                    continue
+                df = self._df[term]
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                slots, tfs = self._post_slots[term], self._post_tfs[term]
+                if allowed is None:
+                    pairs = zip(slots, tfs)
+                elif len(allowed) * 8 < len(slots):
+                    # Few candidates against a long posting list: binary-search each one
+                    # (slots are appended in increasing order).
+                    pairs = []
+                    for slot in allowed:
+                        i = bisect_left(slots, slot)
+                        if i < len(slots) and slots[i] == slot:
+                            pairs.append((slot, tfs[i]))
+                else:
+                    pairs = ((s, tf) for s, tf in zip(slots, tfs) if s in allowed)
+                for slot, tf in pairs:
+                    if slot_terms[slot] is None:
+                        continue
+                    norm = base + per_len * slot_len[slot]
+                    scores[slot] = scores.get(slot, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+            return {self._slot_doc[slot]: score for slot, score in scores.items()}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "documents": len(self._doc_slot),
+            "terms": len(self._vocab),
+            "postings": sum(len(p) for p in self._post_slots),
+            "dead_slots": self._dead,
+        }
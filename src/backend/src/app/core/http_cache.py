@@ -0,0 +1,145 @@
+"""HTTP caching: ETags for read-mostly endpoints, long-lived caching of content-addressed
+uploads, and response compression.
+
+Routes tag what they return with `make_etag` over the rows' ids and updated_at stamps and
+call `not_modified` before serializing, so a poll for something unchanged costs the stamp
+lookup and an empty 304. `HTTPCacheMiddleware` does the rest on the way out.
+"""
+
+import gzip
+import hashlib
+import re
+from typing import Any, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli (the "brotli" extra)
+    brotli = None
+
+# Uploads named by their SHA-256 (see app.services.image_storage) never change.
+CONTENT_ADDRESSED_UPLOAD = re.compile(r"^/uploads/[0-9a-f]{64}\.[a-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Tagged API responses depend on the caller, and must be revalidated before reuse.
+REVALIDATE = "private, no-cache"
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+# Compressed responses get the encoding appended to their ETag, keeping it strong per
+# representation; `not_modified` strips it again when comparing.
+ENCODING_SUFFIXES = {"br": "-br", "gzip": "-gzip"}
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over `parts`, e.g. ids, updated_at stamps and the query parameters."""
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def _matching_tag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """The client's tag that matches `etag`, in the form the client sent it."""
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # If-None-Match uses the weak comparison.
+        opaque = candidate[2:] if candidate.startswith("W/") else candidate
+        for suffix in ENCODING_SUFFIXES.values():
+            if opaque.endswith(suffix + '"'):
+                opaque = opaque[: -len(suffix) - 1] + '"'
+                break
+        if opaque == etag:
+            return candidate
+    return None
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Tag `response` with `etag`; returns a 304 to send instead if the client has it."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE
+    matched = _matching_tag(request.headers.get("if-none-match"), etag)
+    if matched is None:
+        return None
+    return Response(status_code=304, headers={"ETag": matched, "Cache-Control": REVALIDATE})
+
+
+def _negotiate(accept_encoding: str) -> Optional[str]:
+    offered = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        offered.add(name.strip())
+    if brotli is not None and "br" in offered:
+        return "br"
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        # Quality 5 keeps most of brotli's size win at a fraction of its CPU at 11.
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class HTTPCacheMiddleware:
+    """Immutable Cache-Control for content-addressed uploads; brotli or gzip compression
+    of complete compressible 200 responses of at least `minimum_size` bytes.
+
+    Streamed responses (e.g. server-sent events) pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        immutable = bool(CONTENT_ADDRESSED_UPLOAD.match(scope["path"]))
+        encoding = None
+        if scope["method"] != "HEAD":
+            encoding = _negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        held: Optional[Message] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal held
+            if message["type"] == "http.response.start":
+                if immutable and message["status"] in (200, 304):
+                    MutableHeaders(scope=message)["Cache-Control"] = IMMUTABLE
+                if encoding is None or message["status"] != 200:
+                    await send(message)
+                else:
+                    # Decide once the first body chunk shows whether the body is complete.
+                    held = message
+                return
+            if held is not None and message["type"] == "http.response.body":
+                start, held = held, None
+                message = self._maybe_compress(start, message, encoding)
+                await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _maybe_compress(self, start: Message, message: Message, encoding: str) -> Message:
+        headers = MutableHeaders(scope=start)
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(COMPRESSIBLE_TYPES) or "content-encoding" in headers:
+            return message
+        headers.add_vary_header("Accept-Encoding")
+        body = message.get("body", b"")
+        if message.get("more_body", False) or len(body) < self.minimum_size:
+            return message
+        body = _compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(body))
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = etag[:-1] + ENCODING_SUFFIXES[encoding] + '"'
+        return {**message, "body": body}
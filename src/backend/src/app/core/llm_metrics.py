@@ -0,0 +1,142 @@
+"""In-process metrics and structured logs for LLM calls."""
+
+import json
+import logging
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger("app.llm")
+
+# Samples kept per rollup for latency percentiles.
+LATENCY_WINDOW = 1000
+
+# Cached prompt tokens are billed at this fraction of the prompt price.
+CACHED_PROMPT_PRICE_FACTOR = 0.5
+
+# USD per million (prompt, completion) tokens.
+MODEL_PRICES_USD_PER_MTOKEN: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+
+@dataclass
+class LLMCallRecord:
+    feature: str
+    model: str
+    league_id: Optional[int] = None
+    prompt_tokens: int = 0
+    # Prompt tokens served from the provider's prompt-prefix cache.
+    cached_prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    first_token_ms: Optional[float] = None
+    retries: int = 0
+    hedged: bool = False
+    error: Optional[str] = None
+    streamed: bool = False
+
+    @property
+    def cost_usd(self) -> float:
+        prompt_price, completion_price = MODEL_PRICES_USD_PER_MTOKEN.get(self.model, (0.0, 0.0))
+        cached = self.cached_prompt_tokens * CACHED_PROMPT_PRICE_FACTOR
+        prompt_cost = (self.prompt_tokens - self.cached_prompt_tokens + cached) * prompt_price
+        return (prompt_cost + self.completion_tokens * completion_price) / 1e6
+
+
+def _percentile(ordered: list, pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 1)
+
+
+class _Rollup:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.hedged = 0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def add(self, record: LLMCallRecord) -> None:
+        self.calls += 1
+        self.errors += record.error is not None
+        self.retries += record.retries
+        self.hedged += record.hedged
+        self.prompt_tokens += record.prompt_tokens
+        self.cached_prompt_tokens += record.cached_prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cost_usd += record.cost_usd
+        self.latencies.append(record.latency_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
+            "prompt_cache_hit_rate": (
+                round(self.cached_prompt_tokens / self.prompt_tokens, 4)
+                if self.prompt_tokens
+                else None
+            ),
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_ms": {
+                "p50": _percentile(ordered, 50),
+                "p95": _percentile(ordered, 95),
+                "p99": _percentile(ordered, 99),
+                "max": round(ordered[-1], 1) if ordered else None,
+            },
+        }
+
+
+class LLMMetrics:
+    """Rollups of LLM calls by (feature, model) and by league/feature."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_feature: Dict[Tuple[str, str], _Rollup] = {}
+        self._by_league: Dict[Optional[int], Dict[str, _Rollup]] = {}
+
+    def record(self, record: LLMCallRecord) -> None:
+        with self._lock:
+            self._by_feature.setdefault((record.feature, record.model), _Rollup()).add(record)
+            league = self._by_league.setdefault(record.league_id, {})
+            league.setdefault(record.feature, _Rollup()).add(record)
+        fields = asdict(record)
+        fields["latency_ms"] = round(record.latency_ms, 1)
+        if record.first_token_ms is not None:
+            fields["first_token_ms"] = round(record.first_token_ms, 1)
+        fields["cost_usd"] = round(record.cost_usd, 6)
+        logger.info(json.dumps({"event": "llm_call", **fields}))
+
+    def features(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                f"{feature}:{model}": rollup.snapshot()
+                for (feature, model), rollup in self._by_feature.items()
+            }
+
+    def league(self, league_id: Optional[int]) -> Dict[str, Any]:
+        with self._lock:
+            rollups = self._by_league.get(league_id, {})
+            return {feature: rollup.snapshot() for feature, rollup in rollups.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._by_feature.clear()
+            self._by_league.clear()
+
+
+llm_metrics = LLMMetrics()
@@ -0,0 +1,117 @@
+"""Dedicated, bounded worker pool for password hashing and verification.
+
+A pbkdf2 hash costs ~15 ms of CPU. Computed on the request thread, a burst of logins or
+registrations took every worker of the threadpool all sync routes share. Hashing now
+runs on PASSWORD_HASH_WORKERS threads of its own (hashlib releases the GIL while it
+works, so they run in parallel), with at most PASSWORD_HASH_MAX_PENDING calls queued or
+running; past that, callers get `PasswordPoolBusy` immediately instead of waiting.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from app.config import get_settings
+from app.core.security import get_password_hash, verify_and_update_password
+
+T = TypeVar("T")
+
+# Samples kept for the wait/run time percentiles.
+TIMING_WINDOW = 1000
+
+
+class PasswordPoolBusy(Exception):
+    """More hashing work is pending than the pool accepts."""
+
+
+def _percentile(ordered: list, pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 1)
+
+
+class PasswordHashPool:
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self._wait_ms: Deque[float] = deque(maxlen=TIMING_WINDOW)
+        self._run_ms: Deque[float] = deque(maxlen=TIMING_WINDOW)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            self._pending += 1
+            self.submitted += 1
+        queued_at = time.perf_counter()
+
+        def task() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self._wait_ms.append((started - queued_at) * 1000)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self.completed += 1
+                    self._run_ms.append((time.perf_counter() - started) * 1000)
+
+        future = self._executor.submit(task)
+        # Released when the work finishes or is cancelled, not when the caller stops waiting.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def record_rehash(self) -> None:
+        with self._lock:
+            self.rehashed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits, runs = sorted(self._wait_ms), sorted(self._run_ms)
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": self._running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "wait_ms": {"p50": _percentile(waits, 50), "p95": _percentile(waits, 95)},
+                "run_ms": {"p50": _percentile(runs, 50), "p95": _percentile(runs, 95)},
+            }
+
+
+@lru_cache
+def get_password_pool() -> PasswordHashPool:
+    settings = get_settings()
+    return PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
+async def hash_password(password: str) -> str:
+    return await get_password_pool().run(get_password_hash, password)
+
+
+async def verify_password_in_pool(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """Whether the password matches, plus a replacement hash if the stored one is outdated."""
+    return await get_password_pool().run(verify_and_update_password, password, hashed)
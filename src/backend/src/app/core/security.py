@@ -1,24 +1,43 @@
 """Security helpers for password hashing and JWT."""
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config import get_settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+_rounds = get_settings().PASSWORD_HASH_ROUNDS
+# Hashes below the configured rounds (or in a deprecated scheme) need an update, which
+# `verify_and_update_password` hands back so logins can store it.
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=_rounds,
+    pbkdf2_sha256__min_rounds=_rounds,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords; the unit of work sent to bulk-import worker processes."""
+    return [pwd_context.hash(password) for password in passwords]
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     settings = get_settings()
     to_encode = data.copy()
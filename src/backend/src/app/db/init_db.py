@@ -2,7 +2,20 @@
 
 from app.db.base import Base
 from app.db.session import engine
-from app.models import assignment, availability, field_location, game, league, note, rating, referee, user
+from app.models import (
+    assignment,
+    availability,
+    chat_memory,
+    field_location,
+    game,
+    game_recommendation,
+    league,
+    note,
+    parsed_query,
+    rating,
+    referee,
+    user,
+)
 
 
 def init_db() -> None:
@@ -0,0 +1,275 @@
+"""OpenAI-compatible stand-in for load and regression testing.
+
+Implements `POST /v1/chat/completions` with deterministic answers, tool calls, SSE
+streaming, prompt-prefix cache accounting, and configurable latency and error injection.
+Run it as a server:
+
+    FAKE_OPENAI_LATENCY_MS=400 uvicorn app.integrations.fake_openai:app --port 8100
+
+and start the API with `OPENAI_BASE_URL=http://127.0.0.1:8100/v1`, or set
+`OPENAI_USE_FAKE=true` to route the shared client to this app in-process (no network;
+httpx buffers ASGI responses, so streamed chunks arrive together in that mode).
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from app.services.constraint_rules import parse_with_rules
+
+FAKE_SCHEDULE_ROW = {
+    "scheduled_start": "2026-06-06T10:00:00",
+    "field_name": "Fake Park",
+    "address": "1 Test Way",
+    "location_name": "Fake Park",
+    "field_number": "1",
+    "age_group": "U12",
+    "competition_level": "travel",
+    "center_fee": 40,
+    "ar_fee": 25,
+    "status": "open",
+}
+
+# Keyword -> tool for "auto" tool choice, checked in order against the last user message.
+TOOL_KEYWORDS = [
+    ("assignment", "get_my_assignments"),
+    ("available", "get_available_games"),
+    ("create", "create_game"),
+    ("referee", "find_referees"),
+    ("ref ", "find_referees"),
+    ("game", "search_games"),
+]
+
+
+class FakeOpenAISettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="FAKE_OPENAI_")
+
+    LATENCY_MS: float = 300.0
+    JITTER_MS: float = 100.0
+    TOKEN_DELAY_MS: float = 15.0
+    ERROR_RATE: float = 0.0
+    ERROR_STATUS: int = 500
+    SEED: Optional[int] = None
+    # Prompt-prefix caching as the real API does it: prompts of at least CACHE_MIN_TOKENS
+    # reuse the longest previously seen prefix, in CACHE_BLOCK_TOKENS increments.
+    CACHE_MIN_TOKENS: int = 1024
+    CACHE_BLOCK_TOKENS: int = 128
+
+
+settings = FakeOpenAISettings()
+_rng = random.Random(settings.SEED)
+
+app = FastAPI(title="Fake OpenAI")
+
+_prefix_cache: "OrderedDict[str, None]" = OrderedDict()
+PREFIX_CACHE_SIZE = 100_000
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _last(messages: List[Dict[str, Any]], role: str) -> str:
+    for message in reversed(messages):
+        if message.get("role") == role:
+            return message.get("content") or ""
+    return ""
+
+
+def _cached_tokens(body: Dict[str, Any]) -> int:
+    """Tokens of the prompt prefix already seen in an earlier request (tools come first)."""
+    prompt = json.dumps(body.get("tools") or []) + "".join(
+        json.dumps(m) for m in body.get("messages") or []
+    )
+    if _tokens(prompt) < settings.CACHE_MIN_TOKENS:
+        return 0
+    block = settings.CACHE_BLOCK_TOKENS * 4
+    digest = hashlib.sha256()
+    cached, still_hitting = 0, True
+    for end in range(block, len(prompt) + 1, block):
+        digest.update(prompt[end - block : end].encode())
+        key = digest.copy().hexdigest()
+        if still_hitting and key in _prefix_cache:
+            cached = _tokens(prompt[:end])
+            _prefix_cache.move_to_end(key)
+        else:
+            still_hitting = False
+            _prefix_cache[key] = None
+    while len(_prefix_cache) > PREFIX_CACHE_SIZE:
+        _prefix_cache.popitem(last=False)
+    return cached if cached >= settings.CACHE_MIN_TOKENS else 0
+
+
+def _fill_arguments(tool: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """Plausible arguments: the user text for required strings, 1 for required numbers."""
+    params = tool.get("function", {}).get("parameters", {})
+    properties = params.get("properties", {})
+    args: Dict[str, Any] = {}
+    for name in params.get("required", []):
+        kind = properties.get(name, {}).get("type")
+        args[name] = 1 if kind in ("integer", "number") else text
+    return args
+
+
+def _choose_tool(body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    tools = body.get("tools") or []
+    choice = body.get("tool_choice")
+    messages = body.get("messages") or []
+    if not tools or choice == "none":
+        return None
+    by_name = {tool["function"]["name"]: tool for tool in tools}
+
+    if isinstance(choice, dict):
+        name = choice["function"]["name"]
+        text = _last(messages, "user")
+        if name == "ref_constraints":
+            return {"name": name, "arguments": parse_with_rules(text).constraints}
+        return {"name": name, "arguments": _fill_arguments(by_name[name], text)}
+
+    # "auto": answer in text once tool results are in, otherwise pick a tool by keyword.
+    if messages and messages[-1].get("role") == "tool":
+        return None
+    text = _last(messages, "user")
+    lowered = text.lower()
+    for keyword, name in TOOL_KEYWORDS:
+        if keyword in lowered and name in by_name:
+            return {"name": name, "arguments": _fill_arguments(by_name[name], text)}
+    return None
+
+
+def _answer(body: Dict[str, Any]) -> str:
+    messages = body.get("messages") or []
+    system = _last(messages, "system")
+    if "JSON array" in system:
+        return json.dumps([FAKE_SCHEDULE_ROW])
+    if messages and messages[-1].get("role") == "tool":
+        return "Here is what I found: " + messages[-1].get("content", "")[:200]
+    return "Fake reply to: " + _last(messages, "user")[:200]
+
+
+def _chunk(completion_id: str, model: str, delta: Dict[str, Any], finish: Optional[str] = None):
+    return {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+    }
+
+
+async def _stream(
+    body: Dict[str, Any], tool_call: Optional[Dict[str, Any]], content: str, usage: Dict[str, int]
+) -> AsyncIterator[str]:
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    model = body.get("model", "gpt-4o-mini")
+    delay = settings.TOKEN_DELAY_MS / 1000
+    chunks: List[Dict[str, Any]] = [_chunk(completion_id, model, {"role": "assistant"})]
+    if tool_call:
+        arguments = json.dumps(tool_call["arguments"])
+        call_id = f"call_{uuid.uuid4().hex[:12]}"
+        chunks.append(
+            _chunk(
+                completion_id,
+                model,
+                {
+                    "tool_calls": [
+                        {
+                            "index": 0,
+                            "id": call_id,
+                            "type": "function",
+                            "function": {"name": tool_call["name"], "arguments": ""},
+                        }
+                    ]
+                },
+            )
+        )
+        # Arguments arrive in fragments, as they do from the real API.
+        for start in range(0, len(arguments), 16):
+            fragment = arguments[start : start + 16]
+            chunks.append(
+                _chunk(
+                    completion_id,
+                    model,
+                    {"tool_calls": [{"index": 0, "function": {"arguments": fragment}}]},
+                )
+            )
+        chunks.append(_chunk(completion_id, model, {}, "tool_calls"))
+    else:
+        for word in content.split(" "):
+            chunks.append(_chunk(completion_id, model, {"content": word + " "}))
+        chunks.append(_chunk(completion_id, model, {}, "stop"))
+
+    for chunk in chunks:
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(delay)
+    if (body.get("stream_options") or {}).get("include_usage"):
+        final = {**_chunk(completion_id, model, {}), "choices": [], "usage": usage}
+        yield f"data: {json.dumps(final)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    latency = settings.LATENCY_MS + _rng.uniform(0, settings.JITTER_MS)
+    await asyncio.sleep(latency / 1000)
+
+    if _rng.random() < settings.ERROR_RATE:
+        return JSONResponse(
+            status_code=settings.ERROR_STATUS,
+            content={"error": {"message": "Injected failure", "type": "fake_error"}},
+        )
+
+    tool_call = _choose_tool(body)
+    content = "" if tool_call else _answer(body)
+    prompt_tokens = _tokens(json.dumps(body.get("tools") or [])) + sum(
+        _tokens(json.dumps(m)) for m in body.get("messages") or []
+    )
+    completion_tokens = _tokens(json.dumps(tool_call) if tool_call else content)
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": _cached_tokens(body)},
+    }
+
+    if body.get("stream"):
+        return StreamingResponse(
+            _stream(body, tool_call, content, usage), media_type="text/event-stream"
+        )
+
+    message: Dict[str, Any] = {"role": "assistant", "content": content or None}
+    if tool_call:
+        message["tool_calls"] = [
+            {
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {
+                    "name": tool_call["name"],
+                    "arguments": json.dumps(tool_call["arguments"]),
+                },
+            }
+        ]
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o-mini"),
+        "choices": [
+            {
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if tool_call else "stop",
+            }
+        ],
+        "usage": usage,
+    }
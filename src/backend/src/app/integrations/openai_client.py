@@ -1,22 +1,285 @@
 """OpenAI client helpers for parsing referee requests."""
 
-from typing import Any, Dict
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
 
-from openai import OpenAI
+import anyio.from_thread
+import httpx
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI
 
 from app.config import get_settings
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.llm_metrics import LLMCallRecord, llm_metrics
+from app.core.singleflight import AsyncSingleFlight
 
+T = TypeVar("T")
 
-def _client() -> OpenAI:
+# One pooled client per event loop (in the server that is exactly one per process);
+# httpx connections cannot be shared across loops.
+_async_clients: Dict[int, AsyncOpenAI] = {}
+_breaker: Optional[CircuitBreaker] = None
+completion_flight = AsyncSingleFlight()
+
+
+class LLMUnavailableError(RuntimeError):
+    """The LLM did not answer: circuit open, feature deadline passed or upstream failing."""
+
+
+def get_breaker() -> CircuitBreaker:
+    """Process-wide breaker for the OpenAI dependency."""
+    global _breaker
+    if _breaker is None:
+        settings = get_settings()
+        _breaker = CircuitBreaker(
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+        )
+    return _breaker
+
+
+def feature_deadline(feature: str) -> float:
+    settings = get_settings()
+    return settings.LLM_FEATURE_DEADLINES_SECONDS.get(feature, settings.OPENAI_TIMEOUT_SECONDS)
+
+
+def get_async_client() -> AsyncOpenAI:
+    """Process-wide AsyncOpenAI client with tuned connection pooling, timeouts and retries."""
+    loop_id = id(asyncio.get_running_loop())
+    client = _async_clients.get(loop_id)
+    if client is None:
+        settings = get_settings()
+        base_url = settings.OPENAI_BASE_URL or None
+        # Local stand-ins accept any key, but the SDK insists on one.
+        api_key = settings.OPENAI_API_KEY or ("unused" if base_url else None)
+        transport = None
+        if settings.OPENAI_USE_FAKE:
+            # Imported lazily: the stand-in is a test tool, not needed in production.
+            from app.integrations.fake_openai import app as fake_app
+
+            transport = httpx.ASGITransport(app=fake_app)
+            base_url = "http://fake-openai/v1"
+            api_key = api_key or "unused"
+        http_client = httpx.AsyncClient(
+            transport=transport,
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(
+                settings.OPENAI_TIMEOUT_SECONDS, connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS
+            ),
+        )
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            http_client=http_client,
+        )
+        _async_clients[loop_id] = client
+    return client
+
+
+async def close_async_client() -> None:
+    client = _async_clients.pop(id(asyncio.get_running_loop()), None)
+    if client is not None:
+        await client.close()
+
+
+def _retries_for_error(client: AsyncOpenAI, exc: BaseException) -> int:
+    """The SDK retries connection errors, 408/409/429 and 5xx before giving up."""
+    return client.max_retries if _is_dependency_failure(exc) else 0
+
+
+def _is_dependency_failure(exc: BaseException) -> bool:
+    """Failures that say the upstream is unhealthy, as opposed to a bad request."""
+    if isinstance(exc, (APIConnectionError, asyncio.TimeoutError)):
+        return True
+    return isinstance(exc, APIStatusError) and (
+        exc.status_code in (408, 409, 429) or exc.status_code >= 500
+    )
+
+
+async def _hedged(call: Callable[[], Awaitable[T]], hedge_after: float) -> Tuple[T, bool]:
+    """Run `call`; if it has not finished after `hedge_after` seconds, race a second copy.
+
+    Returns the first successful result and whether the hedge was launched.
+    """
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if done:
+            return tasks[0].result(), False
+        tasks.append(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), True
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _request_key(feature: str, kwargs: Dict[str, Any]) -> str:
+    payload = json.dumps(kwargs, sort_keys=True, default=str)
+    return f"{feature}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+async def create_chat_completion(
+    feature: str, league_id: Optional[int] = None, **kwargs: Any
+) -> Any:
+    """`chat.completions.create` on the shared client, guarded and recorded in `llm_metrics`.
+
+    `feature` names the calling code path: it selects the deadline (SDK retries included)
+    from LLM_FEATURE_DEADLINES_SECONDS, whether tail requests are hedged, and feeds the
+    metrics; `league_id` feeds the per-league rollups. Upstream failures, timeouts and an
+    open circuit raise LLMUnavailableError so callers can degrade instead of hanging.
+
+    Identical concurrent non-streaming requests share one upstream call (the result object
+    is shared, so callers must not mutate it). Streaming calls return an iterator that
+    records the call when the stream ends; usage is requested from the API so tokens are
+    counted there too.
+    """
+    if kwargs.get("stream"):
+        return await _guarded_completion(feature, league_id, kwargs)
+    return await completion_flight.do(
+        _request_key(feature, kwargs), lambda: _guarded_completion(feature, league_id, kwargs)
+    )
+
+
+async def _guarded_completion(
+    feature: str, league_id: Optional[int], kwargs: Dict[str, Any]
+) -> Any:
     settings = get_settings()
-    return OpenAI(api_key=settings.OPENAI_API_KEY or None)
+    breaker = get_breaker()
+    if not breaker.allow():
+        raise LLMUnavailableError(f"{feature}: circuit open")
+
+    client = get_async_client()
+    record = LLMCallRecord(
+        feature=feature,
+        model=kwargs.get("model", ""),
+        league_id=league_id,
+        streamed=bool(kwargs.get("stream")),
+    )
+    if record.streamed:
+        kwargs.setdefault("stream_options", {"include_usage": True})
+    deadline = feature_deadline(feature)
+    kwargs.setdefault("timeout", deadline)
+    hedge_after = 0.0
+    if not record.streamed and feature in settings.LLM_HEDGED_FEATURES:
+        hedge_after = settings.LLM_HEDGE_AFTER_MS / 1000
+
+    async def attempt() -> Tuple[Any, Any]:
+        raw = await client.chat.completions.with_raw_response.create(**kwargs)
+        return raw, raw.parse()
+
+    start = time.perf_counter()
+    try:
+        if hedge_after > 0:
+            (raw, result), record.hedged = await asyncio.wait_for(
+                _hedged(attempt, hedge_after), deadline
+            )
+        else:
+            raw, result = await asyncio.wait_for(attempt(), deadline)
+    except asyncio.CancelledError:
+        record.latency_ms = (time.perf_counter() - start) * 1000
+        record.error = "CancelledError"
+        llm_metrics.record(record)
+        breaker.release()
+        raise
+    except Exception as exc:
+        record.latency_ms = (time.perf_counter() - start) * 1000
+        record.retries = _retries_for_error(client, exc)
+        record.error = type(exc).__name__
+        llm_metrics.record(record)
+        if _is_dependency_failure(exc):
+            breaker.record_failure()
+            raise LLMUnavailableError(f"{feature}: {type(exc).__name__}") from exc
+        breaker.release()
+        raise
+    breaker.record_success()
+    record.retries = raw.retries_taken
+
+    if record.streamed:
+        return _tracked_stream(result, record, start)
+
+    record.latency_ms = (time.perf_counter() - start) * 1000
+    _record_usage(record, result.usage)
+    llm_metrics.record(record)
+    return result
+
+
+def _record_usage(record: LLMCallRecord, usage: Any) -> None:
+    if usage is None:
+        return
+    record.prompt_tokens = usage.prompt_tokens
+    record.completion_tokens = usage.completion_tokens
+    details = getattr(usage, "prompt_tokens_details", None)
+    record.cached_prompt_tokens = (getattr(details, "cached_tokens", None) or 0) if details else 0
+
+
+async def _tracked_stream(stream: Any, record: LLMCallRecord, start: float) -> AsyncIterator[Any]:
+    try:
+        async for chunk in stream:
+            if record.first_token_ms is None and chunk.choices:
+                record.first_token_ms = (time.perf_counter() - start) * 1000
+            _record_usage(record, getattr(chunk, "usage", None))
+            yield chunk
+    except BaseException as exc:
+        record.error = type(exc).__name__
+        raise
+    finally:
+        record.latency_ms = (time.perf_counter() - start) * 1000
+        llm_metrics.record(record)
+
+
+def run_sync(async_fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+    """Run an async LLM call from synchronous code.
+
+    Sync routes execute in AnyIO worker threads, so the call is handed back to the app's
+    event loop and reuses its pooled client. Outside the server (scripts, CLI) a private
+    loop is used instead.
+    """
+    started = False
+
+    async def _call() -> T:
+        nonlocal started
+        started = True
+        return await async_fn(*args)
+
+    try:
+        return anyio.from_thread.run(_call)
+    except RuntimeError:
+        if started:
+            raise
+
+    async def _standalone() -> T:
+        try:
+            return await async_fn(*args)
+        finally:
+            await close_async_client()
+
+    return asyncio.run(_standalone())
 
 
 def parse_ref_request(user_query: str, league_id: int) -> Dict[str, Any]:
+    return run_sync(aparse_ref_request, user_query, league_id)
+
+
+async def aparse_ref_request(user_query: str, league_id: int) -> Dict[str, Any]:
     if not user_query:
         return {}
 
-    client = _client()
     system_prompt = (
         "You are an assistant that extracts structured referee assignment constraints. "
         "Return function call arguments only."
@@ -48,7 +311,9 @@ def parse_ref_request(user_query: str, league_id: int) -> Dict[str, Any]:
         },
     }
 
-    response = client.chat.completions.create(
+    response = await create_chat_completion(
+        "parse_ref_request",
+        league_id,
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": system_prompt},
@@ -63,8 +328,6 @@ def parse_ref_request(user_query: str, league_id: int) -> Dict[str, Any]:
         return {}
     arguments = tool_calls[0].function.arguments
     if isinstance(arguments, str):
-        import json
-
         try:
             return json.loads(arguments)
         except json.JSONDecodeError:
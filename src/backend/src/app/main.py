@@ -1,19 +1,49 @@
 """FastAPI application entrypoint."""
 
-from pathlib import Path
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.api import routes_ai, routes_auth, routes_games, routes_leagues, routes_refs, routes_messages
+from app.config import get_settings
+from app.core.http_cache import HTTPCacheMiddleware
+from app.db.session import SessionLocal
+from app.integrations.openai_client import close_async_client
+from app.services.image_storage import UPLOADS_DIR, image_gc_worker
+from app.services.recommendation_service import recommendation_worker
+from app.services.referee_text_index import build_referee_index
+
+
+def _build_search_indexes() -> None:
+    db = SessionLocal()
+    try:
+        build_referee_index(db)
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(_build_search_indexes)
+    workers = [asyncio.create_task(image_gc_worker())]
+    if get_settings().RECOMMENDER_ENABLED:
+        workers.append(asyncio.create_task(recommendation_worker()))
+    yield
+    for worker in workers:
+        worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await worker
+    await close_async_client()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="RefNexus API")
+    app = FastAPI(title="RefNexus API", lifespan=lifespan)
 
-    uploads_dir = Path(__file__).resolve().parent.parent / "uploads"
-    uploads_dir.mkdir(parents=True, exist_ok=True)
+    UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
     app.add_middleware(
         CORSMiddleware,
@@ -21,6 +51,10 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag"],
+    )
+    app.add_middleware(
+        HTTPCacheMiddleware, minimum_size=get_settings().HTTP_COMPRESSION_MIN_BYTES
     )
 
     app.include_router(routes_auth.router, prefix="/auth", tags=["auth"])
@@ -30,7 +64,7 @@ def create_app() -> FastAPI:
     app.include_router(routes_ai.router, prefix="/ai", tags=["ai"])
     app.include_router(routes_messages.router, prefix="/messages", tags=["messages"])
 
-    app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
+    app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
 
     return app
 
@@ -2,11 +2,14 @@
 
 from app.models.assignment import Assignment
 from app.models.availability import AvailabilitySlot
+from app.models.chat_memory import ChatMemory
 from app.models.field_location import FieldLocation
 from app.models.game import Game
+from app.models.game_recommendation import GameRecommendation
 from app.models.league import League
 from app.models.message import Message
 from app.models.note import RefNote
+from app.models.parsed_query import ParsedQuery
 from app.models.rating import Rating
 from app.models.referee import RefereeProfile
 from app.models.user import User
@@ -22,4 +25,7 @@ __all__ = [
     "RefNote",
     "AvailabilitySlot",
     "Message",
+    "ParsedQuery",
+    "ChatMemory",
+    "GameRecommendation",
 ]
@@ -1,6 +1,6 @@
 """Game ORM model."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
 
 from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
@@ -23,6 +23,11 @@ class Game(Base):
     status: Mapped[str] = mapped_column(String(50), default="open")
     center_fee: Mapped[Optional[float]] = mapped_column(Float)
     ar_fee: Mapped[Optional[float]] = mapped_column(Float)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
 
     league = relationship("League", back_populates="games")
     field_location = relationship("FieldLocation", back_populates="games")
@@ -0,0 +1,21 @@
+"""Precomputed referee recommendations per game."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class GameRecommendation(Base):
+    __tablename__ = "game_recommendations"
+
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), primary_key=True)
+    # Best first: [{"referee_id", "cost", "full_name", "cert_level", "average_rating"}, ...]
+    entries: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
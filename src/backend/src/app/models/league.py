@@ -1,8 +1,9 @@
 """League ORM model."""
 
+from datetime import datetime, timezone
 from typing import List, Optional
 
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -16,6 +17,11 @@ class League(Base):
     name: Mapped[Optional[str]] = mapped_column(String(255))
     primary_region: Mapped[Optional[str]] = mapped_column(String(255))
     level: Mapped[Optional[str]] = mapped_column(String(100))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
 
     user = relationship("User", back_populates="league_profile")
     games: Mapped[List["Game"]] = relationship(back_populates="league")
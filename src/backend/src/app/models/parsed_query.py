@@ -0,0 +1,21 @@
+"""Cached constraint extraction ORM model."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ParsedQuery(Base):
+    __tablename__ = "parsed_query_cache"
+    __table_args__ = (UniqueConstraint("league_id", "normalized_query"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    league_id: Mapped[int] = mapped_column(ForeignKey("leagues.id"), nullable=False)
+    normalized_query: Mapped[str] = mapped_column(String(1000), nullable=False)
+    constraints: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
@@ -1,8 +1,9 @@
 """Referee profile ORM model."""
 
+from datetime import datetime, timezone
 from typing import List, Optional
 
-from sqlalchemy import Float, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -22,6 +23,11 @@ class RefereeProfile(Base):
     longitude: Mapped[Optional[float]] = mapped_column(Float)
     travel_radius_km: Mapped[Optional[float]] = mapped_column(Float)
     bio: Mapped[Optional[str]] = mapped_column(Text)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
 
     user = relationship("User", back_populates="referee_profile")
     assignments: Mapped[List["Assignment"]] = relationship(back_populates="referee")
@@ -1,6 +1,6 @@
 """AI matching schemas."""
 
-from typing import List
+from typing import Dict, List
 
 from pydantic import BaseModel
 
@@ -10,6 +10,13 @@ class FindRefRequest(BaseModel):
     league_id: int
 
 
+class RefRanking(BaseModel):
+    referee_id: int
+    score: float
+    breakdown: Dict[str, float]
+
+
 class FindRefResult(BaseModel):
     suggested_ref_ids: List[int]
     explanation: str
+    rankings: List[RefRanking] = []
@@ -1,7 +1,7 @@
 """Assignment schemas."""
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -22,3 +22,35 @@ class AssignmentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BatchAssignmentRequest(BaseModel):
+    game_ids: Optional[List[int]] = None
+    roles: List[str] = ["center", "ar", "ar"]
+    dry_run: bool = False
+
+
+class BatchAssignmentItem(BaseModel):
+    game_id: int
+    referee_id: int
+    role: str
+    cost: float
+    assignment_id: Optional[int] = None
+
+
+class UnfilledSlot(BaseModel):
+    game_id: int
+    role: str
+
+
+class BatchAssignmentResponse(BaseModel):
+    assignments: List[BatchAssignmentItem]
+    unfilled: List[UnfilledSlot]
+    total_cost: float
+    solve_ms: float
+
+
+class ChainAssignmentCreate(BaseModel):
+    game_ids: List[int]
+    referee_id: int
+    role: str
@@ -1,7 +1,7 @@
 """Game schemas."""
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -38,3 +38,31 @@ class GameResponse(GameBase):
 
     class Config:
         from_attributes = True
+
+
+class GameChainResponse(BaseModel):
+    game_ids: List[int]
+    field_location_ids: List[int]
+    start: datetime
+    end: datetime
+    travel_km: float
+
+
+class RecommendedReferee(BaseModel):
+    referee_id: int
+    cost: float
+    full_name: Optional[str] = None
+    cert_level: Optional[str] = None
+    average_rating: Optional[float] = None
+
+
+class GameRecommendationResponse(BaseModel):
+    game_id: int
+    computed_at: Optional[datetime] = None
+    referees: List[RecommendedReferee]
+
+
+class GameFeedItem(GameResponse):
+    field_name: Optional[str] = None
+    address: Optional[str] = None
+    distance_km: Optional[float] = None
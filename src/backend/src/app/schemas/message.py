@@ -12,7 +12,10 @@ class AIChatMessage(BaseModel):
     message: str = Field(..., min_length=1, max_length=5000, description="User message to AI")
     conversation_history: Optional[List[Dict[str, str]]] = Field(
         None, 
-        description="Previous conversation messages for context"
+        description=(
+            "Deprecated: the server keeps chat history per user. Only used to seed "
+            "history for users who have none stored yet."
+        ),
     )
 
 
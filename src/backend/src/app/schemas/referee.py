@@ -1,9 +1,9 @@
 """Referee profile schemas."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, EmailStr, Field
 
 
 class RefereeProfileBase(BaseModel):
@@ -58,6 +58,44 @@ class RefereeStatsResponse(BaseModel):
     recent_notes: List[NoteSummary]
 
 
+class RefereeStatsEntry(RefereeStatsResponse):
+    referee_id: int
+
+
 class AvailabilityCreate(BaseModel):
     start_time: datetime
     end_time: datetime
+
+
+class RefereeImportRow(BaseModel):
+    """One referee account in a bulk import; required fields match /auth/register."""
+
+    email: EmailStr
+    password: str = Field(min_length=1)
+    name: str = Field(min_length=1)
+    home_location: str = Field(min_length=1)
+    cert_level: str = Field(min_length=1)
+    years_experience: Optional[int] = None
+    primary_positions: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    travel_radius_km: Optional[float] = None
+    bio: Optional[str] = None
+
+
+class RefereeImportRequest(BaseModel):
+    # Validated row by row, so one bad row is reported instead of rejecting the upload.
+    referees: List[Dict[str, Any]]
+
+
+class RefereeImportError(BaseModel):
+    # 1-based position among the uploaded rows (CSV header not counted).
+    row: int
+    email: Optional[str] = None
+    error: str
+
+
+class RefereeImportResult(BaseModel):
+    created: int
+    referee_ids: List[int]
+    errors: List[RefereeImportError]
@@ -0,0 +1,183 @@
+"""Static system prompts and tool schemas for the AI chat assistant, built once per role.
+
+Everything here is constant for the life of the process, so the prompt prefix each role
+sends (tools, then the system prompt) is byte-identical across users and requests and
+can be served from the provider's prompt-prefix cache. Per-user details go in a separate
+context message after it (see `context_message`).
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+BASE_PROMPT = """You are RefNexus AI Assistant, a helpful assistant for referee scheduling and game and league management.
+
+You help users with:
+- Finding and suggesting referees for games
+- Scheduling games and managing assignments
+- Providing information about games, referees, and locations
+- Auto-completing tasks based on natural language requests
+
+Be conversational, helpful, and concise. When you need to perform actions, use the available functions."""
+
+ROLE_PROMPTS = {
+    "league": """
+
+You are assisting a league manager. They can:
+- Create games and schedule matches
+- Search for qualified referees
+- Assign referees to games
+- View game schedules
+
+Details about the league follow in a separate context message.""",
+    "referee": """
+
+You are assisting a referee. They can:
+- View available games and assignments
+- Update availability
+- Accept or decline game assignments
+- View their stats and ratings
+
+Details about the referee follow in a separate context message.""",
+}
+
+# Users are stored with role "referee"; "ref" is accepted as well.
+ROLE_ALIASES = {"ref": "referee"}
+
+# (context key, label) per role, in the order they are listed in the context message.
+CONTEXT_FIELDS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "league": (("league_name", "League"), ("region", "Region"), ("level", "Level")),
+    "referee": (
+        ("ref_name", "Name"),
+        ("cert_level", "Certification Level"),
+        ("location", "Location"),
+    ),
+}
+CONTEXT_HEADINGS = {"league": "Current league context:", "referee": "Current referee context:"}
+
+
+def _tool(name: str, description: str, properties: Dict[str, Any], required=()) -> Dict[str, Any]:
+    parameters: Dict[str, Any] = {"type": "object", "properties": properties}
+    if required:
+        parameters["required"] = list(required)
+    return {
+        "type": "function",
+        "function": {"name": name, "description": description, "parameters": parameters},
+    }
+
+
+COMMON_TOOLS = [
+    _tool(
+        "search_games",
+        "Search for games by date, location, or other criteria",
+        {
+            "date_from": {"type": "string", "description": "Start date (YYYY-MM-DD)"},
+            "date_to": {"type": "string", "description": "End date (YYYY-MM-DD)"},
+            "location": {"type": "string", "description": "Field name or address text"},
+            "latitude": {"type": "number", "description": "Search centre latitude"},
+            "longitude": {"type": "number", "description": "Search centre longitude"},
+            "radius_km": {"type": "number", "description": "Radius around the centre"},
+            "status": {"type": "string", "enum": ["open", "assigned", "completed"]},
+        },
+    ),
+    _tool(
+        "get_game_details",
+        "Get detailed information about a specific game",
+        {"game_id": {"type": "integer", "description": "Game ID"}},
+        required=["game_id"],
+    ),
+]
+
+ROLE_TOOLS = {
+    "league": [
+        _tool(
+            "find_referees",
+            "Find and suggest referees based on criteria",
+            {
+                "query": {"type": "string", "description": "Natural language search query"},
+                "game_id": {"type": "integer", "description": "Optional game ID for context"},
+            },
+            required=["query"],
+        ),
+        _tool(
+            "create_game",
+            "Create a new game/match",
+            {
+                "location": {"type": "string", "description": "Game location/address"},
+                "date_time": {"type": "string", "description": "Date and time (ISO format)"},
+                "age_group": {"type": "string", "description": "Age group (e.g., U12, U15)"},
+                "competition_level": {"type": "string", "description": "Competition level"},
+                "center_fee": {"type": "number", "description": "Center referee fee"},
+                "ar_fee": {"type": "number", "description": "Assistant referee fee"},
+            },
+            required=["location", "date_time"],
+        ),
+    ],
+    "referee": [
+        _tool(
+            "get_my_assignments",
+            "Get the referee's current game assignments",
+            {"status": {"type": "string", "enum": ["requested", "accepted", "all"]}},
+        ),
+        _tool(
+            "get_available_games",
+            "Get open games that match the referee's profile",
+            {"max_distance_km": {"type": "number", "description": "Maximum distance"}},
+        ),
+    ],
+}
+
+
+@dataclass(frozen=True)
+class RolePrompt:
+    """The fixed part of every chat request for one role. Treat the contents as read-only."""
+
+    role: Optional[str]
+    system_message: Mapping[str, str]
+    tools: List[Dict[str, Any]]
+    tool_names: FrozenSet[str]
+    # Fingerprint of the serialized prefix; it only changes when the code does.
+    prefix_digest: str
+
+
+def _build(role: Optional[str]) -> RolePrompt:
+    system_message = {"role": "system", "content": BASE_PROMPT + ROLE_PROMPTS.get(role, "")}
+    tools = COMMON_TOOLS + ROLE_TOOLS.get(role, [])
+    serialized = json.dumps([tools, system_message], sort_keys=True, separators=(",", ":"))
+    return RolePrompt(
+        role=role,
+        system_message=system_message,
+        tools=tools,
+        tool_names=frozenset(tool["function"]["name"] for tool in tools),
+        prefix_digest=hashlib.sha256(serialized.encode()).hexdigest()[:16],
+    )
+
+
+_REGISTRY: Dict[Optional[str], RolePrompt] = {
+    role: _build(role) for role in (None, *ROLE_PROMPTS)
+}
+
+
+def normalize_role(user_role: Optional[str]) -> Optional[str]:
+    role = ROLE_ALIASES.get(user_role or "", user_role)
+    return role if role in ROLE_PROMPTS else None
+
+
+def prompt_for_role(user_role: Optional[str]) -> RolePrompt:
+    """Precomputed prompt and tools for a role; unknown roles get the common ones."""
+    return _REGISTRY[normalize_role(user_role)]
+
+
+def context_message(
+    user_role: Optional[str], user_context: Mapping[str, Any]
+) -> Optional[Dict[str, str]]:
+    """The per-user system message sent after the static prefix, or None without context."""
+    role = normalize_role(user_role)
+    if role is None or not user_context:
+        return None
+    lines = [CONTEXT_HEADINGS[role]]
+    lines.extend(
+        f"- {label}: {user_context.get(key) or 'Unknown'}" for key, label in CONTEXT_FIELDS[role]
+    )
+    return {"role": "system", "content": "\n".join(lines)}
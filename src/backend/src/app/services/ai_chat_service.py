@@ -1,210 +1,67 @@
 """AI assistant service for chatbox interactions."""
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-from openai import OpenAI
+import asyncio
+import json
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from fastapi import BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import func, or_, and_
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
+from app.db.session import SessionLocal
+from app.integrations.openai_client import LLMUnavailableError, create_chat_completion
 from app.models.game import Game
 from app.models.league import League
 from app.models.referee import RefereeProfile
 from app.models.rating import Rating
 from app.models.user import User
 from app.schemas.ai import FindRefRequest, FindRefResult
+from app.services.ai_chat_registry import context_message, normalize_role, prompt_for_role
 from app.services.ai_matching_service import find_best_refs_from_nl
+from app.services.chat_memory_service import (
+    get_memory,
+    history_messages,
+    record_exchange,
+    record_exchange_detached,
+)
+from app.services.game_feed_service import get_referee_feed
+from app.services.game_service import search_games_query
 
+logger = logging.getLogger(__name__)
 
-def _client() -> OpenAI:
-    """Get OpenAI client."""
-    settings = get_settings()
-    return OpenAI(api_key=settings.OPENAI_API_KEY or None)
+UNAVAILABLE_REPLY = (
+    "The AI assistant is temporarily unavailable. Please try again in a minute, or use "
+    "the search and scheduling pages directly."
+)
 
 
 class AIChatAssistant:
     """AI-powered chat assistant for scheduling and ref finding."""
 
     @staticmethod
-    def get_system_prompt(user_role: str, user_context: Dict[str, Any]) -> str:
-        """Generate system prompt based on user role and context."""
-        base_prompt = """You are RefNexus AI Assistant, a helpful assistant for referee scheduling and game and league management.
-
-You help users with:
-- Finding and suggesting referees for games
-- Scheduling games and managing assignments
-- Providing information about games, referees, and locations
-- Auto-completing tasks based on natural language requests
-
-Be conversational, helpful, and concise. When you need to perform actions, use the available functions."""
-
-        if user_role == "league":
-            base_prompt += f"""
-
-You are assisting a league manager. They can:
-- Create games and schedule matches
-- Search for qualified referees
-- Assign referees to games
-- View game schedules
-
-Current league context:
-- League: {user_context.get('league_name', 'Unknown')}
-- Region: {user_context.get('region', 'Unknown')}
-"""
-        elif user_role == "ref":
-            base_prompt += f"""
-
-You are assisting a referee. They can:
-- View available games and assignments
-- Update availability
-- Accept or decline game assignments
-- View their stats and ratings
-
-Current referee context:
-- Name: {user_context.get('ref_name', 'Unknown')}
-- Certification Level: {user_context.get('cert_level', 'Unknown')}
-- Location: {user_context.get('location', 'Unknown')}
-"""
-
-        return base_prompt
-
-    @staticmethod
-    def get_available_tools(user_role: str) -> List[Dict[str, Any]]:
-        """Get available function tools based on user role."""
-        tools = []
-
-        # Common tools for both roles
-        tools.extend([
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_games",
-                    "description": "Search for games by date, location, or other criteria",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "date_from": {"type": "string", "description": "Start date (YYYY-MM-DD)"},
-                            "date_to": {"type": "string", "description": "End date (YYYY-MM-DD)"},
-                            "location": {"type": "string", "description": "Location or region"},
-                            "status": {"type": "string", "enum": ["open", "assigned", "completed"]},
-                        },
-                    },
-                },
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_game_details",
-                    "description": "Get detailed information about a specific game",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "game_id": {"type": "integer", "description": "Game ID"},
-                        },
-                        "required": ["game_id"],
-                    },
-                },
-            },
-        ])
-
-        if user_role == "league":
-            # League-specific tools
-            tools.extend([
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "find_referees",
-                        "description": "Find and suggest referees based on criteria",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "query": {"type": "string", "description": "Natural language search query"},
-                                "game_id": {"type": "integer", "description": "Optional game ID for context"},
-                            },
-                            "required": ["query"],
-                        },
-                    },
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "create_game",
-                        "description": "Create a new game/match",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "location": {"type": "string", "description": "Game location/address"},
-                                "date_time": {"type": "string", "description": "Date and time (ISO format)"},
-                                "age_group": {"type": "string", "description": "Age group (e.g., U12, U15)"},
-                                "competition_level": {"type": "string", "description": "Competition level"},
-                                "center_fee": {"type": "number", "description": "Center referee fee"},
-                                "ar_fee": {"type": "number", "description": "Assistant referee fee"},
-                            },
-                            "required": ["location", "date_time"],
-                        },
-                    },
-                },
-            ])
-        elif user_role == "ref":
-            # Referee-specific tools
-            tools.extend([
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "get_my_assignments",
-                        "description": "Get the referee's current game assignments",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "status": {"type": "string", "enum": ["requested", "accepted", "all"]},
-                            },
-                        },
-                    },
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "get_available_games",
-                        "description": "Get open games that match the referee's profile",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "max_distance_km": {"type": "number", "description": "Maximum distance"},
-                            },
-                        },
-                    },
-                },
-            ])
-
-        return tools
-
-    @staticmethod
-    async def chat(
+    def _build_messages(
         db: Session,
         user_id: int,
         user_role: str,
         message: str,
-        conversation_history: List[Dict[str, str]] = None,
-    ) -> Dict[str, Any]:
-        """
-        Process a chat message and return AI response with potential actions.
-        
-        Args:
-            db: Database session
-            user_id: Current user ID
-            user_role: User role ('ref' or 'league')
-            message: User's message
-            conversation_history: Previous messages in conversation
-            
-        Returns:
-            Dict with 'response' (text) and optional 'actions' (data from function calls)
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Assemble the request messages.
+
+        Order: the role's static system prompt, the user's context, the (already compacted)
+        history, then the new message. The static prompt is shared by every user of the
+        role and the context only changes when the profile does, so consecutive requests
+        share as long a prefix as possible for provider-side prompt caching.
         """
-        # Get user context
-        user = db.get(User, user_id)
         user_context = {}
-        
-        if user_role == "league":
+        role = normalize_role(user_role)
+
+        if role == "league":
             league = db.query(League).filter(League.user_id == user_id).first()
             if league:
                 user_context = {
@@ -212,7 +69,7 @@ Current referee context:
                     "region": league.primary_region,
                     "level": league.level,
                 }
-        elif user_role == "ref":
+        elif role == "referee":
             ref_profile = db.query(RefereeProfile).filter(RefereeProfile.user_id == user_id).first()
             if ref_profile:
                 user_context = {
@@ -221,100 +78,348 @@ Current referee context:
                     "location": ref_profile.home_location,
                 }
 
-        # Build messages for OpenAI
-        messages = [
-            {"role": "system", "content": AIChatAssistant.get_system_prompt(user_role, user_context)}
-        ]
-        
-        # Add conversation history
+        messages: List[Dict[str, Any]] = [dict(prompt_for_role(role).system_message)]
+        context = context_message(role, user_context)
+        if context:
+            messages.append(context)
+
+        # Add conversation history (summary + recent turns from chat memory)
         if conversation_history:
             messages.extend(conversation_history)
-        
+
         # Add current message
         messages.append({"role": "user", "content": message})
+        return messages
 
-        # Get tools
-        tools = AIChatAssistant.get_available_tools(user_role)
+    @staticmethod
+    def _league_id(db: Session, user_id: int, user_role: str) -> Optional[int]:
+        """League the user administers, used to attribute LLM usage."""
+        if user_role != "league":
+            return None
+        return db.query(League.id).filter(League.user_id == user_id).scalar()
 
-        # Call OpenAI
-        client = _client()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=messages,
-            tools=tools if tools else None,
-            tool_choice="auto" if tools else None,
-        )
+    @staticmethod
+    def _parse_arguments(raw: Optional[str]) -> Dict[str, Any]:
+        """Decode tool-call arguments, which the API returns as a JSON string."""
+        if not raw:
+            return {}
+        try:
+            parsed = json.loads(raw)
+        except json.JSONDecodeError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+
+    @staticmethod
+    def _assistant_turn(content: Optional[str], calls: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Assistant message echoing its tool calls, as the API expects before tool results."""
+        return {
+            "role": "assistant",
+            "content": content,
+            "tool_calls": [
+                {
+                    "id": call["id"],
+                    "type": "function",
+                    "function": {"name": call["name"], "arguments": call["arguments"]},
+                }
+                for call in calls
+            ],
+        }
+
+    @staticmethod
+    def _tool_turn(call_id: str, result: Any) -> Dict[str, Any]:
+        return {"role": "tool", "tool_call_id": call_id, "content": json.dumps(result, default=str)}
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        return remaining
+
+    @staticmethod
+    async def chat(
+        db: Session,
+        user_id: int,
+        user_role: str,
+        message: str,
+        conversation_history: List[Dict[str, str]] = None,
+        background_tasks: Optional[BackgroundTasks] = None,
+    ) -> Dict[str, Any]:
+        """
+        Process a chat message and return AI response with potential actions.
 
-        assistant_message = response.choices[0].message
+        Runs a bounded agent loop: every tool call the model makes in a turn is executed
+        concurrently, the results are sent back, and the loop ends when the model answers
+        without tools or the step/time limits are hit.
         
-        # Handle function calls
-        actions = []
-        if assistant_message.tool_calls:
-            for tool_call in assistant_message.tool_calls:
-                function_name = tool_call.function.name
-                function_args = eval(tool_call.function.arguments)
-                
-                # Execute the function
-                result = await AIChatAssistant._execute_function(
-                    db, user_id, user_role, function_name, function_args
+        Args:
+            db: Database session
+            user_id: Current user ID
+            user_role: User role ('ref' or 'league')
+            message: User's message
+            conversation_history: Previous messages in conversation
+            background_tasks: If given, the exchange is stored in memory after the response
+                is sent instead of before returning
+            
+        Returns:
+            Dict with 'response' (text) and optional 'actions' (data from function calls)
+        """
+        settings = get_settings()
+        deadline = time.monotonic() + settings.AI_CHAT_TIME_LIMIT_SECONDS
+        history = history_messages(get_memory(db, user_id), conversation_history)
+        messages = AIChatAssistant._build_messages(db, user_id, user_role, message, history)
+        league_id = AIChatAssistant._league_id(db, user_id, user_role)
+        tools = prompt_for_role(user_role).tools
+
+        actions: List[Dict[str, Any]] = []
+        content: Optional[str] = None
+        try:
+            for step in range(settings.AI_CHAT_MAX_STEPS):
+                # The last step may not call tools, so the model has to answer.
+                allow_tools = bool(tools) and step < settings.AI_CHAT_MAX_STEPS - 1
+                response = await asyncio.wait_for(
+                    create_chat_completion(
+                        "ai_chat",
+                        league_id,
+                        model="gpt-4o-mini",
+                        messages=messages,
+                        tools=tools if tools else None,
+                        tool_choice=("auto" if allow_tools else "none") if tools else None,
+                    ),
+                    timeout=AIChatAssistant._remaining(deadline),
                 )
-                actions.append({
-                    "function": function_name,
-                    "arguments": function_args,
-                    "result": result,
-                })
-
+                assistant_message = response.choices[0].message
+                content = assistant_message.content
+                if not assistant_message.tool_calls:
+                    break
+
+                calls = [
+                    {
+                        "id": tool_call.id,
+                        "name": tool_call.function.name,
+                        "arguments": tool_call.function.arguments or "",
+                    }
+                    for tool_call in assistant_message.tool_calls
+                ]
+                messages.append(AIChatAssistant._assistant_turn(content, calls))
+                results = await asyncio.wait_for(
+                    asyncio.gather(
+                        *(
+                            AIChatAssistant._execute_function(
+                                user_id,
+                                user_role,
+                                call["name"],
+                                AIChatAssistant._parse_arguments(call["arguments"]),
+                            )
+                            for call in calls
+                        )
+                    ),
+                    timeout=AIChatAssistant._remaining(deadline),
+                )
+                for call, result in zip(calls, results):
+                    function_args = AIChatAssistant._parse_arguments(call["arguments"])
+                    actions.append({
+                        "function": call["name"],
+                        "arguments": function_args,
+                        "result": result,
+                    })
+                    messages.append(AIChatAssistant._tool_turn(call["id"], result))
+        except asyncio.TimeoutError:
+            content = content or "I ran out of time working on that request."
+        except LLMUnavailableError:
+            content = content or UNAVAILABLE_REPLY
+
+        reply = content or "I've processed your request."
+        if background_tasks is not None:
+            # Compaction may call the LLM again; like chat_stream, answer first.
+            background_tasks.add_task(
+                record_exchange_detached, user_id, message, reply, conversation_history
+            )
+        else:
+            await record_exchange(db, user_id, message, reply, conversation_history)
         return {
-            "response": assistant_message.content or "I've processed your request.",
+            "response": reply,
             "actions": actions,
-            "function_calls": bool(assistant_message.tool_calls),
+            "function_calls": bool(actions),
         }
 
+    @staticmethod
+    async def chat_stream(
+        db: Session,
+        user_id: int,
+        user_role: str,
+        message: str,
+        conversation_history: List[Dict[str, str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of `chat`, running the same bounded agent loop.
+
+        Yields events as they become available:
+            {"type": "token", "content": ...} for each content delta,
+            {"type": "tool_result", "function", "arguments", "result"} as each tool finishes,
+            {"type": "done", "response", "function_calls"} once at the end.
+        """
+        settings = get_settings()
+        deadline = time.monotonic() + settings.AI_CHAT_TIME_LIMIT_SECONDS
+        history = history_messages(get_memory(db, user_id), conversation_history)
+        messages = AIChatAssistant._build_messages(db, user_id, user_role, message, history)
+        league_id = AIChatAssistant._league_id(db, user_id, user_role)
+        tools = prompt_for_role(user_role).tools
+
+        content_parts: List[str] = []
+        function_calls = False
+        try:
+            for step in range(settings.AI_CHAT_MAX_STEPS):
+                allow_tools = bool(tools) and step < settings.AI_CHAT_MAX_STEPS - 1
+                stream = await asyncio.wait_for(
+                    create_chat_completion(
+                        "ai_chat_stream",
+                        league_id,
+                        model="gpt-4o-mini",
+                        messages=messages,
+                        tools=tools if tools else None,
+                        tool_choice=("auto" if allow_tools else "none") if tools else None,
+                        stream=True,
+                    ),
+                    timeout=AIChatAssistant._remaining(deadline),
+                )
+
+                step_parts: List[str] = []
+                # Tool calls arrive as fragments keyed by index; ids, names and arguments
+                # are concatenated.
+                pending_calls: Dict[int, Dict[str, str]] = {}
+                async for chunk in stream:
+                    AIChatAssistant._remaining(deadline)
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    if delta.content:
+                        step_parts.append(delta.content)
+                        yield {"type": "token", "content": delta.content}
+                    for call in delta.tool_calls or []:
+                        entry = pending_calls.setdefault(
+                            call.index, {"id": "", "name": "", "arguments": ""}
+                        )
+                        if getattr(call, "id", None):
+                            entry["id"] += call.id
+                        if call.function and call.function.name:
+                            entry["name"] += call.function.name
+                        if call.function and call.function.arguments:
+                            entry["arguments"] += call.function.arguments
+                content_parts.extend(step_parts)
+                if not pending_calls:
+                    break
+
+                function_calls = True
+                calls = [pending_calls[index] for index in sorted(pending_calls)]
+                messages.append(
+                    AIChatAssistant._assistant_turn("".join(step_parts) or None, calls)
+                )
+
+                async def run(call: Dict[str, str]) -> Tuple[Dict[str, str], Any]:
+                    result = await AIChatAssistant._execute_function(
+                        user_id,
+                        user_role,
+                        call["name"],
+                        AIChatAssistant._parse_arguments(call["arguments"]),
+                    )
+                    return call, result
+
+                for finished in asyncio.as_completed(
+                    [run(call) for call in calls], timeout=AIChatAssistant._remaining(deadline)
+                ):
+                    call, result = await finished
+                    messages.append(AIChatAssistant._tool_turn(call["id"], result))
+                    yield {
+                        "type": "tool_result",
+                        "function": call["name"],
+                        "arguments": AIChatAssistant._parse_arguments(call["arguments"]),
+                        "result": result,
+                    }
+        except asyncio.TimeoutError:
+            if not content_parts:
+                content_parts.append("I ran out of time working on that request.")
+        except LLMUnavailableError:
+            if not content_parts:
+                content_parts.append(UNAVAILABLE_REPLY)
+
+        reply = "".join(content_parts) or "I've processed your request."
+        yield {"type": "done", "response": reply, "function_calls": function_calls}
+        # The client already has its answer; compaction must not delay the done event.
+        await record_exchange(db, user_id, message, reply, conversation_history)
+
     @staticmethod
     async def _execute_function(
+        user_id: int,
+        user_role: str,
+        function_name: str,
+        arguments: Dict[str, Any],
+    ) -> Any:
+        """Execute a function call from the AI.
+
+        Each call runs in the threadpool on its own session, so the tool calls of one turn
+        can overlap; a failing tool reports an error instead of aborting the others.
+        """
+
+        def work() -> Any:
+            db = SessionLocal()
+            try:
+                return AIChatAssistant._call_tool(db, user_id, user_role, function_name, arguments)
+            except Exception:
+                logger.exception("AI tool %s failed", function_name)
+                return {"error": f"{function_name} failed"}
+            finally:
+                db.close()
+
+        return await run_in_threadpool(work)
+
+    @staticmethod
+    def _call_tool(
         db: Session,
         user_id: int,
         user_role: str,
         function_name: str,
         arguments: Dict[str, Any],
     ) -> Any:
-        """Execute a function call from the AI."""
-        
-        if function_name == "search_games":
-            return AIChatAssistant._search_games(db, user_id, arguments)
-        
-        elif function_name == "get_game_details":
-            return AIChatAssistant._get_game_details(db, arguments.get("game_id"))
-        
-        elif function_name == "find_referees":
-            return await AIChatAssistant._find_referees(db, user_id, arguments)
-        
-        elif function_name == "create_game":
-            return await AIChatAssistant._create_game(db, user_id, arguments)
-        
-        elif function_name == "get_my_assignments":
-            return AIChatAssistant._get_assignments(db, user_id, arguments)
-        
-        elif function_name == "get_available_games":
-            return AIChatAssistant._get_available_games(db, user_id, arguments)
-        
-        return {"error": "Unknown function"}
+        # Only the tools offered to the user's role may run.
+        handler = TOOL_HANDLERS.get(function_name)
+        if handler is None or function_name not in prompt_for_role(user_role).tool_names:
+            return {"error": "Unknown function"}
+        return handler(db, user_id, arguments)
 
     @staticmethod
-    def _search_games(db: Session, user_id: int, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _search_games(db: Session, user_id: int, args: Dict[str, Any]) -> Any:
         """Search for games."""
-        query = db.query(Game)
-        
-        if args.get("status"):
-            query = query.filter(Game.status == args["status"])
-        
-        if args.get("date_from"):
-            query = query.filter(Game.scheduled_start >= args["date_from"])
-        
-        if args.get("date_to"):
-            query = query.filter(Game.scheduled_start <= args["date_to"])
-        
-        games = query.limit(10).all()
+        try:
+            date_from, date_to = (
+                date.fromisoformat(args[key][:10]) if args.get(key) else None
+                for key in ("date_from", "date_to")
+            )
+        except ValueError:
+            return {"error": "Dates must be YYYY-MM-DD"}
+        radius = {}
+        if all(args.get(key) is not None for key in ("latitude", "longitude", "radius_km")):
+            radius = {
+                "lat": args["latitude"],
+                "lon": args["longitude"],
+                "radius_km": args["radius_km"],
+            }
+
+        # League users search their own schedule; referees search every league.
+        league = db.query(League).filter(League.user_id == user_id).first()
+        games = (
+            search_games_query(
+                db,
+                league_id=league.id if league else None,
+                status_filter=args.get("status"),
+                date_from=date_from,
+                date_to=date_to,
+                location=args.get("location"),
+                **radius,
+            )
+            .limit(10)
+            .all()
+        )
         return [
             {
                 "id": g.id,
@@ -345,7 +450,7 @@ Current referee context:
         }
 
     @staticmethod
-    async def _find_referees(db: Session, user_id: int, args: Dict[str, Any]) -> Dict[str, Any]:
+    def _find_referees(db: Session, user_id: int, args: Dict[str, Any]) -> Dict[str, Any]:
         """Find referees using AI matching."""
         league = db.query(League).filter(League.user_id == user_id).first()
         if not league:
@@ -378,7 +483,7 @@ Current referee context:
         }
 
     @staticmethod
-    async def _create_game(db: Session, user_id: int, args: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_game(db: Session, user_id: int, args: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new game."""
         league = db.query(League).filter(League.user_id == user_id).first()
         if not league:
@@ -409,16 +514,31 @@ Current referee context:
         if not ref_profile:
             return []
         
-        # Get open games near referee
-        games = db.query(Game).filter(Game.status == "open").limit(10).all()
-        
+        entries, _ = get_referee_feed(
+            db, ref_profile, limit=10, max_distance_km=args.get("max_distance_km")
+        )
         return [
             {
-                "id": g.id,
-                "location": g.field_location.address if g.field_location else "Unknown",
-                "date": g.scheduled_start.isoformat(),
-                "age_group": g.age_group,
-                "center_fee": g.center_fee,
+                "id": e.game.id,
+                "location": e.game.field_location.address if e.game.field_location else "Unknown",
+                "date": e.game.scheduled_start.isoformat(),
+                "age_group": e.game.age_group,
+                "center_fee": e.game.center_fee,
+                "distance_km": e.distance_km,
             }
-            for g in games
+            for e in entries
         ]
+
+
+ToolHandler = Callable[[Session, int, Dict[str, Any]], Any]
+
+TOOL_HANDLERS: Dict[str, ToolHandler] = {
+    "search_games": AIChatAssistant._search_games,
+    "get_game_details": lambda db, user_id, args: AIChatAssistant._get_game_details(
+        db, args.get("game_id")
+    ),
+    "find_referees": AIChatAssistant._find_referees,
+    "create_game": AIChatAssistant._create_game,
+    "get_my_assignments": AIChatAssistant._get_assignments,
+    "get_available_games": AIChatAssistant._get_available_games,
+}
@@ -1,38 +1,62 @@
 """AI matching logic for referee assignments."""
 
-from typing import List
-
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.integrations.openai_client import parse_ref_request
-from app.models.rating import Rating
-from app.models.referee import RefereeProfile
-from app.schemas.ai import FindRefRequest, FindRefResult
+from app.integrations.openai_client import LLMUnavailableError
+from app.models.league import League
+from app.schemas.ai import FindRefRequest, FindRefResult, RefRanking
+from app.services.constraint_cache import cached_parse_ref_request
+from app.services.constraint_rules import parse_with_rules
+from app.services.ranking_service import (
+    build_features,
+    load_rating_map,
+    load_workload_map,
+    top_k,
+    weight_profile_for_league,
+)
 from app.services.referee_service import search_candidate_refs
+from app.services.referee_text_index import text_match_scores
 
 
 def find_best_refs_from_nl(db: Session, req: FindRefRequest) -> FindRefResult:
-    constraints = parse_ref_request(req.natural_language_query, req.league_id)
+    degraded = False
+    try:
+        constraints = cached_parse_ref_request(req.natural_language_query, req.league_id, db)
+    except LLMUnavailableError:
+        # Plain filter search on whatever the rule grammar could read from the request.
+        constraints = parse_with_rules(req.natural_language_query).constraints
+        degraded = True
     candidates = search_candidate_refs(db, constraints)
 
     if not candidates:
         return FindRefResult(suggested_ref_ids=[], explanation="No matching referees found.")
 
-    rating_map = {
-        ref_id: avg
-        for ref_id, avg in (
-            db.query(Rating.referee_id, func.avg(Rating.score))
-            .group_by(Rating.referee_id)
-            .all()
+    league = db.get(League, req.league_id)
+    weights = weight_profile_for_league(league)
+    features = build_features(
+        candidates, constraints, load_rating_map(db), load_workload_map(db)
+    )
+    text_scores = text_match_scores(
+        db, req.natural_language_query, [ref.id for ref in candidates]
+    )
+    ranked = top_k(features, weights, text_scores=text_scores)
+
+    explanation = (
+        "Ranked by weighted rating, distance, experience, certification fit and workload "
+        "using constraints from the request."
+    )
+    if text_scores:
+        explanation += " Profiles whose bio or positions match the request's wording rank higher."
+    if degraded:
+        explanation = (
+            "AI request parsing is temporarily unavailable; ranked using only the filters "
+            "that could be read directly from the request."
         )
-    }
-
-    def score(ref: RefereeProfile) -> float:
-        avg_rating = rating_map.get(ref.id, 0) or 0
-        return float(avg_rating)
-
-    ranked = sorted(candidates, key=score, reverse=True)
-    top_ids = [ref.id for ref in ranked[:5]]
-    explanation = "Ranked by average rating and constraints from the request."
-    return FindRefResult(suggested_ref_ids=top_ids, explanation=explanation)
+    return FindRefResult(
+        suggested_ref_ids=[r.referee_id for r in ranked],
+        explanation=explanation,
+        rankings=[
+            RefRanking(referee_id=r.referee_id, score=r.score, breakdown=r.breakdown)
+            for r in ranked
+        ],
+    )
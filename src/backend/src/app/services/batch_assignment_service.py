@@ -0,0 +1,423 @@
+"""League-wide batch referee assignment as a min-cost bipartite matching."""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.assignment import Assignment
+from app.models.availability import AvailabilitySlot
+from app.models.game import Game
+from app.models.league import League
+from app.models.referee import RefereeProfile
+from app.services.ranking_service import (
+    ACTIVE_ASSIGNMENT_STATUSES,
+    DEFAULT_DISTANCE_KM,
+    EXPERIENCE_CAP_YEARS,
+    NEUTRAL_SCORE,
+    WeightProfile,
+    cert_rank,
+    load_rating_map,
+    required_cert_rank,
+    weight_profile_for_league,
+)
+from app.services.referee_service import haversine_km
+
+GAME_DURATION = timedelta(hours=2)
+CANDIDATES_PER_SLOT = 30
+UNFILLED_COST = 10.0
+CENTER_UNFILLED_MULTIPLIER = 2.0
+UNKNOWN_AVAILABILITY_PENALTY = 0.2
+WORKLOAD_PENALTY = 0.05
+KM_PER_DEGREE_LAT = 111.0
+ASSIGNMENT_ROLES = ("center", "ar")
+
+Interval = Tuple[datetime, datetime]
+
+
+@dataclass
+class RefereeSnapshot:
+    id: int
+    latitude: Optional[float]
+    longitude: Optional[float]
+    travel_radius_km: Optional[float]
+    rating: float
+    experience: float
+    cert_rank: Optional[int]
+    workload: int = 0
+    availability: List[Interval] = field(default_factory=list)
+    busy: List[Interval] = field(default_factory=list)
+    # Display only, for lists shown as-is (stored recommendations).
+    full_name: Optional[str] = None
+    cert_level: Optional[str] = None
+    average_rating: Optional[float] = None
+
+
+@dataclass
+class GameSlot:
+    game_id: int
+    role: str
+    start: datetime
+    latitude: float
+    longitude: float
+    required_rank: Optional[int]
+
+    @property
+    def end(self) -> datetime:
+        return self.start + GAME_DURATION
+
+
+@dataclass
+class SlotAssignment:
+    slot: GameSlot
+    referee_id: Optional[int]
+    cost: Optional[float]
+
+
+def _overlaps(a: Interval, b: Interval) -> bool:
+    return a[0] < b[1] and b[0] < a[1]
+
+
+def _pair_terms(slot: GameSlot, ref: RefereeSnapshot) -> Optional[Tuple[float, float]]:
+    """Role-independent (distance feature, availability penalty), or None if infeasible."""
+    if ref.latitude is None or ref.longitude is None:
+        distance = NEUTRAL_SCORE
+    else:
+        limit = float(ref.travel_radius_km or DEFAULT_DISTANCE_KM)
+        # One degree of latitude is ~111 km; skip the trig when that alone is too far.
+        if abs(slot.latitude - ref.latitude) * KM_PER_DEGREE_LAT > limit:
+            return None
+        km = haversine_km(slot.latitude, slot.longitude, ref.latitude, ref.longitude)
+        if km > limit:
+            return None
+        distance = 1.0 - km / limit
+
+    window = (slot.start, slot.end)
+    if any(_overlaps(window, b) for b in ref.busy):
+        return None
+    if ref.availability:
+        if not any(a[0] <= window[0] and window[1] <= a[1] for a in ref.availability):
+            return None
+        return distance, 0.0
+    return distance, UNKNOWN_AVAILABILITY_PENALTY
+
+
+def _role_cost(
+    slot: GameSlot,
+    ref: RefereeSnapshot,
+    weights: WeightProfile,
+    distance: float,
+    availability_penalty: float,
+) -> float:
+    required = slot.required_rank
+    if required is not None and slot.role != "center":
+        # Assistant referees may work one level above their certification.
+        required = max(0, required - 1)
+    if ref.cert_rank is None:
+        certification = NEUTRAL_SCORE
+    elif required is None or ref.cert_rank >= required:
+        certification = 1.0
+    else:
+        certification = max(0.0, 1.0 - 0.25 * (required - ref.cert_rank))
+
+    shortfall = (
+        weights.rating * (1.0 - ref.rating)
+        + weights.distance * (1.0 - distance)
+        + weights.experience * (1.0 - ref.experience)
+        + weights.certification * (1.0 - certification)
+    )
+    return shortfall + availability_penalty + WORKLOAD_PENALTY * ref.workload
+
+
+def slot_cost(slot: GameSlot, ref: RefereeSnapshot, weights: WeightProfile) -> Optional[float]:
+    """Cost of putting `ref` on `slot`, or None when the pairing is infeasible."""
+    terms = _pair_terms(slot, ref)
+    if terms is None:
+        return None
+    return _role_cost(slot, ref, weights, *terms)
+
+
+def solve_min_cost_assignment(
+    edges: Sequence[Sequence[Tuple[int, float]]],
+    n_right: int,
+    unfilled_costs: Optional[Sequence[float]] = None,
+) -> List[Optional[int]]:
+    """Min-cost matching of left nodes to distinct right nodes over sparse, non-negative edges.
+
+    Uses successive shortest augmenting paths (Dijkstra on reduced costs with potentials).
+    Every left node gets a private fallback edge (UNFILLED_COST unless `unfilled_costs` says
+    otherwise), so each left node is matched to a right node or reported as None.
+    """
+    n_left = len(edges)
+    total_right = n_right + n_left
+    fallback = unfilled_costs or [UNFILLED_COST] * n_left
+    adjacency = [list(e) + [(n_right + i, fallback[i])] for i, e in enumerate(edges)]
+
+    u = [0.0] * n_left
+    v = [0.0] * total_right
+    match_left: List[int] = [-1] * n_left
+    match_right: List[int] = [-1] * total_right
+
+    for start in range(n_left):
+        dist_left = {start: 0.0}
+        dist_right: Dict[int, float] = {}
+        prev: Dict[int, int] = {}
+        done: set = set()
+        heap: List[Tuple[float, int]] = []
+
+        def relax(x: int) -> None:
+            base = dist_left[x] - u[x]
+            for r, c in adjacency[x]:
+                if r in done:
+                    continue
+                d = base + c - v[r]
+                if d < dist_right.get(r, float("inf")):
+                    dist_right[r] = d
+                    prev[r] = x
+                    heapq.heappush(heap, (d, r))
+
+        relax(start)
+        final = -1
+        while heap:
+            d, r = heapq.heappop(heap)
+            if r in done or d > dist_right[r]:
+                continue
+            done.add(r)
+            y = match_right[r]
+            if y == -1:
+                final = r
+                break
+            dist_left[y] = d
+            relax(y)
+
+        limit = dist_right[final]
+        for x, dx in dist_left.items():
+            u[x] += limit - dx
+        for r in done:
+            v[r] -= limit - dist_right[r]
+
+        r = final
+        while True:
+            x = prev[r]
+            previous = match_left[x]
+            match_left[x] = r
+            match_right[r] = x
+            if x == start:
+                break
+            r = previous
+
+    return [r if 0 <= r < n_right else None for r in match_left]
+
+
+def _conflict_groups(slots: Sequence[GameSlot]) -> List[List[int]]:
+    """Split slots into chronological groups whose games overlap in time."""
+    order = sorted(range(len(slots)), key=lambda i: slots[i].start)
+    groups: List[List[int]] = []
+    group_end: Optional[datetime] = None
+    for i in order:
+        if group_end is None or slots[i].start >= group_end:
+            groups.append([])
+            group_end = slots[i].end
+        else:
+            group_end = max(group_end, slots[i].end)
+        groups[-1].append(i)
+    return groups
+
+
+def plan_assignments(
+    slots: Sequence[GameSlot],
+    refs: Sequence[RefereeSnapshot],
+    weights: WeightProfile,
+    candidates_per_slot: int = CANDIDATES_PER_SLOT,
+) -> List[SlotAssignment]:
+    """Assign referees to slots, one overlapping-time group at a time.
+
+    Within a group each referee takes at most one slot; assignments made in earlier groups
+    count towards workload (and busy time) in later ones.
+    """
+    results: List[Optional[SlotAssignment]] = [None] * len(slots)
+    for group in _conflict_groups(slots):
+        edges: List[List[Tuple[int, float]]] = []
+        # Distance and availability are computed once per game; each (game, role) pair
+        # shares one candidate row.
+        feasible: Dict[int, List[Tuple[int, float, float]]] = {}
+        rows: Dict[Tuple[int, str], List[Tuple[int, float]]] = {}
+        for i in group:
+            slot = slots[i]
+            if slot.game_id not in feasible:
+                pairs = []
+                for j, ref in enumerate(refs):
+                    terms = _pair_terms(slot, ref)
+                    if terms is not None:
+                        pairs.append((j, terms[0], terms[1]))
+                feasible[slot.game_id] = pairs
+            key = (slot.game_id, slot.role)
+            if key not in rows:
+                costs = [
+                    (j, _role_cost(slot, refs[j], weights, distance, penalty))
+                    for j, distance, penalty in feasible[slot.game_id]
+                ]
+                rows[key] = heapq.nsmallest(candidates_per_slot, costs, key=lambda e: e[1])
+            edges.append(rows[key])
+
+        # Leaving a center slot empty is worse than leaving an assistant slot empty.
+        unfilled = [
+            UNFILLED_COST * (CENTER_UNFILLED_MULTIPLIER if slots[i].role == "center" else 1.0)
+            for i in group
+        ]
+        matched = solve_min_cost_assignment(edges, len(refs), unfilled)
+        for i, j, candidate_edges in zip(group, matched, edges):
+            slot = slots[i]
+            if j is None:
+                results[i] = SlotAssignment(slot=slot, referee_id=None, cost=None)
+                continue
+            ref = refs[j]
+            cost = next(c for r, c in candidate_edges if r == j)
+            results[i] = SlotAssignment(slot=slot, referee_id=ref.id, cost=round(cost, 4))
+            ref.busy.append((slot.start, slot.end))
+            ref.workload += 1
+    return [r for r in results if r is not None]
+
+
+def load_referee_snapshots(db: Session, now: datetime) -> List[RefereeSnapshot]:
+    rating_map = load_rating_map(db)
+    refs = {
+        ref.id: RefereeSnapshot(
+            id=ref.id,
+            latitude=ref.latitude,
+            longitude=ref.longitude,
+            travel_radius_km=ref.travel_radius_km,
+            rating=(rating_map[ref.id] / 5.0) if ref.id in rating_map else NEUTRAL_SCORE,
+            experience=min(ref.years_experience or 0, EXPERIENCE_CAP_YEARS)
+            / EXPERIENCE_CAP_YEARS,
+            cert_rank=cert_rank(ref.cert_level),
+            full_name=ref.full_name,
+            cert_level=ref.cert_level,
+            average_rating=rating_map.get(ref.id),
+        )
+        for ref in db.query(RefereeProfile).all()
+    }
+
+    for slot in db.query(AvailabilitySlot).filter(AvailabilitySlot.end_time >= now).all():
+        if slot.referee_id in refs:
+            refs[slot.referee_id].availability.append((slot.start_time, slot.end_time))
+
+    busy_rows = (
+        db.query(Assignment.referee_id, Game.scheduled_start)
+        .join(Game, Game.id == Assignment.game_id)
+        .filter(
+            Game.scheduled_start >= now - GAME_DURATION,
+            Assignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+        )
+        .all()
+    )
+    for referee_id, start in busy_rows:
+        if referee_id in refs:
+            refs[referee_id].busy.append((start, start + GAME_DURATION))
+            refs[referee_id].workload += 1
+    return list(refs.values())
+
+
+def auto_assign_games(
+    db: Session,
+    league: League,
+    game_ids: Optional[List[int]],
+    roles: List[str],
+    dry_run: bool = False,
+) -> Dict[str, object]:
+    """Fill the requested roles on a league's games and create all assignments in one commit."""
+    unknown_roles = sorted(set(roles) - set(ASSIGNMENT_ROLES))
+    if unknown_roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown roles: {', '.join(unknown_roles)}",
+        )
+
+    now = datetime.now(timezone.utc)
+    query = (
+        db.query(Game)
+        .options(joinedload(Game.field_location), joinedload(Game.assignments))
+        .filter(Game.league_id == league.id)
+    )
+    open_games = query.filter(Game.status == "open", Game.scheduled_start >= now)
+    if game_ids:
+        # Explicit ids get the same filter as the default run; any that fail it are refused.
+        games = open_games.filter(Game.id.in_(game_ids)).all()
+        rejected = sorted(set(game_ids) - {game.id for game in games})
+        if rejected:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Games not found or not open for assignment: "
+                + ", ".join(map(str, rejected)),
+            )
+    else:
+        games = open_games.all()
+
+    slots: List[GameSlot] = []
+    for game in games:
+        remaining = list(roles)
+        for existing in game.assignments:
+            if existing.status in ACTIVE_ASSIGNMENT_STATUSES and existing.role in remaining:
+                remaining.remove(existing.role)
+        required = required_cert_rank(
+            {"age_group": game.age_group, "competition_level": game.competition_level}
+        )
+        for role in remaining:
+            slots.append(
+                GameSlot(
+                    game_id=game.id,
+                    role=role,
+                    start=game.scheduled_start,
+                    latitude=game.field_location.latitude,
+                    longitude=game.field_location.longitude,
+                    required_rank=required,
+                )
+            )
+
+    refs = load_referee_snapshots(db, now)
+    started = time.perf_counter()
+    plan = plan_assignments(slots, refs, weight_profile_for_league(league))
+    solve_ms = (time.perf_counter() - started) * 1000
+
+    created: Dict[int, int] = {}
+    if not dry_run:
+        pending: Dict[int, Assignment] = {}
+        for idx, item in enumerate(plan):
+            if item.referee_id is None:
+                continue
+            assignment = Assignment(
+                game_id=item.slot.game_id,
+                referee_id=item.referee_id,
+                role=item.slot.role,
+                status="requested",
+            )
+            db.add(assignment)
+            pending[idx] = assignment
+        db.flush()
+        created = {idx: assignment.id for idx, assignment in pending.items()}
+        db.commit()
+
+    return {
+        "assignments": [
+            {
+                "game_id": item.slot.game_id,
+                "referee_id": item.referee_id,
+                "role": item.slot.role,
+                "cost": item.cost,
+                "assignment_id": created.get(idx),
+            }
+            for idx, item in enumerate(plan)
+            if item.referee_id is not None
+        ],
+        "unfilled": [
+            {"game_id": item.slot.game_id, "role": item.slot.role}
+            for item in plan
+            if item.referee_id is None
+        ],
+        "total_cost": round(sum(item.cost or 0.0 for item in plan), 4),
+        "solve_ms": round(solve_ms, 1),
+    }
@@ -0,0 +1,187 @@
+"""Same-day game chaining: blocks of consecutive games a single referee can work."""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.assignment import Assignment
+from app.models.game import Game
+from app.models.league import League
+from app.models.referee import RefereeProfile
+from app.services.batch_assignment_service import (
+    GAME_DURATION,
+    UNFILLED_COST,
+    solve_min_cost_assignment,
+)
+from app.services.game_feed_service import invalidate_referee_feed
+from app.services.recommendation_service import mark_game_changed, mark_referee_changed
+from app.services.referee_service import haversine_km
+
+DEFAULT_MAX_HOP_KM = 15.0
+DEFAULT_MAX_CHAIN_GAMES = 3
+MAX_IDLE_GAP = timedelta(minutes=90)
+TRAVEL_SPEED_KMH = 40.0
+TRANSITION_BUFFER = timedelta(minutes=15)
+
+
+@dataclass
+class GameChain:
+    games: List[Game]
+    travel_km: float
+
+    @property
+    def start(self) -> datetime:
+        return self.games[0].scheduled_start
+
+    @property
+    def end(self) -> datetime:
+        return self.games[-1].scheduled_start + GAME_DURATION
+
+
+def _hop_km(a: Game, b: Game) -> float:
+    if a.field_location_id == b.field_location_id:
+        return 0.0
+    return haversine_km(
+        a.field_location.latitude,
+        a.field_location.longitude,
+        b.field_location.latitude,
+        b.field_location.longitude,
+    )
+
+
+def can_follow(a: Game, b: Game, max_hop_km: float = DEFAULT_MAX_HOP_KM) -> Optional[float]:
+    """Travel distance if a referee can finish `a` and still make kickoff at `b`, else None."""
+    km = _hop_km(a, b)
+    if km > max_hop_km:
+        return None
+    ready_at = (
+        a.scheduled_start
+        + GAME_DURATION
+        + TRANSITION_BUFFER
+        + timedelta(hours=km / TRAVEL_SPEED_KMH)
+    )
+    if b.scheduled_start < ready_at:
+        return None
+    if b.scheduled_start - (a.scheduled_start + GAME_DURATION) > MAX_IDLE_GAP:
+        return None
+    return km
+
+
+def build_chains(
+    games: Sequence[Game],
+    max_hop_km: float = DEFAULT_MAX_HOP_KM,
+    max_games: int = DEFAULT_MAX_CHAIN_GAMES,
+) -> List[GameChain]:
+    """Cover a day's games with as few chains as possible, then with the least travel.
+
+    Each game picks at most one successor via a min-cost matching over feasible
+    transitions (cost = hop distance), which is a minimum path cover of the schedule.
+    Chains longer than `max_games` are split into consecutive blocks.
+    """
+    ordered = sorted(games, key=lambda g: g.scheduled_start)
+    n = len(ordered)
+    edges: List[List[Tuple[int, float]]] = []
+    for i, a in enumerate(ordered):
+        row = []
+        for j in range(i + 1, n):
+            km = can_follow(a, ordered[j], max_hop_km)
+            if km is not None:
+                row.append((j, km / max_hop_km if max_hop_km > 0 else 0.0))
+        edges.append(row)
+
+    successor = solve_min_cost_assignment(edges, n, [UNFILLED_COST] * n)
+    has_predecessor = {j for j in successor if j is not None}
+
+    chains: List[GameChain] = []
+    for head in range(n):
+        if head in has_predecessor:
+            continue
+        path = [head]
+        while successor[path[-1]] is not None:
+            path.append(successor[path[-1]])
+        for offset in range(0, len(path), max_games):
+            block = [ordered[i] for i in path[offset : offset + max_games]]
+            travel = sum(_hop_km(x, y) for x, y in zip(block, block[1:]))
+            chains.append(GameChain(games=block, travel_km=round(travel, 2)))
+
+    chains.sort(key=lambda c: (c.start, -len(c.games)))
+    return chains
+
+
+def list_day_chains(
+    db: Session,
+    league: League,
+    day: date,
+    max_hop_km: float = DEFAULT_MAX_HOP_KM,
+    max_games: int = DEFAULT_MAX_CHAIN_GAMES,
+    status_filter: Optional[str] = "open",
+    tz: tzinfo = timezone.utc,
+) -> List[GameChain]:
+    """Chains among the games on `day`, a calendar day in `tz` (the league's local zone).
+
+    A UTC day would cut US evening kickoffs off into the next day's chains.
+    """
+    day_start = datetime.combine(day, time.min, tzinfo=tz).astimezone(timezone.utc)
+    # The next local midnight, not start + 24h: DST days are 23 or 25 hours long.
+    day_end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz).astimezone(
+        timezone.utc
+    )
+    query = (
+        db.query(Game)
+        .options(joinedload(Game.field_location))
+        .filter(
+            Game.league_id == league.id,
+            Game.scheduled_start >= day_start,
+            Game.scheduled_start < day_end,
+        )
+    )
+    if status_filter:
+        query = query.filter(Game.status == status_filter)
+    return build_chains(query.all(), max_hop_km, max_games)
+
+
+def request_chain_assignment(
+    db: Session,
+    league: League,
+    game_ids: List[int],
+    referee_id: int,
+    role: str,
+    max_hop_km: float = DEFAULT_MAX_HOP_KM,
+) -> List[Assignment]:
+    """Request one referee for every game in a block, in a single transaction."""
+    games_by_id: Dict[int, Game] = {
+        g.id: g
+        for g in db.query(Game)
+        .options(joinedload(Game.field_location))
+        .filter(Game.id.in_(game_ids), Game.league_id == league.id)
+        .all()
+    }
+    if len(games_by_id) != len(set(game_ids)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
+    if not db.get(RefereeProfile, referee_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Referee not found")
+
+    games = sorted(games_by_id.values(), key=lambda g: g.scheduled_start)
+    for a, b in zip(games, games[1:]):
+        if can_follow(a, b, max_hop_km) is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Games {a.id} and {b.id} cannot be worked back to back",
+            )
+
+    assignments = [
+        Assignment(game_id=g.id, referee_id=referee_id, role=role, status="requested")
+        for g in games
+    ]
+    db.add_all(assignments)
+    db.commit()
+    for assignment in assignments:
+        db.refresh(assignment)
+    invalidate_referee_feed(referee_id)
+    for game in games:
+        mark_game_changed(game.id)
+    mark_referee_changed(referee_id)
+    return assignments
@@ -0,0 +1,188 @@
+"""Server-side AI chat history with token-budgeted compaction."""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.integrations.openai_client import create_chat_completion
+from app.models.chat_memory import ChatMemory
+
+logger = logging.getLogger(__name__)
+
+# Rough English average; close enough to keep budgets stable without a tokenizer dependency.
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+HISTORY_ROLES = ("user", "assistant")
+
+SUMMARY_PROMPT = """You maintain the memory of a conversation between a user and the RefNexus
+scheduling assistant. Merge the existing summary with the new turns into one concise summary.
+Keep facts the assistant may need later: names, dates, locations, game and referee IDs,
+preferences, decisions and open requests. Drop greetings and small talk. Plain text only."""
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def turn_tokens(turn: Dict[str, str]) -> int:
+    return estimate_tokens(turn.get("content")) + MESSAGE_OVERHEAD_TOKENS
+
+
+def sanitize_turns(history: Optional[Sequence[Dict[str, Any]]]) -> List[Dict[str, str]]:
+    """User/assistant turns with text content; tool traffic and client-made system text drop out."""
+    return [
+        {"role": turn["role"], "content": turn["content"]}
+        for turn in history or []
+        if turn.get("role") in HISTORY_ROLES and isinstance(turn.get("content"), str)
+    ]
+
+
+def split_recent(
+    turns: Sequence[Dict[str, str]], budget: int, min_turns: int
+) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+    """Split into (older, recent): the newest turns fitting `budget`, but at least `min_turns`."""
+    used = 0
+    cut = len(turns)
+    for idx in range(len(turns) - 1, -1, -1):
+        cost = turn_tokens(turns[idx])
+        if used + cost > budget and len(turns) - idx > min_turns:
+            break
+        used += cost
+        cut = idx
+    return list(turns[:cut]), list(turns[cut:])
+
+
+def get_memory(db: Session, user_id: int) -> Optional[ChatMemory]:
+    return db.query(ChatMemory).filter(ChatMemory.user_id == user_id).first()
+
+
+def history_messages(
+    memory: Optional[ChatMemory],
+    client_history: Optional[Sequence[Dict[str, Any]]] = None,
+) -> List[Dict[str, str]]:
+    """Messages to place between the system prompt and the new user message.
+
+    Stored memory wins; a client-sent history is only used (trimmed to the budget) for users
+    without one, so older clients keep working while request size stays bounded.
+    """
+    settings = get_settings()
+    if memory is None:
+        _, recent = split_recent(
+            sanitize_turns(client_history),
+            settings.AI_CHAT_HISTORY_TOKEN_BUDGET,
+            settings.AI_CHAT_HISTORY_MIN_TURNS,
+        )
+        return recent
+
+    messages: List[Dict[str, str]] = []
+    if memory.summary:
+        messages.append(
+            {"role": "system", "content": f"Summary of the earlier conversation:\n{memory.summary}"}
+        )
+    messages.extend(memory.recent_turns or [])
+    return messages
+
+
+def _fallback_summary(previous: str, turns: Sequence[Dict[str, str]], max_tokens: int) -> str:
+    """Extractive summary used when the model is unavailable: keep the newest lines that fit."""
+    lines = [previous] if previous else []
+    lines.extend(f"{turn['role']}: {turn['content']}" for turn in turns)
+    text = "\n".join(lines)
+    limit = max_tokens * CHARS_PER_TOKEN
+    return text if len(text) <= limit else text[-limit:]
+
+
+async def summarize_turns(previous: str, turns: Sequence[Dict[str, str]], max_tokens: int) -> str:
+    transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+    prompt = f"Existing summary:\n{previous or '(none)'}\n\nNew turns:\n{transcript}"
+    try:
+        response = await create_chat_completion(
+            "chat_memory",
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=max_tokens,
+            temperature=0,
+        )
+        summary = (response.choices[0].message.content or "").strip()
+        if summary:
+            return summary
+    except Exception:
+        logger.exception("Chat history summarization failed; keeping an extractive summary")
+    return _fallback_summary(previous, turns, max_tokens)
+
+
+async def record_exchange(
+    db: Session,
+    user_id: int,
+    user_message: str,
+    reply: str,
+    client_history: Optional[Sequence[Dict[str, Any]]] = None,
+) -> ChatMemory:
+    """Append one exchange and, once the verbatim turns outgrow the budget, compact them.
+
+    Compaction folds the oldest turns into the summary until the recent turns are back under
+    AI_CHAT_HISTORY_COMPACT_TO_TOKENS, so the summarization call only happens every few turns.
+    """
+    settings = get_settings()
+    memory = get_memory(db, user_id)
+    if memory is None:
+        memory = ChatMemory(
+            user_id=user_id, summary="", recent_turns=history_messages(None, client_history)
+        )
+        db.add(memory)
+
+    # Assign a new list so the JSON column is flagged as changed.
+    turns = list(memory.recent_turns or []) + [
+        {"role": "user", "content": user_message},
+        {"role": "assistant", "content": reply},
+    ]
+    if sum(turn_tokens(turn) for turn in turns) > settings.AI_CHAT_HISTORY_TOKEN_BUDGET:
+        older, turns = split_recent(
+            turns,
+            settings.AI_CHAT_HISTORY_COMPACT_TO_TOKENS,
+            settings.AI_CHAT_HISTORY_MIN_TURNS,
+        )
+        if older:
+            memory.summary = await summarize_turns(
+                memory.summary or "", older, settings.AI_CHAT_SUMMARY_MAX_TOKENS
+            )
+    memory.recent_turns = turns
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent first message created the row; this exchange is dropped from memory.
+        db.rollback()
+        return get_memory(db, user_id)
+    return memory
+
+
+async def record_exchange_detached(
+    user_id: int,
+    user_message: str,
+    reply: str,
+    client_history: Optional[Sequence[Dict[str, Any]]] = None,
+) -> None:
+    """`record_exchange` on its own session, for running after the reply has been sent."""
+    db = SessionLocal()
+    try:
+        await record_exchange(db, user_id, user_message, reply, client_history)
+    except Exception:
+        logger.exception("Recording chat exchange failed for user %s", user_id)
+    finally:
+        db.close()
+
+
+def clear_memory(db: Session, user_id: int) -> bool:
+    deleted = db.query(ChatMemory).filter(ChatMemory.user_id == user_id).delete()
+    db.commit()
+    return bool(deleted)
@@ -0,0 +1,145 @@
+"""Cache for natural-language constraint extraction."""
+
+import copy
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.core.singleflight import SingleFlight
+from app.db.session import SessionLocal
+from app.integrations.openai_client import parse_ref_request
+from app.models.parsed_query import ParsedQuery
+from app.services.constraint_rules import fast_parse_ref_request
+
+PARSE_CACHE_MAXSIZE = 5_000
+
+_memory_cache = TTLCache(maxsize=PARSE_CACHE_MAXSIZE)
+_parse_flight = SingleFlight()
+_counters = {"rule_hits": 0, "db_hits": 0, "llm_calls": 0}
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s.!?,;]+$")
+
+
+def normalize_query(text: str) -> str:
+    """Case-, width- and whitespace-insensitive form of a query used as the cache key."""
+    normalized = unicodedata.normalize("NFKC", text).lower().strip()
+    normalized = _WHITESPACE.sub(" ", normalized)
+    return _TRAILING_PUNCTUATION.sub("", normalized)
+
+
+def _is_fresh(created_at: datetime, ttl_seconds: int) -> bool:
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at + timedelta(seconds=ttl_seconds) > datetime.now(timezone.utc)
+
+
+def _persist(league_id: int, normalized: str, constraints: Dict[str, Any]) -> None:
+    # Own session: committing or rolling back the caller's would take their pending
+    # changes with it.
+    db = SessionLocal()
+    try:
+        row = (
+            db.query(ParsedQuery)
+            .filter(ParsedQuery.league_id == league_id, ParsedQuery.normalized_query == normalized)
+            .first()
+        )
+        if row:
+            row.constraints = constraints
+            row.created_at = datetime.now(timezone.utc)
+        else:
+            db.add(
+                ParsedQuery(
+                    league_id=league_id, normalized_query=normalized, constraints=constraints
+                )
+            )
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker stored the same query first; its row is just as good.
+            db.rollback()
+    finally:
+        db.close()
+
+
+def cached_parse_ref_request(
+    user_query: str, league_id: int, db: Optional[Session] = None
+) -> Dict[str, Any]:
+    """`parse_ref_request` behind a rule-based fast path, an in-memory LRU/TTL cache and an
+    optional DB table.
+
+    Queries the rule grammar fully understands never reach the caches or the LLM. Cache
+    keys are (league_id, normalized query). Empty extractions are not cached so a
+    transient LLM failure is retried on the next request.
+    """
+    if not user_query:
+        return {}
+
+    settings = get_settings()
+    fast = fast_parse_ref_request(user_query, settings.PARSE_RULES_MIN_CONFIDENCE)
+    if fast is not None:
+        _counters["rule_hits"] += 1
+        return fast
+
+    normalized = normalize_query(user_query)
+    key = (league_id, normalized)
+
+    cached = _memory_cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    # Concurrent requests for the same normalized query wait for one lookup/LLM call.
+    constraints = _parse_flight.do(
+        key, lambda: _load_or_parse(user_query, league_id, normalized, db)
+    )
+    return copy.deepcopy(constraints)
+
+
+def _load_or_parse(
+    user_query: str, league_id: int, normalized: str, db: Optional[Session]
+) -> Dict[str, Any]:
+    settings = get_settings()
+    key = (league_id, normalized)
+    persist = settings.PARSE_CACHE_PERSIST and db is not None
+    if persist:
+        # A cache lookup should not flush the caller's pending changes either.
+        with db.no_autoflush:
+            row = (
+                db.query(ParsedQuery)
+                .filter(
+                    ParsedQuery.league_id == league_id,
+                    ParsedQuery.normalized_query == normalized,
+                )
+                .first()
+            )
+        if row and _is_fresh(row.created_at, settings.PARSE_CACHE_TTL_SECONDS):
+            _counters["db_hits"] += 1
+            _memory_cache.set(key, row.constraints, ttl=settings.PARSE_CACHE_TTL_SECONDS)
+            return row.constraints
+
+    _counters["llm_calls"] += 1
+    constraints = parse_ref_request(user_query, league_id)
+    if constraints:
+        _memory_cache.set(key, constraints, ttl=settings.PARSE_CACHE_TTL_SECONDS)
+        if persist:
+            _persist(league_id, normalized, constraints)
+    return constraints
+
+
+def parse_cache_stats() -> Dict[str, int]:
+    memory = _memory_cache.stats()
+    return {
+        "rule_hits": _counters["rule_hits"],
+        "memory_hits": memory["hits"],
+        "memory_misses": memory["misses"],
+        "db_hits": _counters["db_hits"],
+        "llm_calls": _counters["llm_calls"],
+        "coalesced": _parse_flight.coalesced,
+        "size": memory["size"],
+    }
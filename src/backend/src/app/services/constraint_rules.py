@@ -0,0 +1,204 @@
+"""Deterministic fast-path parser for simple referee search queries.
+
+Produces the same constraint dict as `parse_ref_request` for queries made only of patterns
+a grammar can read exactly (distances, rating floors, age groups, competition levels, roles,
+ISO dates and coordinates). Anything else lowers the confidence so the caller falls back to
+the LLM.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import regex
+
+from app.services.ranking_service import CERT_LEVELS
+
+KM_PER_MILE = 1.609344
+
+# Words that carry no constraint of their own in a referee request.
+FILLER_WORDS = frozenset(
+    """
+    a an the and or of for with to at on in by from who that is are be can could will would
+    i we me us my our need needs needed want wants looking look find get give show please
+    ref refs referee referees official officials someone somebody anyone person people
+    game games match matches fixture fixtures available availability qualified certified
+    level league division competition
+    """.split()
+)
+
+_WORD = regex.compile(r"[\p{L}\p{N}]+")
+
+_COORDINATES = regex.compile(
+    r"(?:near|around|at|by)?\s*\(?(?P<lat>-?\d{1,2}\.\d+)\s*,\s*(?P<lon>-?\d{1,3}\.\d+)\)?"
+)
+_DISTANCE = regex.compile(
+    r"""
+    (?:(?:within|under|less\s+than|no\s+more\s+than|max(?:imum)?|up\s+to|at\s+most)\s+)?
+    (?P<value>\d+(?:\.\d+)?)\s*
+    (?P<unit>kms?|kilomet(?:er|re)s?|mi|miles?)\b
+    (?:\s+(?:radius|away|drive|travel))?
+    """,
+    regex.VERBOSE,
+)
+_RATING = regex.compile(
+    r"""
+    (?:
+        (?:rated|rating(?:\s+of)?|min(?:imum)?\s+rating(?:\s+of)?|at\s+least)\s+
+        (?P<value>[0-5](?:\.\d+)?)
+        (?:\s*(?:\+|stars?|/\s*5))?
+    |
+        (?P<value>[0-5](?:\.\d+)?)\s*\+?\s*(?:stars?|rated|rating)
+    )
+    (?:\s+(?:or\s+(?:higher|better|above|more)|and\s+up|minimum|min|plus))?
+    """,
+    regex.VERBOSE,
+)
+_AGE_GROUP = regex.compile(r"\b(?:u|under)[\s-]?(?P<age>\d{1,2})s?\b|\b(?P<adult>adults?)\b")
+_LEVEL = regex.compile(
+    r"\b(?P<level>recreational|rec|travel|premier|semi[\s-]?pro(?:fessional)?|professional|pro)\b"
+)
+_ROLE = regex.compile(
+    r"""
+    \b(?:
+        (?P<center>cent(?:er|re)(?:\s+(?:ref(?:eree)?|official))?)
+    |
+        (?P<ar>ars?|assistant(?:\s+ref(?:eree)?s?)?|lines(?:man|men|person))
+    )\b
+    """,
+    regex.VERBOSE,
+)
+_KICKOFF = regex.compile(
+    r"""
+    \b(?P<date>\d{4}-\d{2}-\d{2})
+    (?:(?:\s+at\s+|\s*t|\s+)(?P<time>\d{1,2}(?::\d{2})?\s*(?:am|pm)|\d{1,2}:\d{2}))?
+    \b
+    """,
+    regex.VERBOSE,
+)
+
+LEVEL_ALIASES = {
+    "rec": "recreational",
+    "recreational": "recreational",
+    "travel": "travel",
+    "premier": "premier",
+    "pro": "professional",
+    "professional": "professional",
+}
+
+
+class _Unparseable(Exception):
+    """A pattern matched but its value cannot be trusted (out of range, invalid date)."""
+
+
+@dataclass
+class RuleParse:
+    constraints: Dict[str, Any]
+    confidence: float
+    unknown_words: List[str] = field(default_factory=list)
+
+
+def _coordinates(m: "regex.Match[str]") -> Tuple[str, Any]:
+    lat, lon = float(m["lat"]), float(m["lon"])
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise _Unparseable
+    return "location", {"lat": lat, "lon": lon}
+
+
+def _distance(m: "regex.Match[str]") -> Tuple[str, Any]:
+    value = float(m["value"])
+    if m["unit"].startswith("mi"):
+        value = round(value * KM_PER_MILE, 1)
+    return "max_distance_km", value
+
+
+def _rating(m: "regex.Match[str]") -> Tuple[str, Any]:
+    value = float(m["value"])
+    if value > 5:
+        raise _Unparseable
+    return "min_rating", value
+
+
+def _age_group(m: "regex.Match[str]") -> Tuple[str, Any]:
+    label = "Adult" if m["adult"] else f"U{int(m['age'])}"
+    if label not in CERT_LEVELS:
+        raise _Unparseable
+    return "age_group", label
+
+
+def _level(m: "regex.Match[str]") -> Tuple[str, Any]:
+    word = regex.sub(r"[\s-]", "", m["level"])
+    return "competition_level", "semi-pro" if word.startswith("semi") else LEVEL_ALIASES[word]
+
+
+def _role(m: "regex.Match[str]") -> Tuple[str, Any]:
+    return "role", "center" if m["center"] else "ar"
+
+
+def _kickoff(m: "regex.Match[str]") -> Tuple[str, Any]:
+    try:
+        day = datetime.strptime(m["date"], "%Y-%m-%d")
+    except ValueError:
+        raise _Unparseable
+    if not m["time"]:
+        return "kickoff", day.date().isoformat()
+    raw = regex.sub(r"\s+", "", m["time"])
+    for fmt in ("%H:%M", "%I:%M%p", "%I%p"):
+        try:
+            clock = datetime.strptime(raw, fmt)
+            break
+        except ValueError:
+            continue
+    else:
+        raise _Unparseable
+    return "kickoff", day.replace(hour=clock.hour, minute=clock.minute).isoformat()
+
+
+# Order matters: each rule blanks out what it consumed, so coordinates and dates are read
+# before their digits could be mistaken for distances or ratings.
+RULES: List[Tuple["regex.Pattern[str]", Callable[["regex.Match[str]"], Tuple[str, Any]]]] = [
+    (_COORDINATES, _coordinates),
+    (_KICKOFF, _kickoff),
+    (_DISTANCE, _distance),
+    (_RATING, _rating),
+    (_AGE_GROUP, _age_group),
+    (_LEVEL, _level),
+    (_ROLE, _role),
+]
+
+
+def parse_with_rules(user_query: str) -> RuleParse:
+    """Parse `user_query` with the rule grammar.
+
+    Confidence is the share of meaningful words the grammar understood; it is 0 when
+    nothing was extracted, a value was out of range, or two rules disagree on one key.
+    """
+    text = user_query.lower()
+    constraints: Dict[str, Any] = {}
+    for pattern, extract in RULES:
+        for m in pattern.finditer(text):
+            try:
+                key, value = extract(m)
+            except _Unparseable:
+                return RuleParse({}, 0.0, [m.group(0).strip()])
+            if constraints.get(key, value) != value:
+                return RuleParse({}, 0.0, [m.group(0).strip()])
+            constraints[key] = value
+        text = pattern.sub(lambda m: " " * len(m.group(0)), text)
+
+    words = _WORD.findall(text)
+    unknown = [w for w in words if w not in FILLER_WORDS]
+    if not constraints:
+        return RuleParse({}, 0.0, unknown)
+    understood = len(constraints) + len(words) - len(unknown)
+    return RuleParse(constraints, understood / (understood + len(unknown)), unknown)
+
+
+def fast_parse_ref_request(user_query: str, min_confidence: float) -> Optional[Dict[str, Any]]:
+    """Constraints from the rule grammar, or None when the LLM should handle the query."""
+    if not user_query:
+        return None
+    result = parse_with_rules(user_query)
+    if result.constraints and result.confidence >= min_confidence:
+        return result.constraints
+    return None
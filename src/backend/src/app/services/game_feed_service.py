@@ -0,0 +1,173 @@
+"""Personalized open-game feed for referees."""
+
+import base64
+import json
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.cache import TTLCache
+from app.models.assignment import Assignment
+from app.models.availability import AvailabilitySlot
+from app.models.field_location import FieldLocation
+from app.models.game import Game
+from app.models.referee import RefereeProfile
+from app.services.batch_assignment_service import GAME_DURATION, KM_PER_DEGREE_LAT
+from app.services.ranking_service import (
+    ACTIVE_ASSIGNMENT_STATUSES,
+    DEFAULT_DISTANCE_KM,
+    cert_rank,
+    required_cert_rank,
+)
+from app.services.referee_service import haversine_km
+
+FEED_CACHE_TTL_SECONDS = 120
+FEED_PAGE_SIZE = 20
+
+# Per-referee ranked feed: a list of (sort key, distance_km) built once and paged from.
+_feed_cache = TTLCache(maxsize=5_000, ttl=FEED_CACHE_TTL_SECONDS)
+
+FeedKey = Tuple[float, float, int]
+
+
+@dataclass
+class FeedEntry:
+    game: Game
+    distance_km: Optional[float]
+
+
+def _encode_cursor(key: FeedKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> FeedKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        distance, start, game_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(distance), float(start), int(game_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _build_feed(db: Session, ref: RefereeProfile, now: datetime) -> List[Tuple[FeedKey, float]]:
+    """Every open upcoming game that fits the referee, sorted by distance then kickoff.
+
+    Fit means: within the referee's travel radius (when both sides have coordinates),
+    no certification shortfall, inside one of their availability slots (when they have
+    any), and not already assigned to them.
+    """
+    has_coords = ref.latitude is not None and ref.longitude is not None
+    radius = float(ref.travel_radius_km or DEFAULT_DISTANCE_KM)
+
+    query = (
+        db.query(
+            Game.id,
+            Game.scheduled_start,
+            Game.age_group,
+            Game.competition_level,
+            FieldLocation.latitude,
+            FieldLocation.longitude,
+        )
+        .join(FieldLocation, FieldLocation.id == Game.field_location_id)
+        .filter(Game.status == "open", Game.scheduled_start >= now)
+    )
+    if has_coords:
+        lat_delta = radius / KM_PER_DEGREE_LAT
+        lon_delta = radius / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(ref.latitude)), 0.01))
+        query = query.filter(
+            FieldLocation.latitude.between(ref.latitude - lat_delta, ref.latitude + lat_delta),
+            FieldLocation.longitude.between(ref.longitude - lon_delta, ref.longitude + lon_delta),
+        )
+
+    assigned = {
+        game_id
+        for (game_id,) in db.query(Assignment.game_id).filter(
+            Assignment.referee_id == ref.id,
+            Assignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+        )
+    }
+    slots = [
+        (_as_utc(start), _as_utc(end))
+        for start, end in db.query(AvailabilitySlot.start_time, AvailabilitySlot.end_time).filter(
+            AvailabilitySlot.referee_id == ref.id, AvailabilitySlot.end_time >= now
+        )
+    ]
+    ref_rank = cert_rank(ref.cert_level)
+
+    feed: List[Tuple[FeedKey, float]] = []
+    for game_id, start, age_group, level, lat, lon in query:
+        if game_id in assigned:
+            continue
+        start = _as_utc(start)
+        if slots and not any(s <= start and start + GAME_DURATION <= e for s, e in slots):
+            continue
+        required = required_cert_rank({"age_group": age_group, "competition_level": level})
+        if ref_rank is not None and required is not None and ref_rank < required:
+            continue
+        distance = math.inf
+        if has_coords:
+            distance = haversine_km(ref.latitude, ref.longitude, lat, lon)
+            if distance > radius:
+                continue
+        feed.append(((distance, start.timestamp(), game_id), distance))
+    feed.sort(key=lambda item: item[0])
+    return feed
+
+
+def get_referee_feed(
+    db: Session,
+    ref: RefereeProfile,
+    limit: int = FEED_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    max_distance_km: Optional[float] = None,
+) -> Tuple[List[FeedEntry], Optional[str]]:
+    """One page of the referee's feed and the cursor for the next page (None at the end).
+
+    The ranked list is cached per referee; pages load their games (with field locations)
+    in a single query.
+    """
+    feed = _feed_cache.get(ref.id)
+    if feed is None:
+        feed = _build_feed(db, ref, datetime.now(timezone.utc))
+        _feed_cache.set(ref.id, feed)
+
+    if max_distance_km is not None:
+        # Distance is the leading sort key, so this keeps a prefix of the ranking.
+        feed = [item for item in feed if item[1] <= max_distance_km]
+    start = bisect_right(feed, (_decode_cursor(cursor), math.inf)) if cursor else 0
+    page = feed[start : start + limit]
+
+    games = {}
+    if page:
+        games = {
+            g.id: g
+            for g in db.query(Game)
+            .options(joinedload(Game.field_location))
+            .filter(Game.id.in_([key[2] for key, _ in page]))
+            .all()
+        }
+    entries = [
+        FeedEntry(games[key[2]], None if math.isinf(distance) else round(distance, 2))
+        for key, distance in page
+        if key[2] in games
+    ]
+
+    next_cursor = _encode_cursor(page[-1][0]) if start + limit < len(feed) else None
+    return entries, next_cursor
+
+
+def invalidate_referee_feed(ref_id: int) -> None:
+    _feed_cache.delete(ref_id)
+
+
+def invalidate_game_feeds() -> None:
+    """Games changed (created, edited, assigned): every cached feed may be stale."""
+    _feed_cache.clear()
@@ -1,14 +1,19 @@
 """Game and assignment business logic."""
 
-from datetime import datetime, timezone
-from typing import List, Optional
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from sqlalchemy.orm import Query, Session, contains_eager
 
 from app.models.assignment import Assignment
+from app.models.field_location import FieldLocation
 from app.models.game import Game
 from app.models.league import League
+from app.services.game_feed_service import invalidate_game_feeds, invalidate_referee_feed
+from app.services.recommendation_service import mark_game_changed, mark_referee_changed
+from app.services.referee_service import bounding_box, sql_distance_km
 
 
 def create_game(db: Session, league: League, data: dict) -> Game:
@@ -16,14 +21,96 @@ def create_game(db: Session, league: League, data: dict) -> Game:
     db.add(game)
     db.commit()
     db.refresh(game)
+    invalidate_game_feeds()
+    mark_game_changed(game.id)
     return game
 
 
-def list_games(db: Session, league: League, status_filter: Optional[str] = None) -> List[Game]:
-    query = db.query(Game).filter(Game.league_id == league.id)
+def search_games_query(
+    db: Session,
+    league_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    location: Optional[str] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    radius_km: Optional[float] = None,
+) -> Query:
+    """Games matching the filters, soonest first, with their field locations loaded.
+
+    Shared by `/games` and the chat `search_games` tool. Each filter has an index behind
+    it: (league_id, scheduled_start) and (status, scheduled_start) for game columns,
+    trigram indexes for the location text match, and the field coordinate index for the
+    radius bounding box, with the exact distance checked on what the box lets through.
+    `date_to` is inclusive.
+    """
+    query = (
+        db.query(Game)
+        .join(Game.field_location)
+        .options(contains_eager(Game.field_location))
+    )
+    if league_id is not None:
+        query = query.filter(Game.league_id == league_id)
     if status_filter:
         query = query.filter(Game.status == status_filter)
-    return query.order_by(Game.scheduled_start.asc()).all()
+    if date_from:
+        query = query.filter(
+            Game.scheduled_start >= datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+        )
+    if date_to:
+        end = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        query = query.filter(Game.scheduled_start < end)
+    if location and location.strip():
+        like = f"%{location.strip()}%"
+        query = query.filter(
+            or_(FieldLocation.name.ilike(like), FieldLocation.address.ilike(like))
+        )
+    if radius_km is not None or lat is not None or lon is not None:
+        if radius_km is None or lat is None or lon is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Radius search requires lat, lon and radius_km",
+            )
+        lat_span, lon_span = bounding_box(lat, lon, radius_km)
+        query = query.filter(
+            FieldLocation.latitude.between(lat - lat_span, lat + lat_span),
+            FieldLocation.longitude.between(lon - lon_span, lon + lon_span),
+            sql_distance_km(FieldLocation.latitude, FieldLocation.longitude, lat, lon)
+            <= radius_km,
+        )
+    return query.order_by(Game.scheduled_start.asc(), Game.id.asc())
+
+
+def list_games(
+    db: Session,
+    league: League,
+    status_filter: Optional[str] = None,
+    limit: Optional[int] = None,
+    **filters,
+) -> List[Game]:
+    return _league_games_query(db, league, status_filter, limit, **filters).all()
+
+
+def list_game_versions(
+    db: Session,
+    league: League,
+    status_filter: Optional[str] = None,
+    limit: Optional[int] = None,
+    **filters,
+) -> List[Tuple[int, datetime]]:
+    """(id, updated_at) of the games `list_games` returns, without loading the rows."""
+    query = _league_games_query(db, league, status_filter, limit, **filters)
+    return [tuple(row) for row in query.with_entities(Game.id, Game.updated_at)]
+
+
+def _league_games_query(
+    db: Session, league: League, status_filter: Optional[str], limit: Optional[int], **filters
+) -> Query:
+    query = search_games_query(db, league_id=league.id, status_filter=status_filter, **filters)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
 
 
 def get_game(db: Session, game_id: int, league: League) -> Game:
@@ -38,6 +125,8 @@ def update_game(db: Session, game: Game, data: dict) -> Game:
         setattr(game, key, value)
     db.commit()
     db.refresh(game)
+    invalidate_game_feeds()
+    mark_game_changed(game.id)
     return game
 
 
@@ -48,6 +137,9 @@ def request_assignment(
     db.add(assignment)
     db.commit()
     db.refresh(assignment)
+    invalidate_referee_feed(referee_id)
+    mark_game_changed(game.id)
+    mark_referee_changed(referee_id)
     return assignment
 
 
@@ -0,0 +1,141 @@
+"""Content-addressed storage for uploaded profile images.
+
+The upload route refuses bodies whose Content-Length exceeds the cap before reading them.
+The multipart parser then spools the image, and `store_image` copies it to a temporary file
+in chunks, capped at PROFILE_IMAGE_MAX_BYTES and hashed on the way. The file is named after
+its SHA-256 digest, so identical images are stored once and a URL's content never changes.
+Files no user references any more are removed by `collect_unreferenced_images`, which the
+app runs every IMAGE_GC_INTERVAL_SECONDS.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+UPLOADS_DIR = Path(__file__).resolve().parent.parent.parent / "uploads"
+UPLOADS_URL_PREFIX = "/uploads/"
+# Partial uploads live here until complete; the GC clears ones left behind by crashes.
+_TMP_DIR = UPLOADS_DIR / ".tmp"
+CHUNK_SIZE = 64 * 1024
+
+# File signatures of the accepted formats; the extension comes from the content, not the
+# client-supplied name or content type.
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+
+def _image_extension(head: bytes) -> str:
+    for signature, extension in _SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Unsupported image type; use PNG, JPEG, GIF or WebP",
+    )
+
+
+def store_image(source: BinaryIO) -> str:
+    """Save an uploaded image and return its URL path (/uploads/<sha256>.<ext>)."""
+    max_bytes = get_settings().PROFILE_IMAGE_MAX_BYTES
+    _TMP_DIR.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    fd, tmp_name = tempfile.mkstemp(dir=_TMP_DIR)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := source.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Image larger than {max_bytes // (1024 * 1024)} MB",
+                    )
+                if len(head) < 16:
+                    head += chunk[: 16 - len(head)]
+                digest.update(chunk)
+                out.write(chunk)
+        name = digest.hexdigest() + _image_extension(head)
+        target = UPLOADS_DIR / name
+        if target.exists():
+            # Already stored; refresh its age so a pending GC pass leaves it alone.
+            os.utime(target)
+        else:
+            os.replace(tmp_name, target)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+    return UPLOADS_URL_PREFIX + name
+
+
+def collect_unreferenced_images(db: Session, grace_seconds: float) -> Dict[str, int]:
+    """Delete stored files that no user's profile_image_url points to.
+
+    Files younger than `grace_seconds` are kept: an upload is written before the user row
+    referencing it is committed.
+    """
+    referenced = {
+        url[len(UPLOADS_URL_PREFIX) :]
+        for (url,) in db.query(User.profile_image_url).filter(
+            User.profile_image_url.like(UPLOADS_URL_PREFIX + "%")
+        )
+    }
+    db.close()
+    cutoff = time.time() - grace_seconds
+    removed = kept = 0
+    for directory in (UPLOADS_DIR, _TMP_DIR):
+        if not directory.is_dir():
+            continue
+        for path in directory.iterdir():
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            if (directory == _TMP_DIR or path.name not in referenced) and (
+                path.stat().st_mtime < cutoff
+            ):
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                kept += 1
+    return {"removed": removed, "kept": kept}
+
+
+def run_image_gc() -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        return collect_unreferenced_images(db, get_settings().IMAGE_GC_GRACE_SECONDS)
+    finally:
+        db.close()
+
+
+async def image_gc_worker() -> None:
+    """Remove unreferenced images every IMAGE_GC_INTERVAL_SECONDS until cancelled."""
+    interval = get_settings().IMAGE_GC_INTERVAL_SECONDS
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = await run_in_threadpool(run_image_gc)
+            if result["removed"]:
+                logger.info("Removed %d unreferenced images", result["removed"])
+        except Exception:
+            logger.exception("Image garbage collection failed")
@@ -9,13 +9,15 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from openai import OpenAI
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
+from app.integrations.openai_client import LLMUnavailableError, create_chat_completion, run_sync
 from app.models.field_location import FieldLocation
 from app.models.game import Game
 from app.models.league import League
+from app.services.game_feed_service import invalidate_game_feeds
+from app.services.recommendation_service import request_full_refresh
 
 
 @dataclass
@@ -52,7 +54,7 @@ def ingest_games_from_file(
         normalized_rows = _normalize_rows(rows, warnings)
 
     if use_llm and _should_use_llm(normalized_rows, raw_text):
-        llm_rows = _extract_with_llm(raw_text or _rows_to_text(rows))
+        llm_rows = _extract_with_llm(raw_text or _rows_to_text(rows), league.id)
         if llm_rows:
             normalized_rows = _normalize_rows(llm_rows, warnings)
 
@@ -107,6 +109,9 @@ def ingest_games_from_file(
             skipped_rows += 1
 
     db.commit()
+    if created_games:
+        invalidate_game_feeds()
+        request_full_refresh()
 
     return IngestionResult(
         created_games=created_games,
@@ -288,13 +293,18 @@ def _rows_to_text(rows: Iterable[Dict[str, Any]]) -> str:
     return json.dumps(list(rows), ensure_ascii=False)
 
 
-def _extract_with_llm(text: str) -> List[Dict[str, Any]]:
+def _extract_with_llm(text: str, league_id: Optional[int] = None) -> List[Dict[str, Any]]:
     settings = get_settings()
-    if not settings.OPENAI_API_KEY:
+    if not (settings.OPENAI_API_KEY or settings.OPENAI_BASE_URL or settings.OPENAI_USE_FAKE):
+        return []
+    try:
+        return run_sync(_aextract_with_llm, text, league_id)
+    except LLMUnavailableError:
+        # Keep whatever the structured parser produced.
         return []
 
-    client = OpenAI(api_key=settings.OPENAI_API_KEY or None)
 
+async def _aextract_with_llm(text: str, league_id: Optional[int] = None) -> List[Dict[str, Any]]:
     system_prompt = (
         "You are an assistant that extracts structured game schedule data. "
         "Return a JSON array of objects with keys: scheduled_start, field_name, "
@@ -303,7 +313,9 @@ def _extract_with_llm(text: str) -> List[Dict[str, Any]]:
         "Use ISO8601 for scheduled_start when possible."
     )
 
-    response = client.chat.completions.create(
+    response = await create_chat_completion(
+        "ingestion",
+        league_id,
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": system_prompt},
@@ -2,6 +2,7 @@
 
 from sqlalchemy.orm import Session
 
+from app.core.auth_context import invalidate_auth_context
 from app.models.league import League
 
 
@@ -10,4 +11,5 @@ def update_league(db: Session, league: League, data: dict) -> League:
         setattr(league, key, value)
     db.commit()
     db.refresh(league)
+    invalidate_auth_context(league.user_id)
     return league
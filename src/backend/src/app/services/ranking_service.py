@@ -0,0 +1,242 @@
+"""Multi-factor referee scoring and top-k selection."""
+
+import heapq
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.game import Game
+from app.models.league import League
+from app.models.rating import Rating
+from app.models.referee import RefereeProfile
+from app.services.referee_service import haversine_km
+
+# Ordered from least to most qualified; matches the options offered at registration.
+CERT_LEVELS = ["U8", "U10", "U12", "U14", "U16", "U18", "Adult", "Advanced"]
+
+# The profile form saves referee grades instead (Grade 9 is the entry grade); they are
+# placed on the same scale, with National and FIFA above everything registration offers.
+GRADE_CERT_RANKS = {
+    "grade 9": 1,
+    "grade 8": 3,
+    "grade 7": 5,
+    "grade 6": 6,
+    "grade 5": 6,
+    "grade 4": 7,
+    "national": 8,
+    "fifa": 9,
+}
+CERT_RANKS: Dict[str, int] = {
+    **{level.lower(): rank for rank, level in enumerate(CERT_LEVELS)},
+    **GRADE_CERT_RANKS,
+}
+TOP_CERT_RANK = max(CERT_RANKS.values())
+
+# Minimum certification expected for each competition level offered in the game form.
+COMPETITION_LEVEL_MIN_CERT = {
+    "recreational": "U8",
+    "travel": "U14",
+    "premier": "U16",
+    "semi-pro": "Adult",
+    "professional": "Advanced",
+}
+
+FEATURES = ("rating", "distance", "experience", "certification", "workload")
+
+DEFAULT_TOP_K = 5
+DEFAULT_DISTANCE_KM = 50.0
+EXPERIENCE_CAP_YEARS = 10
+# Extra score for profile text (bio, positions) matching the request's wording.
+TEXT_MATCH_WEIGHT = 0.2
+NEUTRAL_SCORE = 0.5
+ACTIVE_ASSIGNMENT_STATUSES = ("requested", "accepted", "confirmed")
+
+
+@dataclass(frozen=True)
+class WeightProfile:
+    """Relative weight of each normalized feature in the final score."""
+
+    rating: float = 0.35
+    distance: float = 0.25
+    experience: float = 0.15
+    certification: float = 0.15
+    workload: float = 0.10
+
+
+# Profiles are keyed by `League.level`; unknown levels fall back to "default".
+WEIGHT_PROFILES: Dict[str, WeightProfile] = {
+    "default": WeightProfile(),
+    "recreational": WeightProfile(
+        rating=0.25, distance=0.40, experience=0.10, certification=0.10, workload=0.15
+    ),
+    "competitive": WeightProfile(
+        rating=0.35, distance=0.20, experience=0.15, certification=0.20, workload=0.10
+    ),
+    "elite": WeightProfile(
+        rating=0.40, distance=0.10, experience=0.20, certification=0.25, workload=0.05
+    ),
+}
+
+# Per-league overrides take precedence over the level-based profiles.
+LEAGUE_WEIGHT_OVERRIDES: Dict[int, WeightProfile] = {}
+
+
+class CandidateFeatures(NamedTuple):
+    """Per-referee feature vector, every feature normalized to [0, 1]."""
+
+    referee_id: int
+    rating: float
+    distance: float
+    experience: float
+    certification: float
+    workload: float
+
+
+@dataclass
+class RankedCandidate:
+    referee_id: int
+    score: float
+    breakdown: Dict[str, float]
+
+
+def weight_profile_for_league(league: Optional[League]) -> WeightProfile:
+    if league is None:
+        return WEIGHT_PROFILES["default"]
+    if league.id in LEAGUE_WEIGHT_OVERRIDES:
+        return LEAGUE_WEIGHT_OVERRIDES[league.id]
+    level = (league.level or "").strip().lower()
+    return WEIGHT_PROFILES.get(level, WEIGHT_PROFILES["default"])
+
+
+def cert_rank(value: Optional[str]) -> Optional[int]:
+    """Rank of a certification, grade or age group on the CERT_RANKS scale, or None."""
+    if not value:
+        return None
+    return CERT_RANKS.get(" ".join(value.lower().split()))
+
+
+def required_cert_rank(constraints: Mapping[str, object]) -> Optional[int]:
+    """Highest certification implied by the parsed age group and competition level."""
+    ranks = [cert_rank(constraints.get("age_group"))]
+    level = str(constraints.get("competition_level") or "").strip().lower()
+    ranks.append(cert_rank(COMPETITION_LEVEL_MIN_CERT.get(level)))
+    known = [r for r in ranks if r is not None]
+    return max(known) if known else None
+
+
+def load_rating_map(db: Session) -> Dict[int, float]:
+    return {
+        ref_id: float(avg)
+        for ref_id, avg in (
+            db.query(Rating.referee_id, func.avg(Rating.score)).group_by(Rating.referee_id).all()
+        )
+        if avg is not None
+    }
+
+
+def load_workload_map(db: Session, now: Optional[datetime] = None) -> Dict[int, int]:
+    """Count of upcoming, still-active assignments per referee."""
+    now = now or datetime.now(timezone.utc)
+    return dict(
+        db.query(Assignment.referee_id, func.count(Assignment.id))
+        .join(Game, Game.id == Assignment.game_id)
+        .filter(
+            Game.scheduled_start >= now,
+            Assignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+        )
+        .group_by(Assignment.referee_id)
+        .all()
+    )
+
+
+def build_features(
+    refs: Iterable[RefereeProfile],
+    constraints: Mapping[str, object],
+    rating_map: Mapping[int, float],
+    workload_map: Mapping[int, int],
+) -> List[CandidateFeatures]:
+    location = constraints.get("location") or {}
+    lat = location.get("lat")
+    lon = location.get("lon")
+    max_distance = constraints.get("max_distance_km")
+    required = required_cert_rank(constraints)
+
+    features: List[CandidateFeatures] = []
+    for ref in refs:
+        avg = rating_map.get(ref.id)
+        rating = avg / 5.0 if avg is not None else NEUTRAL_SCORE
+
+        if lat is None or lon is None or ref.latitude is None or ref.longitude is None:
+            distance = NEUTRAL_SCORE
+        else:
+            limit = float(max_distance or ref.travel_radius_km or DEFAULT_DISTANCE_KM)
+            km = haversine_km(lat, lon, ref.latitude, ref.longitude)
+            distance = max(0.0, 1.0 - km / limit) if limit > 0 else 0.0
+
+        years = ref.years_experience or 0
+        experience = min(years, EXPERIENCE_CAP_YEARS) / EXPERIENCE_CAP_YEARS
+
+        rank = cert_rank(ref.cert_level)
+        if rank is None:
+            certification = NEUTRAL_SCORE
+        elif required is None:
+            certification = rank / TOP_CERT_RANK
+        elif rank >= required:
+            certification = 1.0
+        else:
+            # Each level short of the requirement costs a quarter of the feature.
+            certification = max(0.0, 1.0 - 0.25 * (required - rank))
+
+        workload = 1.0 / (1 + workload_map.get(ref.id, 0))
+
+        features.append(
+            CandidateFeatures(ref.id, rating, distance, experience, certification, workload)
+        )
+    return features
+
+
+def top_k(
+    candidates: Iterable[CandidateFeatures],
+    weights: WeightProfile,
+    k: int = DEFAULT_TOP_K,
+    text_scores: Optional[Mapping[int, float]] = None,
+) -> List[RankedCandidate]:
+    """Select the k highest-scoring candidates with a bounded heap instead of a full sort.
+
+    `text_scores` (referee id -> profile-text relevance in [0, 1]) adds up to
+    TEXT_MATCH_WEIGHT on top of the weighted features.
+    """
+    wr, wd, we, wc, ww = (
+        weights.rating,
+        weights.distance,
+        weights.experience,
+        weights.certification,
+        weights.workload,
+    )
+    text = text_scores or {}
+    wt = TEXT_MATCH_WEIGHT if text else 0.0
+    best = heapq.nlargest(
+        k,
+        candidates,
+        key=lambda c: wr * c[1] + wd * c[2] + we * c[3] + wc * c[4] + ww * c[5]
+        + wt * text.get(c[0], 0.0),
+    )
+
+    weight_map = asdict(weights)
+    ranked: List[RankedCandidate] = []
+    for c in best:
+        breakdown = {name: round(weight_map[name] * getattr(c, name), 4) for name in FEATURES}
+        if text:
+            breakdown["text_match"] = round(wt * text.get(c.referee_id, 0.0), 4)
+        ranked.append(
+            RankedCandidate(
+                referee_id=c.referee_id,
+                score=round(sum(breakdown.values()), 4),
+                breakdown=breakdown,
+            )
+        )
+    return ranked
@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from app.models.league import League
 from app.models.note import RefNote
 from app.models.rating import Rating
+from app.services.recommendation_service import mark_referee_changed
+from app.services.referee_service import invalidate_referee_stats
 
 
 def create_rating(db: Session, league: League, data: dict) -> Rating:
@@ -12,6 +14,8 @@ def create_rating(db: Session, league: League, data: dict) -> Rating:
     db.add(rating)
     db.commit()
     db.refresh(rating)
+    invalidate_referee_stats(rating.referee_id)
+    mark_referee_changed(rating.referee_id)
     return rating
 
 
@@ -20,4 +24,5 @@ def create_note(db: Session, league: League, data: dict) -> RefNote:
     db.add(note)
     db.commit()
     db.refresh(note)
+    invalidate_referee_stats(note.referee_id)
     return note
@@ -0,0 +1,237 @@
+"""Precomputed top-k referee recommendations for upcoming open games.
+
+A background loop keeps one `GameRecommendation` row per open game. Changes are
+reported through `mark_game_changed` / `mark_referee_changed`; each cycle recomputes
+only the games they can affect, and a periodic full pass catches anything else (time
+passing, changes made by other processes).
+"""
+
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.models.game import Game
+from app.models.game_recommendation import GameRecommendation
+from app.services.batch_assignment_service import (
+    GameSlot,
+    RefereeSnapshot,
+    load_referee_snapshots,
+    slot_cost,
+)
+from app.services.ranking_service import required_cert_rank, weight_profile_for_league
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_dirty_games: Set[int] = set()
+_dirty_refs: Set[int] = set()
+_full_refresh_due = True
+_last_full_refresh = 0.0
+
+
+def mark_game_changed(game_id: int) -> None:
+    with _lock:
+        _dirty_games.add(game_id)
+
+
+def mark_referee_changed(referee_id: int) -> None:
+    """A referee's rating, availability, profile or workload changed."""
+    with _lock:
+        _dirty_refs.add(referee_id)
+
+
+def request_full_refresh() -> None:
+    global _full_refresh_due
+    with _lock:
+        _full_refresh_due = True
+
+
+def _take_dirty() -> Tuple[Set[int], Set[int], bool]:
+    global _full_refresh_due
+    with _lock:
+        games, refs, full = set(_dirty_games), set(_dirty_refs), _full_refresh_due
+        _dirty_games.clear()
+        _dirty_refs.clear()
+        _full_refresh_due = False
+    return games, refs, full
+
+
+def _center_slot(game: Game) -> GameSlot:
+    return GameSlot(
+        game_id=game.id,
+        role="center",
+        start=game.scheduled_start,
+        latitude=game.field_location.latitude,
+        longitude=game.field_location.longitude,
+        required_rank=required_cert_rank(
+            {"age_group": game.age_group, "competition_level": game.competition_level}
+        ),
+    )
+
+
+def _rank(game: Game, refs: Iterable[RefereeSnapshot], k: int) -> List[Dict[str, object]]:
+    slot = _center_slot(game)
+    weights = weight_profile_for_league(game.league)
+    costs = []
+    for ref in refs:
+        cost = slot_cost(slot, ref, weights)
+        if cost is not None:
+            costs.append((cost, ref.id, ref))
+    # Display fields are stored with the list so the route serves it without a join; a
+    # referee's profile or rating changing marks them, which recomputes the lists they are on.
+    return [
+        {
+            "referee_id": ref_id,
+            "cost": round(cost, 4),
+            "full_name": ref.full_name,
+            "cert_level": ref.cert_level,
+            "average_rating": (
+                round(ref.average_rating, 2) if ref.average_rating is not None else None
+            ),
+        }
+        for cost, ref_id, ref in heapq.nsmallest(k, costs, key=lambda c: c[:2])
+    ]
+
+
+def _open_games(db: Session, now: datetime, game_ids: Optional[Iterable[int]] = None):
+    query = (
+        db.query(Game)
+        .options(joinedload(Game.field_location), joinedload(Game.league))
+        .filter(Game.status == "open", Game.scheduled_start >= now)
+    )
+    if game_ids is not None:
+        query = query.filter(Game.id.in_(list(game_ids)))
+    return query.all()
+
+
+def _affected_by_refs(
+    games: Dict[int, Game],
+    stored: Dict[int, GameRecommendation],
+    refs: List[RefereeSnapshot],
+    k: int,
+) -> Set[int]:
+    """Games whose stored list a changed referee is on, or would now enter."""
+    affected: Set[int] = set()
+    for game_id, row in stored.items():
+        game = games.get(game_id)
+        if game is None:
+            continue
+        listed = {entry["referee_id"] for entry in row.entries}
+        worst = row.entries[-1]["cost"] if len(row.entries) >= k else None
+        slot = _center_slot(game)
+        weights = weight_profile_for_league(game.league)
+        for ref in refs:
+            if ref.id in listed:
+                affected.add(game_id)
+                break
+            cost = slot_cost(slot, ref, weights)
+            if cost is not None and (worst is None or cost < worst):
+                affected.add(game_id)
+                break
+    return affected
+
+
+def refresh_recommendations(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Bring stored recommendations up to date with everything marked since the last run."""
+    dirty_games, dirty_refs, full = _take_dirty()
+    if not (dirty_games or dirty_refs or full):
+        return {"recomputed": 0, "removed": 0}
+
+    now = now or datetime.now(timezone.utc)
+    k = get_settings().RECOMMENDER_TOP_K
+    games = {game.id: game for game in _open_games(db, now)}
+    stored = {row.game_id: row for row in db.query(GameRecommendation).all()}
+
+    removed = 0
+    for game_id, row in list(stored.items()):
+        if game_id not in games:
+            db.delete(row)
+            del stored[game_id]
+            removed += 1
+
+    refs = load_referee_snapshots(db, now)
+    if full:
+        targets = set(games)
+    else:
+        targets = {gid for gid in dirty_games if gid in games}
+        targets |= set(games) - set(stored)
+        changed = [ref for ref in refs if ref.id in dirty_refs]
+        if changed:
+            targets |= _affected_by_refs(games, stored, changed, k)
+
+    for game_id in targets:
+        entries = _rank(games[game_id], refs, k)
+        row = stored.get(game_id)
+        if row is None:
+            db.add(GameRecommendation(game_id=game_id, entries=entries))
+        else:
+            row.entries = entries
+            row.computed_at = now
+    db.commit()
+    return {"recomputed": len(targets), "removed": removed}
+
+
+def get_game_recommendations(db: Session, game: Game) -> Optional[GameRecommendation]:
+    """The stored list for a game, computed on the spot if the worker has not reached it.
+
+    None for games that are no longer open.
+    """
+    if game.status != "open":
+        return None
+    row = db.get(GameRecommendation, game.id)
+    if row is not None:
+        return row
+    now = datetime.now(timezone.utc)
+    if not _open_games(db, now, [game.id]):
+        return None
+    row = GameRecommendation(
+        game_id=game.id,
+        entries=_rank(game, load_referee_snapshots(db, now), get_settings().RECOMMENDER_TOP_K),
+    )
+    db.add(row)
+    try:
+        db.commit()
+    except IntegrityError:
+        # The worker or another request stored it first.
+        db.rollback()
+        return db.get(GameRecommendation, game.id)
+    return row
+
+
+def run_recommendation_cycle() -> Dict[str, int]:
+    global _last_full_refresh
+    settings = get_settings()
+    if time.monotonic() - _last_full_refresh >= settings.RECOMMENDER_FULL_REFRESH_SECONDS:
+        request_full_refresh()
+        _last_full_refresh = time.monotonic()
+    db = SessionLocal()
+    try:
+        return refresh_recommendations(db)
+    except Exception:
+        # The marks taken for this run are gone; recompute everything next time.
+        db.rollback()
+        request_full_refresh()
+        raise
+    finally:
+        db.close()
+
+
+async def recommendation_worker() -> None:
+    """Refresh recommendations every RECOMMENDER_INTERVAL_SECONDS until cancelled."""
+    interval = get_settings().RECOMMENDER_INTERVAL_SECONDS
+    while True:
+        try:
+            await run_in_threadpool(run_recommendation_cycle)
+        except Exception:
+            logger.exception("Recommendation refresh failed")
+        await asyncio.sleep(interval)
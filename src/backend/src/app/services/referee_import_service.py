@@ -0,0 +1,223 @@
+"""Bulk creation of referee accounts from a league's CSV or JSON upload.
+
+Rows are validated individually and reported back rather than failing the whole upload.
+Emails that are already registered are found with one query, passwords are hashed on a
+process pool, and users and profiles go in as batched INSERT statements.
+"""
+
+import asyncio
+import csv
+import io
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Dict, List, Set, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.security import hash_passwords
+from app.models.referee import RefereeProfile
+from app.models.user import User
+from app.schemas.referee import RefereeImportError, RefereeImportResult, RefereeImportRow
+from app.services.recommendation_service import mark_referee_changed
+from app.services.referee_text_index import index_referee_rows
+
+# Alternative CSV headers accepted for RefereeImportRow fields.
+CSV_HEADER_ALIASES = {"full_name": "name", "location": "home_location", "cert": "cert_level"}
+# Hashing chunks per worker process, so uneven chunks still keep every process busy.
+CHUNKS_PER_PROCESS = 4
+
+PROFILE_FIELDS = (
+    "cert_level",
+    "years_experience",
+    "primary_positions",
+    "home_location",
+    "latitude",
+    "longitude",
+    "travel_radius_km",
+    "bio",
+)
+
+
+def _process_count() -> int:
+    return get_settings().BULK_IMPORT_HASH_PROCESSES or os.cpu_count() or 1
+
+
+@lru_cache
+def _hash_executor() -> ProcessPoolExecutor:
+    # Spawned workers only import app.core.security; forking a server with live threads
+    # and connections is not safe.
+    return ProcessPoolExecutor(
+        max_workers=_process_count(), mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def parse_referee_csv(content: bytes) -> List[Dict[str, Any]]:
+    """Rows of a CSV upload as dicts keyed by field name; blank cells are left out."""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="CSV must be UTF-8 encoded"
+        ) from exc
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV has no header")
+    rows = []
+    for record in reader:
+        row = {}
+        for header, value in record.items():
+            if header is None or value is None or not value.strip():
+                continue
+            key = header.strip().lower()
+            row[CSV_HEADER_ALIASES.get(key, key)] = value.strip()
+        rows.append(row)
+    return rows
+
+
+def _validate(
+    raw_rows: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[int, RefereeImportRow]], List[RefereeImportError]]:
+    valid, errors = [], []
+    seen: Set[str] = set()
+    for number, raw in enumerate(raw_rows, start=1):
+        try:
+            row = RefereeImportRow.model_validate(raw)
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            field = ".".join(str(part) for part in first["loc"])
+            email = raw.get("email")
+            errors.append(
+                RefereeImportError(
+                    row=number,
+                    email=email if isinstance(email, str) else None,
+                    error=f"{field}: {first['msg']}",
+                )
+            )
+            continue
+        if row.email in seen:
+            errors.append(
+                RefereeImportError(row=number, email=row.email, error="Duplicate email in upload")
+            )
+            continue
+        seen.add(row.email)
+        valid.append((number, row))
+    return valid, errors
+
+
+def _registered_emails(db: Session, emails: List[str]) -> Set[str]:
+    """Which of `emails` already have accounts, in one query; rolls back the read.
+
+    Ending the transaction gives the connection back to the pool before the caller starts
+    hashing, which takes far longer; the session stays open for the insert.
+    """
+    taken = {email for (email,) in db.query(User.email).filter(User.email.in_(emails))}
+    db.rollback()
+    return taken
+
+
+async def _hash_all(passwords: List[str]) -> List[str]:
+    if not passwords:
+        return []
+    size = math.ceil(len(passwords) / (_process_count() * CHUNKS_PER_PROCESS))
+    loop = asyncio.get_running_loop()
+    executor = _hash_executor()
+    try:
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, hash_passwords, passwords[i : i + size])
+                for i in range(0, len(passwords), size)
+            )
+        )
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next import.
+        _hash_executor.cache_clear()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing workers failed; please retry the import",
+        )
+    return [hashed for chunk in chunks for hashed in chunk]
+
+
+def _insert_accounts(
+    db: Session, rows: List[RefereeImportRow], hashed: List[str]
+) -> List[Tuple[int, RefereeImportRow]]:
+    """Insert users then profiles, each as batched multi-row INSERTs; (profile id, row)."""
+    user_ids: Dict[str, int] = dict(
+        db.execute(
+            insert(User).returning(User.email, User.id),
+            [
+                {"email": row.email, "hashed_password": password, "role": "referee"}
+                for row, password in zip(rows, hashed)
+            ],
+        ).all()
+    )
+    by_user = {user_ids[row.email]: row for row in rows}
+    profile_ids = db.execute(
+        insert(RefereeProfile).returning(RefereeProfile.user_id, RefereeProfile.id),
+        [
+            {
+                "user_id": user_id,
+                "full_name": row.name,
+                **{field: getattr(row, field) for field in PROFILE_FIELDS},
+            }
+            for user_id, row in by_user.items()
+        ],
+    ).all()
+    db.commit()
+    created = [(profile_id, by_user[user_id]) for user_id, profile_id in profile_ids]
+    return sorted(created, key=lambda pair: pair[0])
+
+
+async def import_referees(db: Session, raw_rows: List[Dict[str, Any]]) -> RefereeImportResult:
+    max_rows = get_settings().BULK_IMPORT_MAX_ROWS
+    if len(raw_rows) > max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {max_rows} referees per import",
+        )
+    valid, errors = _validate(raw_rows)
+
+    taken = await run_in_threadpool(_registered_emails, db, [row.email for _, row in valid])
+    accepted = []
+    for number, row in valid:
+        if row.email in taken:
+            errors.append(
+                RefereeImportError(row=number, email=row.email, error="Email already registered")
+            )
+        else:
+            accepted.append(row)
+    errors.sort(key=lambda error: error.row)
+
+    if not accepted:
+        return RefereeImportResult(created=0, referee_ids=[], errors=errors)
+    hashed = await _hash_all([row.password for row in accepted])
+    try:
+        created = await run_in_threadpool(_insert_accounts, db, accepted, hashed)
+    except IntegrityError:
+        # Someone registered one of these emails after the check; nothing was inserted.
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="An email in the upload was registered during the import; please retry",
+        )
+
+    index_referee_rows(
+        (profile_id, row.bio, row.primary_positions, row.cert_level) for profile_id, row in created
+    )
+    for profile_id, _ in created:
+        mark_referee_changed(profile_id)
+    return RefereeImportResult(
+        created=len(created),
+        referee_ids=[profile_id for profile_id, _ in created],
+        errors=errors,
+    )
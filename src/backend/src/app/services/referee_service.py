@@ -1,11 +1,15 @@
 """Referee-related business logic."""
 
+import base64
+import json
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from math import asin, cos, radians, sin, sqrt
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy import func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, and_, cast, func, or_, select
+from sqlalchemy.orm import Query, Session
 
+from app.core.cache import TTLCache
 from app.models.assignment import Assignment
 from app.models.note import RefNote
 from app.models.rating import Rating
@@ -13,34 +17,106 @@ from app.models.referee import RefereeProfile
 from app.models.user import User
 
 
-def get_referee_stats(db: Session, ref_id: int) -> Dict[str, object]:
-    games_reffed = (
-        db.query(Assignment)
-        .filter(Assignment.referee_id == ref_id, Assignment.status == "accepted")
-        .count()
+STATS_CACHE_TTL_SECONDS = 300
+RECENT_NOTES_LIMIT = 5
+
+_stats_cache = TTLCache(maxsize=10_000, ttl=STATS_CACHE_TTL_SECONDS)
+
+
+def _empty_stats() -> Dict[str, object]:
+    return {"games_reffed": 0, "average_rating": None, "recent_notes": []}
+
+
+def _load_referee_stats(db: Session, ref_ids: List[int]) -> Dict[int, Dict[str, object]]:
+    """Accepted-game count, average rating and recent notes for many referees in one query."""
+    games = (
+        select(Assignment.referee_id, func.count(Assignment.id).label("games_reffed"))
+        .where(Assignment.referee_id.in_(ref_ids), Assignment.status == "accepted")
+        .group_by(Assignment.referee_id)
+        .subquery()
     )
-    avg_rating = (
-        db.query(func.avg(Rating.score))
-        .filter(Rating.referee_id == ref_id)
-        .scalar()
+    ratings = (
+        select(Rating.referee_id, func.avg(Rating.score).label("average_rating"))
+        .where(Rating.referee_id.in_(ref_ids))
+        .group_by(Rating.referee_id)
+        .subquery()
     )
     notes = (
-        db.query(RefNote)
-        .filter(RefNote.referee_id == ref_id)
-        .order_by(RefNote.created_at.desc())
-        .limit(5)
-        .all()
+        select(
+            RefNote.referee_id,
+            RefNote.id,
+            RefNote.note_text,
+            RefNote.visibility,
+            RefNote.created_at,
+            func.row_number()
+            .over(partition_by=RefNote.referee_id, order_by=RefNote.created_at.desc())
+            .label("rn"),
+        )
+        .where(RefNote.referee_id.in_(ref_ids))
+        .subquery()
     )
-    return {
-        "games_reffed": games_reffed,
-        "average_rating": float(avg_rating) if avg_rating is not None else None,
-        "recent_notes": notes,
-    }
+    stmt = (
+        select(
+            RefereeProfile.id,
+            games.c.games_reffed,
+            ratings.c.average_rating,
+            notes.c.id,
+            notes.c.note_text,
+            notes.c.visibility,
+        )
+        .outerjoin(games, games.c.referee_id == RefereeProfile.id)
+        .outerjoin(ratings, ratings.c.referee_id == RefereeProfile.id)
+        .outerjoin(
+            notes,
+            and_(notes.c.referee_id == RefereeProfile.id, notes.c.rn <= RECENT_NOTES_LIMIT),
+        )
+        .where(RefereeProfile.id.in_(ref_ids))
+        .order_by(RefereeProfile.id, notes.c.rn)
+    )
+
+    # Only ids with a RefereeProfile come back; unknown ids get no entry.
+    stats: Dict[int, Dict[str, object]] = {}
+    for ref_id, games_reffed, average_rating, note_id, note_text, visibility in db.execute(stmt):
+        entry = stats.setdefault(ref_id, _empty_stats())
+        entry["games_reffed"] = games_reffed or 0
+        entry["average_rating"] = float(average_rating) if average_rating is not None else None
+        if note_id is not None:
+            entry["recent_notes"].append(
+                {"id": note_id, "note_text": note_text, "visibility": visibility}
+            )
+    return stats
+
+
+def get_referee_stats_many(db: Session, ref_ids: List[int]) -> Dict[int, Dict[str, object]]:
+    """Cached stats per referee, in the order of `ref_ids`; all cache misses are loaded
+    together in one round trip. Ids without a referee profile are left out."""
+    found: Dict[int, Dict[str, object]] = {}
+    missing: List[int] = []
+    unique_ids = list(dict.fromkeys(ref_ids))
+    for ref_id in unique_ids:
+        cached = _stats_cache.get(ref_id)
+        if cached is None:
+            missing.append(ref_id)
+        else:
+            found[ref_id] = cached
+    if missing:
+        for ref_id, entry in _load_referee_stats(db, missing).items():
+            _stats_cache.set(ref_id, entry)
+            found[ref_id] = entry
+    return {ref_id: found[ref_id] for ref_id in unique_ids if ref_id in found}
+
+
+def get_referee_stats(db: Session, ref_id: int) -> Optional[Dict[str, object]]:
+    """Stats for one referee, or None if there is no such referee."""
+    return get_referee_stats_many(db, [ref_id]).get(ref_id)
 
 
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    from math import asin, cos, radians, sin, sqrt
+def invalidate_referee_stats(ref_id: int) -> None:
+    """Drop cached stats after a new rating, note or assignment response."""
+    _stats_cache.delete(ref_id)
 
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     r = 6371.0
     dlat = radians(lat2 - lat1)
     dlon = radians(lon2 - lon1)
@@ -71,12 +147,159 @@ def search_candidate_refs(db: Session, constraints: Dict[str, object]) -> List[R
     for ref in refs:
         if ref.latitude is None or ref.longitude is None:
             continue
-        distance = _haversine_km(lat, lon, ref.latitude, ref.longitude)
+        distance = haversine_km(lat, lon, ref.latitude, ref.longitude)
         if distance <= float(max_distance_km):
             filtered.append(ref)
     return filtered
 
 
+EARTH_RADIUS_KM = 6371.0
+SEARCH_SORTS = ("id", "rating", "distance")
+
+
+def encode_cursor(sort_value: Optional[float], ref_id: int) -> str:
+    raw = json.dumps({"v": sort_value, "id": ref_id}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[float], int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return data.get("v"), int(data["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def sql_distance_km(lat_column, lon_column, lat: float, lon: float):
+    """Haversine distance from (lat, lon) to each row's coordinates, evaluated in the database."""
+    dlat = func.radians(lat_column - lat)
+    dlon = func.radians(lon_column - lon)
+    a = func.power(func.sin(dlat / 2), 2) + func.cos(func.radians(lat)) * func.cos(
+        func.radians(lat_column)
+    ) * func.power(func.sin(dlon / 2), 2)
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(a))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float]:
+    """Latitude and longitude half-spans of a box that contains the radius."""
+    lat_span = radius_km / 111.0
+    lon_span = radius_km / max(111.0 * cos(radians(lat)), 1e-6)
+    return lat_span, lon_span
+
+
+def _sql_distance_km(lat: float, lon: float):
+    return sql_distance_km(RefereeProfile.latitude, RefereeProfile.longitude, lat, lon)
+
+
+def search_refs_query(
+    db: Session, constraints: Dict[str, object], sort: str = "id"
+) -> Tuple[Query, object]:
+    """Filtered referee query plus the expression it is ordered by.
+
+    Rating and distance filters run in SQL (with a lat/lon bounding box ahead of the
+    trig) so only the requested page is ever loaded. Rows are (RefereeProfile, sort_value).
+    """
+    if sort not in SEARCH_SORTS:
+        raise ValueError(f"Unsupported sort: {sort}")
+    min_rating = constraints.get("min_rating")
+    max_distance_km = constraints.get("max_distance_km")
+    location = constraints.get("location") or {}
+    lat = location.get("lat")
+    lon = location.get("lon")
+    has_location = lat is not None and lon is not None
+    if sort == "distance" and not has_location:
+        raise ValueError("Sorting by distance requires lat and lon")
+
+    ratings = (
+        db.query(Rating.referee_id, func.avg(Rating.score).label("avg_rating"))
+        .group_by(Rating.referee_id)
+        .subquery()
+    )
+    # Cast so cursor values round-trip exactly through JSON for keyset comparisons.
+    avg_rating = cast(func.coalesce(ratings.c.avg_rating, 0), Float)
+    distance = _sql_distance_km(float(lat), float(lon)) if has_location else None
+
+    if sort == "rating":
+        sort_expr = avg_rating
+    elif sort == "distance":
+        sort_expr = distance
+    else:
+        sort_expr = RefereeProfile.id
+
+    query = db.query(RefereeProfile, sort_expr.label("sort_value")).outerjoin(
+        ratings, ratings.c.referee_id == RefereeProfile.id
+    )
+    if min_rating is not None:
+        query = query.filter(ratings.c.avg_rating >= float(min_rating))
+    if has_location and max_distance_km is not None:
+        radius = float(max_distance_km)
+        lat_span, lon_span = bounding_box(float(lat), float(lon), radius)
+        query = query.filter(
+            RefereeProfile.latitude.between(float(lat) - lat_span, float(lat) + lat_span),
+            RefereeProfile.longitude.between(float(lon) - lon_span, float(lon) + lon_span),
+            distance <= radius,
+        )
+
+    if sort == "rating":
+        query = query.order_by(sort_expr.desc(), RefereeProfile.id.asc())
+    else:
+        # Referees without coordinates have no distance; they come last, by id.
+        query = query.order_by(sort_expr.asc().nulls_last(), RefereeProfile.id.asc())
+    return query, sort_expr
+
+
+def search_refs_page(
+    db: Session,
+    constraints: Dict[str, object],
+    sort: str = "id",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Tuple[List[RefereeProfile], Optional[str]]:
+    """One keyset-paginated page of referees and the cursor for the next page."""
+    query, sort_expr = search_refs_query(db, constraints, sort)
+    if cursor:
+        last_value, last_id = decode_cursor(cursor)
+        if sort == "id":
+            query = query.filter(RefereeProfile.id > last_id)
+        elif sort == "rating":
+            query = query.filter(
+                or_(
+                    sort_expr < last_value,
+                    and_(sort_expr == last_value, RefereeProfile.id > last_id),
+                )
+            )
+        elif last_value is None:
+            # The previous page ended among the referees without a distance.
+            query = query.filter(sort_expr.is_(None), RefereeProfile.id > last_id)
+        else:
+            query = query.filter(
+                or_(
+                    sort_expr > last_value,
+                    and_(sort_expr == last_value, RefereeProfile.id > last_id),
+                    sort_expr.is_(None),
+                )
+            )
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_ref, last_value = rows[-1]
+        value = float(last_value) if last_value is not None else None
+        next_cursor = encode_cursor(value, last_ref.id)
+    return [ref for ref, _ in rows], next_cursor
+
+
+def iter_search_refs(
+    db: Session, constraints: Dict[str, object], sort: str = "id", batch_size: int = 500
+) -> Iterator[RefereeProfile]:
+    """Stream every matching referee, fetching rows from the cursor in batches."""
+    query, _ = search_refs_query(db, constraints, sort)
+    for ref, _ in query.yield_per(batch_size):
+        yield ref
+
+
 def search_refs_by_name_or_email(
     db: Session, query: str, limit: int = 10
 ) -> List[tuple[RefereeProfile, User]]:
@@ -0,0 +1,119 @@
+"""Full-text relevance of referee profiles (bio, positions, certification) via BM25."""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.bm25 import BM25Index
+from app.models.referee import RefereeProfile
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words that carry no signal in requests or bios ("find me a ref who has ...").
+STOPWORDS = frozenset(
+    """
+    a about an and any are as at be been but by can do does for from had has have he her
+    him his i in is it its looking me my need needs of on or our she so some someone that
+    the their them they this to us was we who with would you your find referee referees
+    ref refs official officials game games match matches please
+    """.split()
+)
+
+# Canonical forms so a request's wording meets the profile's wording.
+SYNONYMS = {
+    "assistant": ["ar"],
+    "linesman": ["ar"],
+    "lineman": ["ar"],
+    "ar1": ["ar"],
+    "ar2": ["ar"],
+    "centre": ["center"],
+    "cr": ["center"],
+    "middle": ["center"],
+    "hs": ["high", "school"],
+    "experienced": ["experience"],
+    "veteran": ["experience"],
+}
+
+_index = BM25Index()
+_built = False
+_build_lock = threading.Lock()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    tokens: List[str] = []
+    for word in _TOKEN_RE.findall((text or "").lower()):
+        if word in STOPWORDS or word.isdigit():
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.extend(SYNONYMS.get(word, [word]))
+    return tokens
+
+
+def _text_tokens(bio: Optional[str], positions: Optional[str], cert: Optional[str]) -> List[str]:
+    return tokenize(" ".join(filter(None, (bio, positions, cert))))
+
+
+def profile_tokens(ref: RefereeProfile) -> List[str]:
+    return _text_tokens(ref.bio, ref.primary_positions, ref.cert_level)
+
+
+def build_referee_index(db: Session) -> None:
+    """(Re)build the index from every referee profile."""
+    global _built
+    rows = db.query(
+        RefereeProfile.id,
+        RefereeProfile.bio,
+        RefereeProfile.primary_positions,
+        RefereeProfile.cert_level,
+    )
+    _index.rebuild(
+        (ref_id, _text_tokens(bio, positions, cert))
+        for ref_id, bio, positions, cert in rows.yield_per(1000)
+    )
+    _built = True
+
+
+def ensure_referee_index(db: Session) -> None:
+    if _built:
+        return
+    with _build_lock:
+        if not _built:
+            build_referee_index(db)
+
+
+def index_referee(ref: RefereeProfile) -> None:
+    """Refresh one referee's entry after their profile text changed."""
+    if _built:
+        _index.upsert(ref.id, profile_tokens(ref))
+
+
+def index_referee_rows(
+    rows: Iterable[Tuple[int, Optional[str], Optional[str], Optional[str]]]
+) -> None:
+    """Add referees inserted without ORM objects, as (id, bio, positions, cert_level)."""
+    if _built:
+        for ref_id, bio, positions, cert in rows:
+            _index.upsert(ref_id, _text_tokens(bio, positions, cert))
+
+
+def text_match_scores(db: Session, query: str, ref_ids: Iterable[int]) -> Dict[int, float]:
+    """Relevance of each referee to `query`, scaled so the best match is 1.0.
+
+    Referees with no matching terms are left out.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return {}
+    ensure_referee_index(db)
+    scores = _index.search(tokens, ref_ids)
+    best = max(scores.values(), default=0.0)
+    if best <= 0:
+        return {}
+    return {ref_id: score / best for ref_id, score in scores.items()}
+
+
+def referee_index_stats() -> Dict[str, int]:
+    return _index.stats()
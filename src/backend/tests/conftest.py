@@ -0,0 +1,25 @@
+"""Shared test setup: a throwaway SQLite database and the in-process OpenAI stand-in."""
+
+import os
+import tempfile
+
+# Settings are read once, on first import of the app, so configure before that.
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-" + "x" * 32)
+os.environ["RECOMMENDER_ENABLED"] = "false"
+os.environ["OPENAI_USE_FAKE"] = "true"
+os.environ["FAKE_OPENAI_JITTER_MS"] = "0"
+
+import pytest  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,52 @@
+"""A slow LLM completion must not hold up other requests."""
+
+import asyncio
+import time
+
+import httpx
+
+from app.integrations import fake_openai
+from app.main import app
+
+COMPLETION_SECONDS = 1.0
+
+
+async def _register(client: httpx.AsyncClient) -> dict:
+    response = await client.post(
+        "/auth/register",
+        json={"email": "league@example.com", "password": "pw", "role": "league", "name": "L"},
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _timed(request) -> tuple:
+    response = await request
+    return response, time.perf_counter()
+
+
+async def _chat_while_polling() -> tuple:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = await _register(client)
+        start = time.perf_counter()
+        chat = asyncio.create_task(
+            _timed(client.post("/messages/ai-chat", json={"message": "hello"}, headers=headers))
+        )
+        # Let the chat request reach the fake completion before polling.
+        await asyncio.sleep(0.1)
+        me, me_done = await _timed(client.get("/auth/me", headers=headers))
+        (chat_response, chat_done) = await chat
+        return start, me, me_done, chat_response, chat_done
+
+
+def test_requests_are_served_during_a_slow_completion(monkeypatch):
+    monkeypatch.setattr(fake_openai.settings, "LATENCY_MS", COMPLETION_SECONDS * 1000)
+
+    start, me, me_done, chat, chat_done = asyncio.run(_chat_while_polling())
+
+    assert me.status_code == 200
+    assert chat.status_code == 200
+    assert chat_done - start >= COMPLETION_SECONDS
+    assert me_done < chat_done
+    assert me_done - start < COMPLETION_SECONDS / 2
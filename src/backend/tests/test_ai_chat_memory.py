@@ -0,0 +1,42 @@
+"""The chat reply does not wait for the exchange to be stored (and possibly compacted)."""
+
+import asyncio
+
+from fastapi import BackgroundTasks
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.integrations import fake_openai
+from app.main import app
+from app.models.chat_memory import ChatMemory
+from app.models.user import User
+from app.services.ai_chat_service import AIChatAssistant
+
+
+def test_exchange_is_recorded_after_the_reply(monkeypatch):
+    monkeypatch.setattr(fake_openai.settings, "LATENCY_MS", 0.0)
+    TestClient(app).post(
+        "/auth/register",
+        json={"email": "league@example.com", "password": "pw", "role": "league", "name": "L"},
+    ).raise_for_status()
+    db = SessionLocal()
+    user_id = db.query(User.id).scalar()
+    tasks = BackgroundTasks()
+
+    async def chat_then_background():
+        result = await AIChatAssistant.chat(
+            db, user_id, "league", "hello", background_tasks=tasks
+        )
+        stored_before = db.query(ChatMemory).filter_by(user_id=user_id).count()
+        await tasks()
+        return result, stored_before
+
+    result, stored_before = asyncio.run(chat_then_background())
+    db.close()
+
+    assert result["response"]
+    assert stored_before == 0
+    check = SessionLocal()
+    memory = check.query(ChatMemory).filter_by(user_id=user_id).one()
+    check.close()
+    assert [turn["content"] for turn in memory.recent_turns] == ["hello", result["response"]]
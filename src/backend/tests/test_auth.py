@@ -0,0 +1,43 @@
+"""Sign-in keeps working on the request's session after the lookup gives back its connection."""
+
+from fastapi.testclient import TestClient
+from passlib.hash import pbkdf2_sha256
+
+from app.core.auth import find_user_by_email
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.user import User
+
+
+def _register(client: TestClient) -> None:
+    client.post(
+        "/auth/register",
+        json={"email": "league@example.com", "password": "pw", "role": "league", "name": "L"},
+    ).raise_for_status()
+
+
+def test_lookup_leaves_the_session_usable():
+    _register(TestClient(app))
+    db = SessionLocal()
+
+    user = find_user_by_email(db, "league@example.com")
+
+    assert user.hashed_password
+    assert not db.in_transaction()
+    assert db.query(User).count() == 1
+    db.close()
+
+
+def test_login_upgrades_an_outdated_hash():
+    client = TestClient(app)
+    _register(client)
+    db = SessionLocal()
+    db.query(User).update({"hashed_password": pbkdf2_sha256.using(rounds=1000).hash("pw")})
+    db.commit()
+
+    response = client.post("/auth/login", json={"email": "league@example.com", "password": "pw"})
+
+    assert response.status_code == 200
+    db.expire_all()
+    assert "$1000$" not in db.query(User.hashed_password).scalar()
+    db.close()
@@ -0,0 +1,71 @@
+"""Batch assignment only runs on open, upcoming games and known roles."""
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.field_location import FieldLocation
+from app.models.league import League
+
+
+def _create_games(client, headers):
+    db = SessionLocal()
+    field = FieldLocation(
+        league_id=db.query(League.id).scalar(), name="Park", latitude=41.88, longitude=-87.63
+    )
+    db.add(field)
+    db.commit()
+    now = datetime.now(timezone.utc)
+    ids = []
+    for start, game_status in [
+        (now + timedelta(days=1), "open"),
+        (now - timedelta(days=1), "open"),
+        (now + timedelta(days=2), "cancelled"),
+    ]:
+        response = client.post(
+            "/games",
+            json={
+                "field_location_id": field.id,
+                "scheduled_start": start.isoformat(),
+                "status": game_status,
+            },
+            headers=headers,
+        )
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+    db.close()
+    return ids
+
+
+def test_explicit_games_must_be_open_and_upcoming():
+    client = TestClient(app)
+    token = client.post(
+        "/auth/register",
+        json={"email": "league@example.com", "password": "pw", "role": "league", "name": "L"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    upcoming, past, cancelled = _create_games(client, headers)
+
+    ok = client.post(
+        "/games/batch-assignments",
+        json={"game_ids": [upcoming], "dry_run": True},
+        headers=headers,
+    )
+    refused = client.post(
+        "/games/batch-assignments",
+        json={"game_ids": [upcoming, past, cancelled, 9999], "dry_run": True},
+        headers=headers,
+    )
+    bad_role = client.post(
+        "/games/batch-assignments",
+        json={"roles": ["center", "goalie"], "dry_run": True},
+        headers=headers,
+    )
+
+    assert ok.status_code == 200
+    assert {slot["game_id"] for slot in ok.json()["unfilled"]} == {upcoming}
+    assert refused.status_code == 409
+    assert refused.json()["detail"].endswith(f"{past}, {cancelled}, 9999")
+    assert bad_role.status_code == 400
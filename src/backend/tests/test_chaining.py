@@ -0,0 +1,46 @@
+"""Day chains follow the league's local calendar day."""
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.field_location import FieldLocation
+from app.models.league import League
+
+# 17:00, 19:15 and 21:30 CDT on 2026-10-20; the last two fall on the 21st in UTC.
+KICKOFFS = ["2026-10-20T22:00:00Z", "2026-10-21T00:15:00Z", "2026-10-21T02:30:00Z"]
+
+
+def test_evening_kickoffs_stay_in_their_local_day():
+    client = TestClient(app)
+    token = client.post(
+        "/auth/register",
+        json={"email": "league@example.com", "password": "pw", "role": "league", "name": "L"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    db = SessionLocal()
+    field = FieldLocation(
+        league_id=db.query(League.id).scalar(), name="Park", latitude=41.88, longitude=-87.63
+    )
+    db.add(field)
+    db.commit()
+    for kickoff in KICKOFFS:
+        client.post(
+            "/games",
+            json={"field_location_id": field.id, "scheduled_start": kickoff, "status": "open"},
+            headers=headers,
+        ).raise_for_status()
+    db.close()
+
+    local = client.get(
+        "/games/chains", params={"day": "2026-10-20", "tz": "America/Chicago"}, headers=headers
+    )
+    utc = client.get("/games/chains", params={"day": "2026-10-20"}, headers=headers)
+
+    assert local.status_code == 200
+    assert [len(chain["game_ids"]) for chain in local.json()] == [3]
+    assert [len(chain["game_ids"]) for chain in utc.json()] == [1]
+    bad = client.get(
+        "/games/chains", params={"day": "2026-10-20", "tz": "Mars/Base"}, headers=headers
+    )
+    assert bad.status_code == 400
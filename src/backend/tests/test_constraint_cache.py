@@ -0,0 +1,33 @@
+"""Persisting a parsed query leaves the caller's transaction alone."""
+
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.league import League
+from app.models.parsed_query import ParsedQuery
+from app.services import constraint_cache
+
+
+def test_persisting_does_not_commit_the_callers_changes(monkeypatch):
+    monkeypatch.setattr(get_settings(), "PARSE_CACHE_PERSIST", True)
+    monkeypatch.setattr(constraint_cache, "fast_parse_ref_request", lambda *_: None)
+    monkeypatch.setattr(constraint_cache, "parse_ref_request", lambda *_: {"age_group": "U12"})
+    TestClient(app).post(
+        "/auth/register",
+        json={"email": "league@example.com", "password": "pw", "role": "league", "name": "L"},
+    ).raise_for_status()
+    db = SessionLocal()
+    league = db.query(League).one()
+    league.name = "Renamed, not committed"
+
+    constraints = constraint_cache.cached_parse_ref_request("some u12 refs", league.id, db)
+
+    assert constraints == {"age_group": "U12"}
+    assert league in db.dirty
+    check = SessionLocal()
+    assert check.query(League.name).scalar() == "L"
+    assert check.query(ParsedQuery).count() == 1
+    check.close()
+    db.close()
@@ -0,0 +1,38 @@
+"""LLM usage is visible per league; the cross-league view needs the operator token."""
+
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.main import app
+
+
+def _league_headers(client: TestClient) -> dict:
+    response = client.post(
+        "/auth/register",
+        json={"email": "league@example.com", "password": "pw", "role": "league", "name": "L"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_leagues_see_only_their_own_usage():
+    client = TestClient(app)
+    headers = _league_headers(client)
+
+    response = client.get("/ai/llm-metrics", headers=headers)
+
+    assert response.status_code == 200
+    assert "features" not in response.json()
+    assert client.get("/ai/llm-metrics/global", headers=headers).status_code == 403
+
+
+def test_global_view_requires_operator_token(monkeypatch):
+    client = TestClient(app)
+    assert client.get("/ai/llm-metrics/global").status_code == 403
+
+    monkeypatch.setattr(get_settings(), "OPERATOR_TOKEN", "ops-secret")
+
+    wrong = client.get("/ai/llm-metrics/global", headers={"X-Operator-Token": "nope"})
+    assert wrong.status_code == 403
+    response = client.get("/ai/llm-metrics/global", headers={"X-Operator-Token": "ops-secret"})
+    assert response.status_code == 200
+    assert set(response.json()) == {"features", "breaker", "coalescing"}
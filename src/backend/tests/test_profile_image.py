@@ -0,0 +1,76 @@
+"""Profile image uploads: content-addressed storage and the size cap."""
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.main import app
+from app.services import image_storage
+
+PNG = b"\x89PNG\r\n\x1a\n" + os.urandom(4000)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_storage, "UPLOADS_DIR", tmp_path)
+    monkeypatch.setattr(image_storage, "_TMP_DIR", tmp_path / ".tmp")
+    return TestClient(app)
+
+
+@pytest.fixture
+def headers(client):
+    response = client.post(
+        "/auth/register",
+        json={"email": "league@example.com", "password": "pw", "role": "league", "name": "L"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_upload_is_named_by_content(client, headers, tmp_path):
+    response = client.post(
+        "/auth/profile-image", files={"file": ("me.png", PNG, "image/png")}, headers=headers
+    )
+
+    assert response.status_code == 200
+    url = response.json()["profile_image_url"]
+    assert url.startswith("/uploads/") and url.endswith(".png")
+    assert (tmp_path / url.removeprefix("/uploads/")).read_bytes() == PNG
+
+
+def test_oversize_body_is_refused_before_it_is_read(client, headers, monkeypatch):
+    monkeypatch.setattr(get_settings(), "PROFILE_IMAGE_MAX_BYTES", 1024)
+    received = []
+
+    def body():
+        received.append(True)
+        yield PNG
+
+    request = client.build_request(
+        "POST",
+        "/auth/profile-image",
+        content=body(),
+        headers={
+            **headers,
+            "Content-Type": "multipart/form-data; boundary=x",
+            "Content-Length": str(1024 * 1024),
+        },
+    )
+    response = client.send(request)
+
+    assert response.status_code == 413
+    assert received == []
+
+
+def test_upload_without_length_is_refused(client, headers):
+    response = client.send(
+        client.build_request(
+            "POST",
+            "/auth/profile-image",
+            content=iter([PNG]),
+            headers={**headers, "Content-Type": "multipart/form-data; boundary=x"},
+        )
+    )
+
+    assert response.status_code == 411
@@ -0,0 +1,53 @@
+"""Stored recommendations carry what the "suggest refs" list displays."""
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.field_location import FieldLocation
+from app.models.league import League
+
+
+def _register(client: TestClient, email: str, role: str, **extra) -> dict:
+    response = client.post(
+        "/auth/register", json={"email": email, "password": "pw", "role": role, **extra}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_recommendations_include_referee_display_fields():
+    client = TestClient(app)
+    league = _register(client, "league@example.com", "league", name="L")
+    _register(
+        client,
+        "ref@example.com",
+        "referee",
+        name="Pat Ref",
+        home_location="Edison, NJ",
+        cert_level="National",
+    )
+    db = SessionLocal()
+    field = FieldLocation(
+        league_id=db.query(League.id).scalar(), name="Park", latitude=40.5, longitude=-74.4
+    )
+    db.add(field)
+    db.commit()
+    game = client.post(
+        "/games",
+        json={
+            "field_location_id": field.id,
+            "scheduled_start": "2099-05-01T15:00:00Z",
+            "status": "open",
+        },
+        headers=league,
+    ).json()
+    db.close()
+
+    response = client.get(f"/games/{game['id']}/recommendations", headers=league)
+
+    assert response.status_code == 200
+    [entry] = response.json()["referees"]
+    assert entry["full_name"] == "Pat Ref"
+    assert entry["cert_level"] == "National"
+    assert entry["average_rating"] is None
@@ -0,0 +1,40 @@
+"""Row-by-row validation of bulk referee imports."""
+
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.main import app
+from app.services.referee_import_service import _validate
+
+REFEREE = {"name": "Ref", "home_location": "Edison, NJ", "cert_level": "U14"}
+
+
+def test_invalid_rows_are_reported_not_raised():
+    valid, errors = _validate(
+        [
+            {"email": 123, "password": "p"},
+            {"email": "ref@example.com", "password": "p", **REFEREE},
+            {"email": "ref@example.com", "password": "p", **REFEREE},
+        ]
+    )
+
+    assert [number for number, _ in valid] == [2]
+    assert [(e.row, e.email) for e in errors] == [(1, None), (3, "ref@example.com")]
+    assert errors[0].error.startswith("email:")
+
+
+def test_oversize_csv_is_refused(monkeypatch):
+    monkeypatch.setattr(get_settings(), "BULK_IMPORT_MAX_CSV_BYTES", 64)
+    client = TestClient(app)
+    token = client.post(
+        "/auth/register",
+        json={"email": "league@example.com", "password": "pw", "role": "league", "name": "L"},
+    ).json()["access_token"]
+
+    response = client.post(
+        "/refs/import/csv",
+        files={"file": ("refs.csv", b"email,password\n" + b"a@example.com,p\n" * 10)},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 413
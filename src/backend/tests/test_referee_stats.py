@@ -0,0 +1,32 @@
+"""Batch referee stats keep the requested order and skip unknown ids."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import referee_service
+
+
+def test_batch_stats_follow_requested_order_and_skip_unknown_ids():
+    client = TestClient(app)
+    for i in range(3):
+        client.post(
+            "/auth/register",
+            json={
+                "email": f"ref{i}@example.com",
+                "password": "pw",
+                "role": "referee",
+                "name": f"Ref {i}",
+                "home_location": "Edison, NJ",
+                "cert_level": "U14",
+            },
+        ).raise_for_status()
+    referee_service._stats_cache.clear()
+    # Warm the cache for one id so hits and misses are mixed.
+    client.get("/refs/2/stats").raise_for_status()
+
+    response = client.get("/refs/stats", params={"ids": "3,999,2,1,3"})
+
+    assert response.status_code == 200
+    assert [entry["referee_id"] for entry in response.json()] == [3, 2, 1]
+    assert referee_service._stats_cache.get(999) is None
+    assert client.get("/refs/999/stats").status_code == 404
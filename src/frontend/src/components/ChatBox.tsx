@@ -51,6 +51,8 @@ export default function ChatBox({ className }: ChatBoxProps) {
         role: 'assistant',
         content: greeting,
       }]);
+      // A fresh chat window starts a fresh server-side conversation.
+      if (token) messagesApi.clearAiChatHistory(token).catch(() => undefined);
     }
   }, [user]);
 
@@ -70,12 +72,9 @@ export default function ChatBox({ className }: ChatBoxProps) {
     setIsLoading(true);
 
     try {
+      // The server keeps (and compacts) the conversation history itself.
       const request: AIChatRequest = {
         message: userMessage,
-        conversation_history: messages.map(m => ({
-          role: m.role,
-          content: m.content,
-        })),
       };
       
       const response = await messagesApi.aiChat(token, request);
@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { Game, RefereeWithStats, RefSearchParams } from '@/types';
+import { Game, Page, RefereeWithStats, RefSearchParams } from '@/types';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
@@ -9,7 +9,7 @@ import RefCard from './RefCard';
 
 interface RefSearchProps {
   games: Game[];
-  onSearch: (params: RefSearchParams) => Promise<RefereeWithStats[]>;
+  onSearch: (params: RefSearchParams, cursor?: string | null) => Promise<Page<RefereeWithStats>>;
   onRequest: (gameId: number, refereeId: number, role: 'center' | 'ar') => Promise<void>;
 }
 
@@ -18,7 +18,10 @@ export default function RefSearch({ games, onSearch, onRequest }: RefSearchProps
   const [radiusKm, setRadiusKm] = useState(50);
   const [minRating, setMinRating] = useState(0);
   const [results, setResults] = useState<RefereeWithStats[]>([]);
+  const [searchParams, setSearchParams] = useState<RefSearchParams>({});
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isSearching, setIsSearching] = useState(false);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [hasSearched, setHasSearched] = useState(false);
   const [selectedGame, setSelectedGame] = useState<string>('');
 
@@ -27,18 +30,34 @@ export default function RefSearch({ games, onSearch, onRequest }: RefSearchProps
     setIsSearching(true);
     setHasSearched(true);
 
+    const params = {
+      location,
+      radius_km: radiusKm,
+      min_rating: minRating > 0 ? minRating : undefined,
+    };
     try {
-      const refs = await onSearch({
-        location,
-        radius_km: radiusKm,
-        min_rating: minRating > 0 ? minRating : undefined,
-      });
-      setResults(refs);
+      const page = await onSearch(params);
+      setSearchParams(params);
+      setResults(page.items);
+      setNextCursor(page.next_cursor);
     } finally {
       setIsSearching(false);
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+
+    try {
+      const page = await onSearch(searchParams, nextCursor);
+      setResults((current) => [...current, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   return (
     <div className="space-y-6">
       {/* Search Form */}
@@ -111,7 +130,8 @@ export default function RefSearch({ games, onSearch, onRequest }: RefSearchProps
       {hasSearched && (
         <div className="space-y-4">
           <h4 className="font-medium text-sm text-muted-foreground">
-            {results.length} referee{results.length !== 1 ? 's' : ''} found
+            {results.length} referee{results.length !== 1 ? 's' : ''}
+            {nextCursor ? ' shown' : ' found'}
           </h4>
 
           {results.length === 0 ? (
@@ -130,6 +150,14 @@ export default function RefSearch({ games, onSearch, onRequest }: RefSearchProps
               ))}
             </div>
           )}
+
+          {nextCursor && (
+            <div className="flex justify-center">
+              <Button variant="outline" onClick={handleLoadMore} disabled={isLoadingMore}>
+                {isLoadingMore ? 'Loading...' : 'Load more'}
+              </Button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '@/contexts/AuthContext';
-import { League, Game, RefereeWithStats } from '@/types';
+import { League, Game, Page, RefereeWithStats, RefSearchParams } from '@/types';
 import { leaguesApi, gamesApi, refsApi, aiApi } from '@/services/api';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
@@ -86,9 +86,12 @@ export default function LeagueDashboard() {
     }
   };
 
-  const handleSearchRefs = async (params: any): Promise<RefereeWithStats[]> => {
-    if (!token) return [];
-    return refsApi.search(params, token);
+  const handleSearchRefs = async (
+    params: RefSearchParams,
+    cursor?: string | null
+  ): Promise<Page<RefereeWithStats>> => {
+    if (!token) return { items: [], next_cursor: null };
+    return refsApi.search(params, token, cursor);
   };
 
   const handleAISearch = async (query: string, gameId?: number) => {
@@ -15,6 +15,7 @@ import {
   FindRefRequest,
   FindRefResult,
   RefSearchParams,
+  Page,
   RefereeLookup,
   Message,
   MessageCreate,
@@ -60,6 +61,33 @@ class ApiClient {
     return response.json();
   }
 
+  // One page of a keyset-paginated endpoint; the next page's cursor is in X-Next-Cursor.
+  private async requestPage<T>(
+    endpoint: string,
+    cursor?: string | null,
+    token?: string | null
+  ): Promise<Page<T>> {
+    const headers: Record<string, string> = { 'Content-Type': 'application/json' };
+    if (token) {
+      headers['Authorization'] = `Bearer ${token}`;
+    }
+
+    const separator = endpoint.includes('?') ? '&' : '?';
+    const url = cursor
+      ? `${this.baseUrl}${endpoint}${separator}cursor=${encodeURIComponent(cursor)}`
+      : `${this.baseUrl}${endpoint}`;
+    const response = await fetch(url, { headers });
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({}));
+      throw new Error(errorData.detail || `HTTP error! status: ${response.status}`);
+    }
+
+    return {
+      items: (await response.json()) as T[],
+      next_cursor: response.headers.get('X-Next-Cursor'),
+    };
+  }
+
   // Auth endpoints
   auth = {
     register: async (
@@ -126,14 +154,18 @@ class ApiClient {
       return this.request<RefereeStats>(`/refs/${refId}/stats`, {}, token);
     },
 
-    search: async (params: RefSearchParams, token: string): Promise<RefereeWithStats[]> => {
+    search: async (
+      params: RefSearchParams,
+      token: string,
+      cursor?: string | null
+    ): Promise<Page<RefereeWithStats>> => {
       const queryParams = new URLSearchParams();
       Object.entries(params).forEach(([key, value]) => {
         if (value !== undefined && value !== null) {
           queryParams.append(key, String(value));
         }
       });
-      return this.request<RefereeWithStats[]>(`/refs/search?${queryParams}`, {}, token);
+      return this.requestPage<RefereeWithStats>(`/refs/search?${queryParams}`, cursor, token);
     },
 
     lookup: async (token: string, query: string, limit: number = 10): Promise<RefereeLookup[]> => {
@@ -290,6 +322,12 @@ class ApiClient {
       }, token);
     },
     
+    clearAiChatHistory: async (token: string): Promise<{ cleared: boolean }> => {
+      return this.request<{ cleared: boolean }>('/messages/ai-chat/history', {
+        method: 'DELETE',
+      }, token);
+    },
+
     send: async (token: string, message: MessageCreate): Promise<Message> => {
       return this.request<Message>('/messages/', {
         method: 'POST',
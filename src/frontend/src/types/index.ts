@@ -141,6 +141,12 @@ export interface RefSearchParams {
   available_end?: string;
 }
 
+// One page of a keyset-paginated list; pass next_cursor back to fetch the following page.
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
 export interface RefereeLookup {
   user_id: number;
   referee_id: number;